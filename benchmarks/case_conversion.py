@@ -0,0 +1,141 @@
+import argparse
+import random
+import timeit
+from datetime import datetime
+from typing import Callable, Dict, Tuple, Type
+
+from src.models.product import ProductModel
+from src.models.request.order import OrderModel
+from src.models.responses.user import CartResponse
+from src.shared.generics import CommonModel
+from src.utils.utils import camel_to_snake_case, snake_to_camel_case
+
+
+def legacy_camel_to_snake_case(input_dict):
+    def convert_keys(d):
+        if isinstance(d, dict):
+            snake_dict = {}
+            for key, value in d.items():
+                snake_case_key = ''.join(['_' + c.lower() if c.isupper() else c for c in key])
+                snake_dict[snake_case_key.lstrip('_')] = convert_keys(value)
+            return snake_dict
+        elif isinstance(d, list):
+            return [convert_keys(item) for item in d]
+        else:
+            return d
+
+    return convert_keys(input_dict)
+
+
+def legacy_snake_to_camel_case(input_dict):
+    def convert_keys(d):
+        if isinstance(d, dict):
+            camel_dict = {}
+            for key, value in d.items():
+                components = key.split('_')
+                camel_case_key = components[0] + ''.join(x.capitalize() for x in components[1:]) if components[
+                                                                                                        0] != '' else \
+                    components[1]
+                camel_dict[camel_case_key] = convert_keys(value)
+            return camel_dict
+        elif isinstance(d, list):
+            return [convert_keys(item) for item in d]
+        else:
+            return d
+
+    return convert_keys(input_dict)
+
+
+def build_product(index: int) -> dict:
+    return dict(
+        id=f'{index:024x}',
+        storeId=f'{random.randrange(50):024x}',
+        name=f'Product {index}',
+        cost=round(random.uniform(1, 500), 2),
+        currency='USD',
+        stock=random.randint(1, 100),
+        category='Electronics',
+        subcategory='Laptops',
+        rating=4.5,
+        imgs=[dict(name='random.jpeg', size=5.0, extension='.jpeg', url='https://picsum.photos/id/96/200/300')],
+        dates=dict(creation=datetime(2024, 1, 1), restock=datetime(2024, 1, 1)),
+        details=dict(description='Description', characteristics=[dict(key='ramSize', text='RAM', value='16GB')]),
+        variants=dict(
+            colors=[dict(key=f'color-{color}', value=color, price=5) for color in ('black', 'white')],
+            sizes=[dict(key=f'size-{size}', value=size, price=None) for size in ('M', 'L')]
+        )
+    )
+
+
+def build_cart(index: int) -> dict:
+    return dict(
+        key=f'{index:024x}',
+        product=build_product(index),
+        cartInfo=dict(amount=random.randint(1, 5), variants=[dict(key='size-L', value='L', price=10)]),
+        previousUnitPrice=None
+    )
+
+
+def build_order(index: int) -> dict:
+    return dict(
+        storeId=f'{random.randrange(50):024x}',
+        dates=dict(order=datetime(2024, 1, 1)),
+        userInfo=dict(id=f'{index:024x}', email='user@example.com', phone='8095555555'),
+        shippingInfo=dict(address=f'{index:024x}', method='express', trackingNumber=f'tracking-{index}'),
+        billingInfo=dict(paymentMethod='pm_card_visa', paymentIntentId=f'pi_{index}'),
+        items=[dict(
+            id=f'{item:024x}',
+            storeId=f'{random.randrange(50):024x}',
+            name=f'Product {item}',
+            category='Electronics',
+            quantity=random.randint(1, 5),
+            price=100,
+            currency='USD',
+            variants=[dict(key='size-L', value='L', price=10)],
+            image=dict(name='random.jpeg', size=5.0, extension='.jpeg', url='https://picsum.photos/id/96/200/300'),
+            totalPrice=110
+        ) for item in range(5)],
+        summary=dict(currency='USD', subtotal=550, shipping=0, taxes=0, totalAmount=550)
+    )
+
+
+DOCUMENTS: Dict[str, Tuple[Type[CommonModel], Callable[[int], dict]]] = dict(
+    product=(ProductModel, build_product),
+    cart=(CartResponse, build_cart),
+    order=(OrderModel, build_order)
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare legacy case conversion with memoized key tables')
+    parser.add_argument('--documents', type=int, nargs='+', default=[100, 1000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f'{"kind":>8} {"docs":>6} {"op":>6} {"legacy ms":>10} {"tables ms":>10} {"speedup":>8}')
+
+    for kind, (model, build) in DOCUMENTS.items():
+        for documents in args.documents:
+            random.seed(documents)
+            dumps = [model(**build(index)).model_dump() for index in range(documents)]
+            schemas = [camel_to_snake_case(dump) for dump in dumps]
+
+            assert schemas == [legacy_camel_to_snake_case(dump) for dump in dumps], f'{kind} to_schema differs'
+            assert [snake_to_camel_case(schema) for schema in schemas] == \
+                   [legacy_snake_to_camel_case(schema) for schema in schemas], f'{kind} read differs'
+
+            for op, legacy, tables, documents_in in (
+                    ('write', legacy_camel_to_snake_case, camel_to_snake_case, dumps),
+                    ('read', legacy_snake_to_camel_case, snake_to_camel_case, schemas)
+            ):
+                legacy_seconds = min(timeit.repeat(lambda: [legacy(document) for document in documents_in],
+                                                   number=1, repeat=args.repeat))
+                tables_seconds = min(timeit.repeat(lambda: [tables(document) for document in documents_in],
+                                                   number=1, repeat=args.repeat))
+
+                print(f'{kind:>8} {documents:>6} {op:>6} {legacy_seconds * 1000:>10.2f} '
+                      f'{tables_seconds * 1000:>10.2f} {legacy_seconds / tables_seconds:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
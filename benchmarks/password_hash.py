@@ -0,0 +1,27 @@
+import argparse
+import timeit
+
+from passlib.context import CryptContext
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure sha256_crypt hash and verify cost per rounds setting')
+    parser.add_argument('--rounds', type=int, nargs='+', default=[20000, 40000, 80000, 160000, 535000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f'{"rounds":>8} {"hash ms":>10} {"verify ms":>10} {"logins/s/core":>14}')
+
+    for rounds in args.rounds:
+        context = CryptContext(schemes=['sha256_crypt'], sha256_crypt__default_rounds=rounds)
+        hashed_password = context.hash('Test00001@')
+
+        hash_seconds = min(timeit.repeat(lambda: context.hash('Test00001@'), number=1, repeat=args.repeat))
+        verify_seconds = min(timeit.repeat(lambda: context.verify('Test00001@', hashed_password), number=1,
+                                           repeat=args.repeat))
+
+        print(f'{rounds:>8} {hash_seconds * 1000:>10.1f} {verify_seconds * 1000:>10.1f} {1 / verify_seconds:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
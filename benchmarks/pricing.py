@@ -0,0 +1,90 @@
+import argparse
+import random
+import timeit
+from typing import List, Union
+
+from src.models.responses.user import CartResponse, CartProductModel
+from src.services.pricing import cart_lines, price_cart
+
+CURRENCIES = ['USD', 'EUR', 'DOP']
+RATES = {'EUR': 1.08, 'DOP': 0.017}
+
+
+def build_cart(lines: int, stores: int) -> List[dict]:
+    random.seed(lines)
+
+    return [dict(
+        product=dict(
+            _id=f'{index:024x}',
+            store_id=f'store-{random.randrange(stores)}',
+            name=f'Product {index}',
+            cost=round(random.uniform(1, 500), 2),
+            currency=random.choice(CURRENCIES),
+            stock=100,
+            category='Electronics',
+            subcategory='Laptops',
+            imgs=[],
+            dates=dict(creation='2024-01-01T00:00:00', restock='2024-01-01T00:00:00'),
+            details=dict(description='Description'),
+            variants=dict()
+        ),
+        cart_info=dict(
+            amount=random.randint(1, 5),
+            variants=[dict(key='size', value='L', price=random.choice([None, 5, 10]))]
+        )
+    ) for index in range(lines)]
+
+
+def legacy_pricing(carts: List[dict]):
+    user_cart = [CartResponse(product=CartProductModel.to_model(cart['product']), cartInfo=cart['cart_info'])
+                 for cart in carts]
+    orders: List[dict] = []
+
+    for product in user_cart:
+        existent_store_order: Union[List[dict], dict] = list(
+            filter(lambda order: order['storeId'] == product.product.storeId, orders))
+
+        total = int((product.product.cost + sum(
+            [variant.price for variant in product.cartInfo.variants if
+             variant.price] if product.cartInfo.variants else [0])) * product.cartInfo.amount)
+
+        if product.product.currency != 'USD':
+            total = round(total * RATES[product.product.currency])
+
+        if len(existent_store_order) > 0:
+            existent_store_order[0]['subtotal'] += total
+        else:
+            orders.append(dict(storeId=product.product.storeId, subtotal=total))
+
+    return orders
+
+
+def engine_pricing(carts: List[dict]):
+    return price_cart(cart_lines(carts), 'USD', RATES)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare legacy checkout pricing with the pricing engine')
+    parser.add_argument('--lines', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--stores', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f'{"lines":>6} {"legacy ms":>10} {"engine ms":>10} {"speedup":>8}')
+
+    for lines in args.lines:
+        carts = build_cart(lines, args.stores)
+
+        legacy = {order['storeId']: order['subtotal'] for order in legacy_pricing(carts)}
+        engine = {store.store_id: store.subtotal for store in engine_pricing(carts).stores.values()}
+        assert legacy == engine, 'pricing engine and legacy subtotals differ'
+
+        legacy_seconds = min(timeit.repeat(lambda: legacy_pricing(carts), number=1, repeat=args.repeat))
+        engine_seconds = min(timeit.repeat(lambda: engine_pricing(carts), number=1, repeat=args.repeat))
+
+        print(f'{lines:>6} {legacy_seconds * 1000:>10.2f} {engine_seconds * 1000:>10.2f} '
+              f'{legacy_seconds / engine_seconds:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+import logging
+from collections import Counter
+from threading import Lock
+from typing import Dict, Optional, Set
+
+from dependencies import invalidation
+from src.database.mongodb.collection.api_key_collection import get_api_keys, API_KEYS_INVALIDATION
+from src.utils.utils import api_key_digest
+
+
+class ApiKeyRegistry:
+    def __init__(self):
+        self._keys: Optional[Dict[str, str]] = None
+        self._names: Dict[str, str] = {}
+        self._scopes: Dict[str, Set[str]] = {}
+        self._request_counts: Counter = Counter()
+        self._lock = Lock()
+
+    def reload(self):
+        api_keys = get_api_keys()
+
+        keys = {api_key['hash']: str(api_key['_id']) for api_key in api_keys}
+        names = {str(api_key['_id']): api_key.get('name', str(api_key['_id'])) for api_key in api_keys}
+        scopes = {str(api_key['_id']): set(api_key.get('scopes') or []) for api_key in api_keys}
+
+        with self._lock:
+            self._keys = keys
+            self._names = names
+            self._scopes = scopes
+
+        logging.info(f'Api key registry loaded {len(keys)} keys')
+
+    def validate(self, api_key: str) -> Optional[str]:
+        if self._keys is None:
+            self.reload()
+
+        api_key_id = self._keys.get(api_key_digest(api_key))
+
+        if api_key_id:
+            self._request_counts[api_key_id] += 1
+
+        return api_key_id
+
+    def has_scope(self, api_key_id: str, scope: str) -> bool:
+        return scope in self._scopes.get(api_key_id, ())
+
+    def request_counts(self) -> Dict[str, int]:
+        return {self._names.get(api_key_id, api_key_id): count for api_key_id, count in self._request_counts.items()}
+
+
+api_key_registry = ApiKeyRegistry()
+
+invalidation.subscribe(API_KEYS_INVALIDATION, lambda _: api_key_registry.reload())
@@ -1,49 +1,63 @@
-from collections.abc import Mapping
-from typing import Any, Optional
+from typing import Optional
 
-from fastapi import Depends
+from fastapi import Depends, status
 from fastapi.security import APIKeyHeader, HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError, ExpiredSignatureError
-from pymongo.database import Database
 
-from dependencies.mongodb import MongoDBClient
-from src.database.mongodb.collection.session_token_collection import get_session_token
-from src.database.mongodb.collection.user_collection import get_user_by_email
-from src.database.mongodb.collection.user_preferences_collection import get_user_preferences_by_id
+from dependencies.api_key_registry import api_key_registry
+from dependencies.auth_cache import get_validated_token, cache_validated_token, get_cached_principal, \
+    cache_principal
+from dependencies.revocation import revocation_filter
+from src.database.mongodb.collection.session_token_collection import get_session_token_async
+from src.database.mongodb.collection.user_collection import get_user_principal_by_email_async
+from src.database.mongodb.collection.user_preferences_collection import get_user_preferences_by_id_async
 from src.env_variables.env import env_variables
-from src.models.user import BaseUserModel
-from src.shared.exceptions import AuthException
-from src.utils.constants import ErrorsDescriptions, ErrorsIDs, ErrorsDescriptionsObject
+from src.shared.exceptions import AuthException, HttpException
+from src.utils.constants import ErrorsDescriptions, ErrorsIDs, ErrorsDescriptionsObject, ApiKeyScope
 
 api_key_scheme = APIKeyHeader(name="x-api-key", auto_error=False)
 auth_scheme = HTTPBearer(auto_error=False)
 
 
-def validate_bearer_token(
+def _decode_token(token: str) -> dict:
+    return jwt.decode(
+        token=token,
+        key=env_variables.auth_secret_key,
+        algorithms=[env_variables.auth_algorithm]
+    )
+
+
+async def validate_bearer_token(
         credentials: HTTPAuthorizationCredentials = Depends(auth_scheme)
 ):
     try:
-        token = credentials.credentials
-        scheme = credentials.scheme
-
         if not credentials:
             raise AuthException(error_id=ErrorsIDs.UNAUTHORIZED, description=ErrorsDescriptions.UNAUTHORIZED)
 
+        token = credentials.credentials
+        scheme = credentials.scheme
+
         if scheme.lower() != 'bearer':
             raise AuthException(error_id=ErrorsIDs.AUTH_SCHEME_NOT_VALID,
                                 description=ErrorsDescriptions.AUTH_SCHEME_NOT_VALID)
 
-        exist_token_db = get_session_token(access_token=token) is not None
+        validated_token = get_validated_token(token)
+
+        if validated_token:
+            return validated_token.subject
+
+        payload = _decode_token(token)
 
-        if not exist_token_db:
+        if env_variables.auth_stateless_tokens and payload.get('jti'):
+            is_token_valid = not await revocation_filter.is_revoked_async(payload['jti'])
+        else:
+            is_token_valid = await get_session_token_async(access_token=token) is not None
+
+        if not is_token_valid:
             raise AuthException(error_id=ErrorsIDs.AUTH_TOKEN_NOT_VALID,
                                 description=ErrorsDescriptions.AUTH_TOKEN_NOT_VALID)
 
-        payload = jwt.decode(
-            token=token,
-            key=env_variables.auth_secret_key,
-            algorithms=[env_variables.auth_algorithm]
-        )
+        cache_validated_token(token, subject=payload['sub'], expires_at=payload['exp'])
 
         return payload['sub']
 
@@ -60,51 +74,72 @@ def validate_bearer_token(
         raise ex
 
 
-def get_current_user(
+async def get_current_user(
         current_user: str = Depends(validate_bearer_token)
 ):
-    user = get_user_by_email(current_user)
-    user_preferences = get_user_preferences_by_id(user_id=user.id)
-
-    user_model = BaseUserModel(
-        id=user.id,
-        stripeId=user.stripeId,
-        name=user.name,
-        lastName=user.lastName,
-        email=user.email,
-        phone=user.phone,
-        role=user.role,
-        preferences=user_preferences
-    )
+    user_model = get_cached_principal(current_user)
+
+    if user_model:
+        return user_model
+
+    user_model = await get_user_principal_by_email_async(current_user)
+
+    if not user_model:
+        raise AuthException(error_id=ErrorsIDs.AUTH_TOKEN_NOT_VALID,
+                            description=ErrorsDescriptions.AUTH_TOKEN_NOT_VALID)
+
+    user_model.preferences = await get_user_preferences_by_id_async(user_id=user_model.id)
+
+    cache_principal(user_model)
 
     return user_model
 
 
-def validate_api_key(
-        api_key: str = Depends(api_key_scheme),
-        mongo_client: Database[Mapping[str, Any]] = Depends(MongoDBClient())
-):
+def _validate_api_key_id(api_key: Optional[str]) -> str:
     if not api_key:
         raise AuthException(error_id=ErrorsIDs.UNAUTHORIZED, description=ErrorsDescriptions.UNAUTHORIZED)
 
-    api_key_db = mongo_client.api_key.find_one({'value': api_key})
+    api_key_id = api_key_registry.validate(api_key)
 
-    if not api_key_db:
+    if not api_key_id:
         raise AuthException(error_id=ErrorsIDs.API_KEY_NOT_VALID, description=ErrorsDescriptions.API_KEY_NOT_VALID)
 
+    return api_key_id
+
+
+async def validate_api_key(
+        api_key: str = Depends(api_key_scheme)
+):
+    _validate_api_key_id(api_key)
+
     return None
 
 
-def validate_api_key_or_auth(
+def validate_api_key_scope(scope: ApiKeyScope):
+    async def validate_scoped_api_key(
+            api_key: str = Depends(api_key_scheme)
+    ):
+        if not api_key_registry.has_scope(_validate_api_key_id(api_key), scope.value):
+            raise HttpException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                error_id=ErrorsIDs.API_KEY_SCOPE_NOT_ALLOWED,
+                description=ErrorsDescriptionsObject[ErrorsIDs.API_KEY_SCOPE_NOT_ALLOWED].format(scope.value)
+            )
+
+        return None
+
+    return validate_scoped_api_key
+
+
+async def validate_api_key_or_auth(
         credentials: Optional[HTTPAuthorizationCredentials] = Depends(auth_scheme),
-        api_key: Optional[str] = Depends(api_key_scheme),
-        mongo_client: Database[Mapping[str, Any]] = Depends(MongoDBClient())
+        api_key: Optional[str] = Depends(api_key_scheme)
 ):
     if credentials:
-        return get_current_user(validate_bearer_token(credentials))
+        return await get_current_user(await validate_bearer_token(credentials))
 
     if api_key:
-        return validate_api_key(api_key, mongo_client)
+        return await validate_api_key(api_key)
 
     raise AuthException(error_id=ErrorsIDs.AUTH_CREDENTIALS_COULD_NOT_BE_VALIDATED,
                         description=ErrorsDescriptionsObject[ErrorsIDs.AUTH_CREDENTIALS_COULD_NOT_BE_VALIDATED])
@@ -0,0 +1,92 @@
+import time
+from typing import Optional, NamedTuple
+
+from dependencies import invalidation
+from src.env_variables.env import env_variables
+from src.models.user import BaseUserModel
+from src.utils.cache import TTLCache
+from src.utils.utils import token_digest
+
+
+class ValidatedToken(NamedTuple):
+    subject: str
+    expires_at: float
+
+
+TOKEN_INVALIDATION = 'auth_token'
+USER_TOKENS_INVALIDATION = 'auth_user_tokens'
+PRINCIPAL_INVALIDATION = 'auth_principal'
+PRINCIPAL_BY_ID_INVALIDATION = 'auth_principal_by_id'
+
+validated_token_cache = TTLCache(max_size=env_variables.auth_token_cache_size,
+                                 ttl_seconds=env_variables.auth_token_cache_ttl_seconds)
+principal_cache = TTLCache(max_size=env_variables.auth_principal_cache_size,
+                           ttl_seconds=env_variables.auth_principal_cache_ttl_seconds)
+
+
+def get_validated_token(token: str) -> Optional[ValidatedToken]:
+    validated_token: Optional[ValidatedToken] = validated_token_cache.get(token_digest(token))
+
+    if validated_token and validated_token.expires_at <= time.time():
+        validated_token_cache.delete(token_digest(token))
+        return None
+
+    return validated_token
+
+
+def cache_validated_token(token: str, subject: str, expires_at: float):
+    validated_token_cache.set(
+        token_digest(token),
+        ValidatedToken(subject=subject, expires_at=expires_at),
+        ttl_seconds=expires_at - time.time()
+    )
+
+
+def get_cached_principal(email: str) -> Optional[BaseUserModel]:
+    return principal_cache.get(email)
+
+
+def cache_principal(principal: BaseUserModel):
+    principal_cache.set(principal.email.value, principal)
+
+
+def _evict_token_digest(digest: str):
+    validated_token_cache.delete(digest)
+
+
+def _evict_user_tokens(username: str):
+    validated_token_cache.delete_where(lambda _, validated_token: validated_token.subject == username)
+
+
+def _evict_principal(email: str):
+    principal_cache.delete(email)
+
+
+def _evict_principal_by_id(user_id: str):
+    principal_cache.delete_where(lambda _, principal: principal.id == user_id)
+
+
+def evict_token(token: str):
+    invalidation.publish(TOKEN_INVALIDATION, token_digest(token))
+
+
+def evict_token_digest(digest: str):
+    invalidation.publish(TOKEN_INVALIDATION, digest)
+
+
+def evict_user_tokens(username: str):
+    invalidation.publish(USER_TOKENS_INVALIDATION, username)
+
+
+def evict_principal(email: str):
+    invalidation.publish(PRINCIPAL_INVALIDATION, email)
+
+
+def evict_principal_by_id(user_id: str):
+    invalidation.publish(PRINCIPAL_BY_ID_INVALIDATION, user_id)
+
+
+invalidation.subscribe(TOKEN_INVALIDATION, _evict_token_digest)
+invalidation.subscribe(USER_TOKENS_INVALIDATION, _evict_user_tokens)
+invalidation.subscribe(PRINCIPAL_INVALIDATION, _evict_principal)
+invalidation.subscribe(PRINCIPAL_BY_ID_INVALIDATION, _evict_principal_by_id)
@@ -0,0 +1,71 @@
+import hashlib
+import json
+import logging
+from threading import Lock
+from typing import Dict, FrozenSet, List, NamedTuple, Optional
+
+from dependencies import invalidation
+from src.database.mongodb.collection.catalog_collection import get_category_documents
+from src.models.catalog import CategoriesModel
+from src.models.responses.catalogs import CategoriesResponse
+from src.shared.generics import Data
+from src.utils.utils import snake_to_camel_case
+
+CATEGORIES_INVALIDATION = 'categories'
+
+
+class CategoryCatalogVersion(NamedTuple):
+    version: str
+    etag: str
+    payload: bytes
+    subcategories: Dict[str, FrozenSet[str]]
+
+    def is_empty(self) -> bool:
+        return not self.subcategories
+
+
+class CategoryCatalog:
+    def __init__(self):
+        self._current: Optional[CategoryCatalogVersion] = None
+        self._lock = Lock()
+
+    def reload(self) -> bool:
+        with self._lock:
+            categories = get_category_documents()
+            version = hashlib.blake2b(json.dumps(categories, default=str, sort_keys=True).encode(),
+                                      digest_size=16).hexdigest()
+
+            if self._current and self._current.version == version:
+                return False
+
+            categories: List[CategoriesModel] = [CategoriesModel(**snake_to_camel_case(category))
+                                                 for category in categories]
+
+            self._current = CategoryCatalogVersion(
+                version=version,
+                etag=f'"{version}"',
+                payload=Data[List[CategoriesResponse]](
+                    data=[CategoriesResponse(**category.to_json()) for category in categories]
+                ).model_dump_json().encode(),
+                subcategories={category.name: frozenset(category.subcategories) for category in categories}
+            )
+
+            logging.info(f'Category catalog loaded version {version} with {len(categories)} categories')
+
+            return True
+
+    def current(self) -> CategoryCatalogVersion:
+        if self._current is None:
+            self.reload()
+
+        return self._current
+
+    def is_valid(self, category: str, subcategory: str) -> bool:
+        subcategories = self.current().subcategories.get(category)
+
+        return subcategories is not None and subcategory in subcategories
+
+
+category_catalog = CategoryCatalog()
+
+invalidation.subscribe(CATEGORIES_INVALIDATION, lambda _: category_catalog.reload())
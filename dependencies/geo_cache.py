@@ -0,0 +1,92 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Callable, NamedTuple, Set
+
+from src.database.mongodb.collection.geo_cache_collection import get_geo_cache, upsert_geo_cache
+from src.database.mongodb.schema.geo_cache_schema import GeoCacheCollectionSchema
+from src.env_variables.env import env_variables
+from src.utils.cache import TTLCache
+
+
+class GeoPayload(NamedTuple):
+    payload: bytes
+    empty: bool = False
+
+
+def _as_utc(date: datetime) -> datetime:
+    return date if date.tzinfo else date.replace(tzinfo=timezone.utc)
+
+
+class GeoCache:
+    def __init__(self):
+        self._local = TTLCache(max_size=env_variables.geo_cache_local_size,
+                               ttl_seconds=env_variables.geo_cache_local_ttl_seconds)
+        self._refreshing: Set[str] = set()
+        self._lock = Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix='geo-cache-refresh')
+
+    def _remember(self, key: str, payload: bytes, fresh_until: datetime):
+        self._local.set(key, payload, ttl_seconds=(fresh_until - datetime.now(timezone.utc)).total_seconds())
+
+    def _store(self, key: str, render: Callable[[], GeoPayload]) -> bytes:
+        now = datetime.now(timezone.utc)
+        payload, empty = render()
+
+        geo_cache = GeoCacheCollectionSchema(
+            _id=key,
+            payload=payload,
+            fetched_at=now,
+            fresh_until=now + timedelta(seconds=env_variables.geo_cache_empty_seconds if empty
+                                        else env_variables.geo_cache_fresh_seconds),
+            expires_at=now + timedelta(seconds=env_variables.geo_cache_empty_seconds if empty
+                                       else env_variables.geo_cache_expire_seconds)
+        )
+        upsert_geo_cache(geo_cache)
+        self._remember(key, payload, geo_cache['fresh_until'])
+
+        return payload
+
+    def _refresh(self, key: str, render: Callable[[], GeoPayload]):
+        try:
+            self._store(key, render)
+
+        except Exception as ex:
+            logging.error(f'Refreshing geo cache {key} throw exception -> {ex}')
+
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _schedule_refresh(self, key: str, render: Callable[[], GeoPayload]):
+        with self._lock:
+            if key in self._refreshing:
+                return
+
+            self._refreshing.add(key)
+
+        self._refresher.submit(self._refresh, key, render)
+
+    def get(self, key: str, render: Callable[[], GeoPayload]) -> bytes:
+        payload = self._local.get(key)
+
+        if payload is not None:
+            return payload
+
+        geo_cache = get_geo_cache(key)
+
+        if not geo_cache:
+            return self._store(key, render)
+
+        fresh_until = _as_utc(geo_cache['fresh_until'])
+
+        if fresh_until > datetime.now(timezone.utc):
+            self._remember(key, geo_cache['payload'], fresh_until)
+        else:
+            self._schedule_refresh(key, render)
+
+        return geo_cache['payload']
+
+
+geo_cache = GeoCache()
@@ -0,0 +1,190 @@
+import asyncio
+import time
+from collections import Counter
+from threading import Lock
+from typing import Any, Dict, NamedTuple, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.env_variables.env import env_variables
+from src.utils.metrics import LatencyStats
+
+COUNTRIES_UPSTREAM = 'countries'
+CURRENCY_UPSTREAM = 'currency'
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class UpstreamPolicy(NamedTuple):
+    base_url: str
+    headers: Dict[str, str]
+    read_timeout: float
+    retries: int
+    backoff_factor: float
+
+
+upstream_policies: Dict[str, UpstreamPolicy] = {
+    COUNTRIES_UPSTREAM: UpstreamPolicy(
+        base_url=env_variables.countries_api_url,
+        headers={"X-CSCAPI-KEY": env_variables.countries_api_key},
+        read_timeout=env_variables.http_read_timeout_seconds,
+        retries=2,
+        backoff_factor=0.5
+    ),
+    CURRENCY_UPSTREAM: UpstreamPolicy(
+        base_url=env_variables.currency_convertion_api_url,
+        headers={},
+        read_timeout=env_variables.http_read_timeout_seconds,
+        retries=3,
+        backoff_factor=0.25
+    )
+}
+
+
+class UpstreamMetrics:
+    def __init__(self):
+        self.latency = LatencyStats()
+        self._outcomes: Counter = Counter()
+        self._lock = Lock()
+
+    def record(self, seconds: float, outcome: str):
+        self.latency.record(seconds)
+
+        with self._lock:
+            self._outcomes[outcome] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            outcomes = dict(self._outcomes)
+
+        return {'latency': self.latency.snapshot(), 'outcomes': outcomes}
+
+
+class HttpClient:
+    def __init__(self, policies: Dict[str, UpstreamPolicy]):
+        self._policies = policies
+        self._sessions: Dict[str, requests.Session] = {}
+        self._async_clients: Dict[str, httpx.AsyncClient] = {}
+        self._lock = Lock()
+        self.metrics: Dict[str, UpstreamMetrics] = {upstream: UpstreamMetrics() for upstream in policies}
+
+    def _timeout(self, policy: UpstreamPolicy):
+        return env_variables.http_connect_timeout_seconds, policy.read_timeout
+
+    def _session(self, upstream: str) -> requests.Session:
+        session = self._sessions.get(upstream)
+
+        if session:
+            return session
+
+        with self._lock:
+            if upstream not in self._sessions:
+                policy = self._policies[upstream]
+
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=env_variables.http_pool_max_connections,
+                    pool_block=True,
+                    max_retries=Retry(
+                        total=policy.retries,
+                        backoff_factor=policy.backoff_factor,
+                        status_forcelist=RETRY_STATUS_CODES,
+                        allowed_methods=frozenset({'GET'}),
+                        respect_retry_after_header=True,
+                        raise_on_status=False
+                    )
+                )
+
+                session = requests.Session()
+                session.headers.update(policy.headers)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+
+                self._sessions[upstream] = session
+
+            return self._sessions[upstream]
+
+    def _async_client(self, upstream: str) -> httpx.AsyncClient:
+        client = self._async_clients.get(upstream)
+
+        if client is None:
+            policy = self._policies[upstream]
+            connect_timeout, read_timeout = self._timeout(policy)
+
+            client = httpx.AsyncClient(
+                base_url=policy.base_url,
+                headers=policy.headers,
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                limits=httpx.Limits(max_connections=env_variables.http_pool_max_connections,
+                                    max_keepalive_connections=env_variables.http_pool_max_connections)
+            )
+
+            self._async_clients[upstream] = client
+
+        return client
+
+    def get(self, upstream: str, path: str, params: Optional[Dict[str, Any]] = None) -> requests.Response:
+        policy = self._policies[upstream]
+        started_at = time.perf_counter()
+        outcome = 'error'
+
+        try:
+            response = self._session(upstream).get(f'{policy.base_url}{path}', params=params,
+                                                   timeout=self._timeout(policy))
+            outcome = str(response.status_code)
+
+            return response
+
+        finally:
+            self.metrics[upstream].record(time.perf_counter() - started_at, outcome)
+
+    async def get_async(self, upstream: str, path: str, params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+        policy = self._policies[upstream]
+        client = self._async_client(upstream)
+        started_at = time.perf_counter()
+        outcome = 'error'
+
+        try:
+            for attempt in range(policy.retries + 1):
+                try:
+                    response = await client.get(path, params=params)
+
+                    if response.status_code not in RETRY_STATUS_CODES or attempt == policy.retries:
+                        outcome = str(response.status_code)
+                        return response
+
+                except httpx.TransportError:
+                    if attempt == policy.retries:
+                        raise
+
+                await asyncio.sleep(policy.backoff_factor * (2 ** attempt))
+
+        finally:
+            self.metrics[upstream].record(time.perf_counter() - started_at, outcome)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {upstream: metrics.snapshot() for upstream, metrics in self.metrics.items()}
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+
+            self._sessions.clear()
+
+    async def aclose(self):
+        for client in self._async_clients.values():
+            await client.aclose()
+
+        self._async_clients.clear()
+
+
+http_client = HttpClient(upstream_policies)
+
+
+async def close_http_client():
+    http_client.close()
+    await http_client.aclose()
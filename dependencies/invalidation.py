@@ -0,0 +1,77 @@
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Callable, Dict, List
+
+from src.database.mongodb.collection.cache_invalidation_collection import insert_cache_invalidation, \
+    get_cache_invalidations_since
+from src.database.mongodb.schema.cache_invalidation_schema import CacheInvalidationCollectionSchema
+from src.utils.constants import Params
+
+process_origin = f'{os.getpid()}-{uuid.uuid4().hex[:8]}'
+
+_handlers: Dict[str, List[Callable[[str], None]]] = {}
+_applied_ids: Dict[str, datetime] = {}
+_last_poll = datetime.now(timezone.utc)
+_poll_lock = Lock()
+_publisher = ThreadPoolExecutor(max_workers=1, thread_name_prefix='cache-invalidation')
+
+
+def subscribe(kind: str, handler: Callable[[str], None]):
+    _handlers.setdefault(kind, []).append(handler)
+
+
+def _dispatch(kind: str, key: str):
+    for handler in _handlers.get(kind, []):
+        try:
+            handler(key)
+        except Exception as ex:
+            logging.error(f'Cache invalidation handler for {kind} throw exception -> {ex}')
+
+
+def _insert(cache_invalidation: CacheInvalidationCollectionSchema):
+    try:
+        insert_cache_invalidation(cache_invalidation)
+    except Exception as ex:
+        logging.error(f'Publishing cache invalidation {cache_invalidation["kind"]} throw exception -> {ex}')
+
+
+def publish(kind: str, key: str):
+    _dispatch(kind, key)
+
+    _publisher.submit(_insert, CacheInvalidationCollectionSchema(
+        kind=kind,
+        key=key,
+        origin=process_origin,
+        created_at=datetime.now(timezone.utc)
+    ))
+
+
+def poll():
+    global _last_poll
+
+    with _poll_lock:
+        now = datetime.now(timezone.utc)
+        window = timedelta(seconds=Params.CACHE_INVALIDATION_POLL_OVERLAP_SECONDS)
+
+        invalidations = get_cache_invalidations_since(_last_poll - window)
+
+        for invalidation in invalidations:
+            invalidation_id = str(invalidation['_id'])
+
+            if invalidation_id in _applied_ids:
+                continue
+
+            _applied_ids[invalidation_id] = now
+
+            if invalidation['origin'] != process_origin:
+                _dispatch(invalidation['kind'], invalidation['key'])
+
+        for invalidation_id, applied_at in list(_applied_ids.items()):
+            if applied_at < now - window * 2:
+                del _applied_ids[invalidation_id]
+
+        _last_poll = now
@@ -1,9 +1,109 @@
-from typing import Any, Mapping
+from collections import Counter
+from threading import Lock
+from typing import Any, Dict, Mapping, Type, TypeVar
 
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from pymongo import MongoClient
 from pymongo.database import Database
+from pymongo.monitoring import ConnectionPoolListener, ConnectionCheckOutStartedEvent, ConnectionCheckedOutEvent, \
+    ConnectionCheckOutFailedEvent, ConnectionCheckedInEvent, ConnectionCreatedEvent, ConnectionClosedEvent, \
+    PoolCreatedEvent, PoolClearedEvent, PoolClosedEvent
 
 from src.env_variables.env import env_variables
+from src.utils.metrics import LatencyStats
+
+MongoClientType = TypeVar('MongoClientType', MongoClient, AsyncIOMotorClient)
+
+
+class ConnectionPoolMetrics(ConnectionPoolListener):
+    def __init__(self):
+        self._checked_out = 0
+        self._waiting = 0
+        self._open = 0
+        self._pools_cleared = 0
+        self._check_out_failures: Counter = Counter()
+        self._wait_time = LatencyStats()
+        self._lock = Lock()
+
+    def pool_created(self, event: PoolCreatedEvent):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event: PoolClearedEvent):
+        with self._lock:
+            self._pools_cleared += 1
+
+    def pool_closed(self, event: PoolClosedEvent):
+        pass
+
+    def connection_created(self, event: ConnectionCreatedEvent):
+        with self._lock:
+            self._open += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event: ConnectionClosedEvent):
+        with self._lock:
+            self._open -= 1
+
+    def connection_check_out_started(self, event: ConnectionCheckOutStartedEvent):
+        with self._lock:
+            self._waiting += 1
+
+    def connection_check_out_failed(self, event: ConnectionCheckOutFailedEvent):
+        with self._lock:
+            self._waiting -= 1
+            self._check_out_failures[event.reason] += 1
+
+        if event.duration is not None:
+            self._wait_time.record(event.duration)
+
+    def connection_checked_out(self, event: ConnectionCheckedOutEvent):
+        with self._lock:
+            self._waiting -= 1
+            self._checked_out += 1
+
+        if event.duration is not None:
+            self._wait_time.record(event.duration)
+
+    def connection_checked_in(self, event: ConnectionCheckedInEvent):
+        with self._lock:
+            self._checked_out -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'checkedOut': self._checked_out,
+                'waitQueueLength': self._waiting,
+                'openConnections': self._open,
+                'poolsCleared': self._pools_cleared,
+                'checkOutFailures': dict(self._check_out_failures),
+                'waitTime': self._wait_time.snapshot()
+            }
+
+
+pool_metrics: Dict[str, ConnectionPoolMetrics] = {
+    'sync': ConnectionPoolMetrics(),
+    'async': ConnectionPoolMetrics()
+}
+
+
+def create_mongo_client(client_class: Type[MongoClientType], metrics: ConnectionPoolMetrics,
+                        connection_string: str = None) -> MongoClientType:
+    try:
+        return client_class(
+            host=connection_string or env_variables.mongodb_connection_string,
+            maxPoolSize=env_variables.mongodb_max_pool_size,
+            minPoolSize=env_variables.mongodb_min_pool_size,
+            maxIdleTimeMS=env_variables.mongodb_max_idle_time_ms,
+            waitQueueTimeoutMS=env_variables.mongodb_wait_queue_timeout_ms,
+            event_listeners=[metrics]
+        )
+    except ConnectionError as e:
+        raise Exception(f"Failed to connect to MongoDB: {e}")
 
 
 class MongoDBClient:
@@ -11,11 +111,7 @@ class MongoDBClient:
 
     def __init__(self, connection_string: str = None, database_name: str = None):
         if not MongoDBClient._mongo_instance:
-            try:
-                connection_string = connection_string or env_variables.mongodb_connection_string
-                MongoDBClient._mongo_instance = MongoClient(host=connection_string)
-            except ConnectionError as e:
-                raise Exception(f"Failed to connect to MongoDB: {e}")
+            MongoDBClient._mongo_instance = create_mongo_client(MongoClient, pool_metrics['sync'], connection_string)
 
         self.database_name = database_name or env_variables.mongodb_database
 
@@ -26,3 +122,22 @@ class MongoDBClient:
 
     def __call__(self) -> Database[Mapping[str, Any] | Any]:
         return self._database
+
+
+class AsyncMongoDBClient:
+    _mongo_instance: AsyncIOMotorClient = None
+
+    def __init__(self, connection_string: str = None, database_name: str = None):
+        if not AsyncMongoDBClient._mongo_instance:
+            AsyncMongoDBClient._mongo_instance = create_mongo_client(AsyncIOMotorClient, pool_metrics['async'],
+                                                                     connection_string)
+
+        self.database_name = database_name or env_variables.mongodb_database
+
+        if not self.database_name:
+            raise ValueError("Database name must be provided.")
+
+        self._database = AsyncMongoDBClient._mongo_instance[self.database_name]
+
+    def __call__(self) -> AsyncIOMotorDatabase:
+        return self._database
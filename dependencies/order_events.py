@@ -0,0 +1,84 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Any, Dict, Optional, Set, Tuple
+
+from dependencies.invalidation import process_origin
+from src.database.mongodb.collection.order_event_collection import insert_order_event, get_order_events_since
+from src.database.mongodb.schema.order_event_schema import OrderEventCollectionSchema
+from src.utils.constants import Params
+
+_Subscriber = Tuple[asyncio.AbstractEventLoop, asyncio.Queue]
+
+
+class OrderEventBroker:
+    def __init__(self):
+        self._subscribers: Dict[str, Set[_Subscriber]] = {}
+        self._lock = Lock()
+        self._poll_lock = Lock()
+        self._last_poll = datetime.now(timezone.utc)
+
+    def subscribe(self, order_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue()
+
+        with self._lock:
+            self._subscribers.setdefault(order_id, set()).add((asyncio.get_running_loop(), queue))
+
+        return queue
+
+    def unsubscribe(self, order_id: str, queue: asyncio.Queue):
+        with self._lock:
+            subscribers = self._subscribers.get(order_id, set())
+            subscribers.difference_update({subscriber for subscriber in subscribers if subscriber[1] is queue})
+
+            if not subscribers:
+                self._subscribers.pop(order_id, None)
+
+    def _dispatch(self, order_event: OrderEventCollectionSchema):
+        with self._lock:
+            subscribers = list(self._subscribers.get(order_event['order_id'], ()))
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, order_event)
+            except RuntimeError:
+                self.unsubscribe(order_event['order_id'], queue)
+
+    def publish(self, order_id: str, user_id: str, type: str, status: str,
+                data: Optional[Dict[str, Any]] = None):
+        order_event = OrderEventCollectionSchema(
+            order_id=order_id,
+            user_id=user_id,
+            type=type,
+            status=status,
+            data=data or {},
+            origin=process_origin,
+            created_at=datetime.now(timezone.utc)
+        )
+
+        try:
+            order_event['_id'] = insert_order_event(order_event)
+        except Exception as ex:
+            logging.error(f'Publishing order event {type} for {order_id} throw exception -> {ex}')
+            return
+
+        self._dispatch(order_event)
+
+    def poll(self):
+        with self._poll_lock:
+            now = datetime.now(timezone.utc)
+
+            with self._lock:
+                order_ids = list(self._subscribers)
+
+            if order_ids:
+                window = timedelta(seconds=Params.CACHE_INVALIDATION_POLL_OVERLAP_SECONDS)
+
+                for order_event in get_order_events_since(self._last_poll - window, order_ids, process_origin):
+                    self._dispatch(order_event)
+
+            self._last_poll = now
+
+
+order_event_broker = OrderEventBroker()
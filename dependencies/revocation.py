@@ -0,0 +1,124 @@
+from collections import OrderedDict
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from dependencies import invalidation
+from src.database.mongodb.collection.revoked_token_collection import get_revoked_tokens, is_token_revoked, \
+    is_token_revoked_async, insert_revoked_tokens, insert_revoked_tokens_async
+from src.database.mongodb.schema.revoked_token_schema import RevokedTokenCollectionSchema
+from src.env_variables.env import env_variables
+from src.utils.bloom_filter import BloomFilter
+
+REVOKED_TOKEN_INVALIDATION = 'revoked_token'
+
+
+def _utc_timestamp(date: datetime) -> float:
+    return (date if date.tzinfo else date.replace(tzinfo=timezone.utc)).timestamp()
+
+
+class RevocationFilter:
+    def __init__(self, capacity: int, recent_size: int):
+        self.capacity = capacity
+        self.recent_size = recent_size
+        self._bloom = BloomFilter(capacity)
+        self._recent: OrderedDict[str, float] = OrderedDict()
+        self._rebuild_additions: Optional[Dict[str, float]] = None
+        self._lock = Lock()
+        self._rebuild_lock = Lock()
+
+    def rebuild(self):
+        with self._rebuild_lock:
+            with self._lock:
+                self._rebuild_additions = {}
+
+            try:
+                self._rebuild()
+            finally:
+                with self._lock:
+                    self._rebuild_additions = None
+
+    def _rebuild(self):
+        revoked_tokens = sorted(get_revoked_tokens(), key=lambda revoked_token: revoked_token['expires_at'])
+
+        bloom = BloomFilter(max(self.capacity, len(revoked_tokens) * 2))
+        recent: OrderedDict[str, float] = OrderedDict()
+
+        for revoked_token in revoked_tokens:
+            bloom.add(revoked_token['_id'])
+            recent[revoked_token['_id']] = _utc_timestamp(revoked_token['expires_at'])
+
+        with self._lock:
+            for jti, expires_at in self._rebuild_additions.items():
+                bloom.add(jti)
+                recent[jti] = expires_at
+                recent.move_to_end(jti)
+
+            while len(recent) > self.recent_size:
+                recent.popitem(last=False)
+
+            self._bloom = bloom
+            self._recent = recent
+
+    def add(self, jti: str, expires_at: float):
+        with self._lock:
+            self._bloom.add(jti)
+            self._recent[jti] = expires_at
+            self._recent.move_to_end(jti)
+
+            if self._rebuild_additions is not None:
+                self._rebuild_additions[jti] = expires_at
+
+            while len(self._recent) > self.recent_size:
+                self._recent.popitem(last=False)
+
+    def _is_revoked_locally(self, jti: str) -> Optional[bool]:
+        if jti not in self._bloom:
+            return False
+
+        if jti in self._recent:
+            return True
+
+        return None
+
+    def is_revoked(self, jti: str) -> bool:
+        is_revoked = self._is_revoked_locally(jti)
+
+        return is_token_revoked(jti) if is_revoked is None else is_revoked
+
+    async def is_revoked_async(self, jti: str) -> bool:
+        is_revoked = self._is_revoked_locally(jti)
+
+        return await is_token_revoked_async(jti) if is_revoked is None else is_revoked
+
+
+revocation_filter = RevocationFilter(capacity=env_variables.auth_revocation_filter_capacity,
+                                     recent_size=env_variables.auth_revocation_recent_size)
+
+
+def _publish(revoked_tokens: List[RevokedTokenCollectionSchema]):
+    for revoked_token in revoked_tokens:
+        invalidation.publish(REVOKED_TOKEN_INVALIDATION,
+                             f'{revoked_token["_id"]}|{_utc_timestamp(revoked_token["expires_at"])}')
+
+
+def revoke_tokens(tokens: List[Tuple[str, datetime]]):
+    revoked_tokens = [RevokedTokenCollectionSchema(_id=jti, expires_at=expires_at) for jti, expires_at in tokens]
+
+    insert_revoked_tokens(revoked_tokens)
+    _publish(revoked_tokens)
+
+
+async def revoke_tokens_async(tokens: List[Tuple[str, datetime]]):
+    revoked_tokens = [RevokedTokenCollectionSchema(_id=jti, expires_at=expires_at) for jti, expires_at in tokens]
+
+    await insert_revoked_tokens_async(revoked_tokens)
+    _publish(revoked_tokens)
+
+
+def _add_revoked_token(key: str):
+    jti, expires_at = key.split('|')
+    revocation_filter.add(jti, float(expires_at))
+
+
+invalidation.subscribe(REVOKED_TOKEN_INVALIDATION, _add_revoked_token)
@@ -8,16 +8,22 @@ from fastapi.exceptions import RequestValidationError
 from starlette import status
 from starlette.middleware.cors import CORSMiddleware
 
+from dependencies.http_client import close_http_client
+from src.database.mongodb.indexes import create_indexes
 from src.env_variables.env import env_variables
 from src.routers.catalogs import catalogs_router
 from src.routers.cron_tasks import cron_router
+from src.routers.metrics import metrics_router
+from src.routers.orders import orders_router
 from src.shared.exceptions import HttpException, http_response_exception_handler, internal_server_exception_handler, \
     request_validation_error_exception_handler, auth_exception_handler, AuthException
 from src.shared.generics import ErrorResponse, Error, ValidationError
+from src.utils.passwords import shutdown_password_executor
 from src.routers.auth import auth_router
 from src.routers.product import product_router
 from src.routers.user import user_router
 from src.routers.stripe_router import stripe_router
+from src.services.taxes import shutdown_tax_executor
 
 # logging.basicConfig(level=logging.DEBUG)
 
@@ -46,12 +52,19 @@ app.include_router(user_router, prefix='/user')
 app.include_router(product_router, prefix='/products')
 app.include_router(stripe_router, prefix='/stripe')
 app.include_router(catalogs_router, prefix='/catalogs')
+app.include_router(orders_router, prefix='/orders')
 app.include_router(cron_router, include_in_schema=False)
+app.include_router(metrics_router, prefix='/metrics', include_in_schema=False)
 
 app.add_exception_handler(HttpException, http_response_exception_handler)
 app.add_exception_handler(Exception, internal_server_exception_handler)
 app.add_exception_handler(RequestValidationError, request_validation_error_exception_handler)
 app.add_exception_handler(AuthException, auth_exception_handler)
 
+app.add_event_handler('startup', create_indexes)
+app.add_event_handler('shutdown', shutdown_password_executor)
+app.add_event_handler('shutdown', close_http_client)
+app.add_event_handler('shutdown', shutdown_tax_executor)
+
 if __name__ == '__main__':
     uvicorn.run(app="main:app", host=env_variables.host, port=int(env_variables.port), reload=True)
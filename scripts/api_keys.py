@@ -0,0 +1,31 @@
+import argparse
+import secrets
+
+from src.database.mongodb.collection.api_key_collection import insert_api_key, remove_api_key
+from src.utils.constants import ApiKeyScope
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Create or revoke AnyCommerce API keys')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    create_parser = subparsers.add_parser('create')
+    create_parser.add_argument('name')
+    create_parser.add_argument('--scope', dest='scopes', action='append', default=[],
+                               choices=[scope.value for scope in ApiKeyScope])
+
+    revoke_parser = subparsers.add_parser('revoke')
+    revoke_parser.add_argument('api_key_id')
+
+    args = parser.parse_args()
+
+    if args.command == 'create':
+        api_key = secrets.token_urlsafe(32)
+        api_key_id = insert_api_key(name=args.name, api_key=api_key, scopes=args.scopes)
+        print(f'{api_key_id} {api_key}')
+    else:
+        print('revoked' if remove_api_key(args.api_key_id) else 'not found')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+import argparse
+import logging
+
+from dependencies.http_client import http_client, COUNTRIES_UPSTREAM
+from src.env_variables.env import env_variables
+from src.utils.geo_catalog import write_geo_catalog
+
+
+def fetch(path: str) -> list:
+    response = http_client.get(COUNTRIES_UPSTREAM, path)
+    response.raise_for_status()
+
+    return response.json()
+
+
+def fetch_cities(countries: list):
+    for country in countries:
+        country_code = country['iso2']
+
+        for state in fetch(f'/countries/{country_code}/states'):
+            state_code = state['iso2']
+
+            for city in fetch(f'/countries/{country_code}/states/{state_code}/cities'):
+                yield country_code, state_code, city['id'], city['name']
+
+        logging.info(f'Fetched cities for {country_code}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the memory-mapped geo catalog served by the catalogs router')
+    parser.add_argument('--output', default=env_variables.geo_catalog_path)
+    parser.add_argument('--country', action='append', help='Only include these country codes')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    countries = fetch('/countries')
+
+    if args.country:
+        countries = [country for country in countries if country['iso2'] in args.country]
+
+    write_geo_catalog(args.output, fetch_cities(countries))
+    print(f'geo catalog written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+import argparse
+import logging
+import signal
+from threading import Event
+
+from dependencies.mongodb import MongoDBClient
+from dependencies.stripe_client import StripeClientInstance
+from src.database.mongodb.indexes import create_indexes
+from src.env_variables.env import env_variables
+from src.services.order_queue import OrderWorker
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Process queued AnyCommerce orders')
+    parser.add_argument('--concurrency', type=int, default=env_variables.order_worker_concurrency)
+    parser.add_argument('--poll-seconds', type=float, default=env_variables.order_worker_poll_seconds)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    create_indexes()
+
+    worker = OrderWorker(
+        mongo_client=MongoDBClient()(),
+        stripe_client=StripeClientInstance()(),
+        concurrency=args.concurrency,
+        poll_seconds=args.poll_seconds
+    )
+    stopped = Event()
+
+    signal.signal(signal.SIGINT, lambda *_: stopped.set())
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+
+    worker.start()
+    logging.info(f'Order worker {worker.lease_owner} started with {args.concurrency} threads')
+
+    stopped.wait()
+    worker.stop()
+
+
+if __name__ == '__main__':
+    main()
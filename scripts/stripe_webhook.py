@@ -0,0 +1,58 @@
+import argparse
+import hashlib
+import hmac
+import json
+import time
+import uuid
+
+import requests
+
+from src.env_variables.env import env_variables
+
+
+def build_event(event_type: str, customer: str, payment_method: str) -> dict:
+    payment_method_object = {'id': payment_method, 'object': 'payment_method', 'type': 'card',
+                             'customer': customer if event_type == 'payment_method.attached' else None}
+    data = {'object': payment_method_object}
+
+    if event_type == 'payment_method.detached':
+        data['previous_attributes'] = {'customer': customer}
+
+    return {
+        'id': f'evt_local_{uuid.uuid4().hex}',
+        'object': 'event',
+        'type': event_type,
+        'created': int(time.time()),
+        'livemode': False,
+        'data': data
+    }
+
+
+def sign(payload: str, secret: str) -> str:
+    timestamp = int(time.time())
+    signature = hmac.new(secret.encode(), f'{timestamp}.{payload}'.encode(), hashlib.sha256).hexdigest()
+
+    return f't={timestamp},v1={signature}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Send signed Stripe webhook events to a local AnyCommerce API')
+    parser.add_argument('event_type', choices=['payment_method.attached', 'payment_method.detached'])
+    parser.add_argument('customer')
+    parser.add_argument('--payment-method', default=f'pm_local_{uuid.uuid4().hex[:12]}')
+    parser.add_argument('--url', default=f'http://{env_variables.host}:{env_variables.port}/stripe/webhook')
+    parser.add_argument('--secret', default=env_variables.stripe_webhook_secret)
+
+    args = parser.parse_args()
+
+    payload = json.dumps(build_event(args.event_type, args.customer, args.payment_method))
+    response = requests.post(args.url, data=payload, headers={
+        'Content-Type': 'application/json',
+        'Stripe-Signature': sign(payload, args.secret)
+    })
+
+    print(response.status_code, response.text)
+
+
+if __name__ == '__main__':
+    main()
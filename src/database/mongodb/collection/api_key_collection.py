@@ -0,0 +1,71 @@
+from datetime import datetime
+from typing import Mapping, Any, List, Optional
+
+from bson import ObjectId
+from pymongo import ASCENDING
+from pymongo.collection import Collection
+from pymongo.database import Database
+
+from dependencies import invalidation
+from dependencies.mongodb import MongoDBClient
+from src.database.mongodb.schema.api_key_schema import ApiKeyCollectionSchema
+from src.utils.utils import api_key_digest
+
+API_KEYS_INVALIDATION = 'api_keys'
+
+mongo_client: Database[Mapping[str, Any] | Any] = MongoDBClient()()
+collection: Collection[ApiKeyCollectionSchema] = mongo_client.api_key
+
+
+def create_indexes():
+    migrate_plaintext_api_keys()
+    collection.create_index([('hash', ASCENDING)], unique=True, sparse=True)
+
+
+def migrate_plaintext_api_keys():
+    for api_key in collection.find({'value': {'$exists': True}}):
+        collection.update_one(
+            {'_id': api_key['_id']},
+            {'$set': {'hash': api_key_digest(api_key['value']),
+                      'name': api_key.get('name', str(api_key['_id'])),
+                      'creation_date': api_key.get('creation_date', api_key['_id'].generation_time)},
+             '$unset': {'value': ''}}
+        )
+
+
+def get_api_keys() -> List[ApiKeyCollectionSchema]:
+    try:
+        return list(collection.find({'hash': {'$exists': True}}, projection={'hash': 1, 'name': 1, 'scopes': 1}))
+    except Exception as e:
+        raise e
+
+
+def insert_api_key(name: str, api_key: str, scopes: Optional[List[str]] = None) -> Optional[str]:
+    try:
+        inserted_api_key_id = collection.insert_one(ApiKeyCollectionSchema(
+            name=name,
+            hash=api_key_digest(api_key),
+            creation_date=datetime.now(),
+            scopes=scopes or []
+        )).inserted_id
+
+        if not inserted_api_key_id:
+            return None
+
+        invalidation.publish(API_KEYS_INVALIDATION, str(inserted_api_key_id))
+
+        return str(inserted_api_key_id)
+    except Exception as e:
+        raise e
+
+
+def remove_api_key(api_key_id: str) -> bool:
+    try:
+        deleted = collection.delete_one({'_id': ObjectId(api_key_id)}).deleted_count > 0
+
+        if deleted:
+            invalidation.publish(API_KEYS_INVALIDATION, api_key_id)
+
+        return deleted
+    except Exception as e:
+        raise e
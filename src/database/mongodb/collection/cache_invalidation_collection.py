@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Mapping, Any, List
+
+from bson import ObjectId
+from pymongo import ASCENDING
+from pymongo.collection import Collection
+from pymongo.database import Database
+
+from dependencies.mongodb import MongoDBClient
+from src.database.mongodb.schema.cache_invalidation_schema import CacheInvalidationCollectionSchema
+from src.utils.constants import Params
+
+mongo_client: Database[Mapping[str, Any] | Any] = MongoDBClient()()
+collection: Collection[CacheInvalidationCollectionSchema] = mongo_client.cache_invalidation
+
+
+def create_indexes():
+    collection.create_index([('created_at', ASCENDING)],
+                            expireAfterSeconds=Params.CACHE_INVALIDATION_RETENTION_SECONDS)
+
+
+def insert_cache_invalidation(cache_invalidation: CacheInvalidationCollectionSchema) -> str:
+    try:
+        return str(collection.insert_one(cache_invalidation).inserted_id)
+    except Exception as e:
+        raise e
+
+
+def get_cache_invalidations_since(since: datetime) -> List[CacheInvalidationCollectionSchema]:
+    try:
+        return list(collection.find({'_id': {'$gte': ObjectId.from_datetime(since)}}).sort('_id', ASCENDING))
+    except Exception as e:
+        raise e
@@ -0,0 +1,184 @@
+import logging
+from typing import Dict, Mapping, Any, List
+
+from bson import ObjectId
+from pymongo import ASCENDING, UpdateOne
+from pymongo.errors import DuplicateKeyError
+from pymongo.collection import Collection
+from pymongo.database import Database
+
+from dependencies.mongodb import MongoDBClient, AsyncMongoDBClient
+from src.database.mongodb.schema.cart_schema import CartCollectionSchema, CartLineSchema
+from src.utils.utils import cart_line_key
+
+mongo_client: Database[Mapping[str, Any] | Any] = MongoDBClient()()
+collection: Collection[CartCollectionSchema] = mongo_client.cart
+async_collection = AsyncMongoDBClient()().cart
+
+MIGRATION_BATCH_SIZE = 500
+
+
+def create_indexes():
+    migrate_legacy_carts()
+    merge_duplicate_carts()
+    collection.create_index([('user_id', ASCENDING)], unique=True)
+    collection.create_index([('user_id', ASCENDING), ('cart.key', ASCENDING)])
+
+
+def _to_cart_line(line: Mapping[str, Any]) -> CartLineSchema:
+    if 'product' not in line:
+        return CartLineSchema(
+            key=cart_line_key(str(line['product_id']), line['variant_keys']),
+            product_id=line['product_id'],
+            variant_keys=line['variant_keys'],
+            amount=line['amount'],
+            unit_price=line.get('unit_price') if line.get('currency') else None,
+            currency=line.get('currency')
+        )
+
+    product_id = str(line['product'].get('_id') or line['product'].get('id'))
+    variants = line['cart_info'].get('variants') or []
+    variant_keys = sorted({variant['key'] for variant in variants})
+
+    return CartLineSchema(
+        key=cart_line_key(product_id, variant_keys),
+        product_id=ObjectId(product_id),
+        variant_keys=variant_keys,
+        amount=line['cart_info']['amount'],
+        unit_price=line['product']['cost'] + sum(variant.get('price') or 0 for variant in variants),
+        currency=line['product']['currency']
+    )
+
+
+def migrate_legacy_carts() -> int:
+    try:
+        migrated = 0
+        updates: List[UpdateOne] = []
+
+        for cart in collection.find({'$or': [
+            {'cart.product': {'$exists': True}},
+            {'cart': {'$elemMatch': {'key': {'$exists': False}}}},
+            {'cart': {'$elemMatch': {'unit_price': {'$ne': None}, 'currency': {'$exists': False}}}}
+        ]}, projection={'cart': 1}):
+            updates.append(UpdateOne(
+                {'_id': cart['_id']},
+                {'$set': {'cart': [_to_cart_line(line) for line in cart['cart']]}}
+            ))
+
+            if len(updates) >= MIGRATION_BATCH_SIZE:
+                migrated += collection.bulk_write(updates, ordered=False).modified_count
+                updates = []
+
+        if updates:
+            migrated += collection.bulk_write(updates, ordered=False).modified_count
+
+        if migrated:
+            logging.info(f'Migrated {migrated} legacy carts to keyed product references')
+
+        return migrated
+    except Exception as e:
+        raise e
+
+
+def merge_duplicate_carts() -> int:
+    try:
+        merged = 0
+
+        for duplicate in collection.aggregate([
+            {'$sort': {'_id': ASCENDING}},
+            {'$group': {'_id': '$user_id', 'ids': {'$push': '$_id'}, 'count': {'$sum': 1}}},
+            {'$match': {'count': {'$gt': 1}}}
+        ], allowDiskUse=True):
+            lines: Dict[str, CartLineSchema] = {}
+
+            for cart in collection.find({'_id': {'$in': duplicate['ids']}}).sort('_id', ASCENDING):
+                for line in cart['cart']:
+                    if line['key'] in lines:
+                        lines[line['key']]['amount'] += line['amount']
+                    else:
+                        lines[line['key']] = line
+
+            collection.update_one({'_id': duplicate['ids'][0]}, {'$set': {'cart': list(lines.values())}})
+            merged += collection.delete_many({'_id': {'$in': duplicate['ids'][1:]}}).deleted_count
+
+        if merged:
+            logging.info(f'Merged {merged} duplicate carts')
+
+        return merged
+    except Exception as e:
+        raise e
+
+
+async def add_cart_lines_async(user_id: str, lines: List[CartLineSchema]) -> bool:
+    try:
+        result = await async_collection.update_one({'user_id': user_id}, [{'$set': {'cart': {'$concatArrays': [
+            '$cart',
+            {'$filter': {
+                'input': {'$literal': lines},
+                'cond': {'$not': [{'$in': ['$$this.key', '$cart.key']}]}
+            }}
+        ]}}}])
+
+        return result.matched_count > 0
+    except Exception as e:
+        raise e
+
+
+async def upsert_cart_line_async(user_id: str, line: CartLineSchema):
+    pipeline = [{'$set': {'cart': {'$let': {
+        'vars': {'cart': {'$ifNull': ['$cart', []]}},
+        'in': {'$cond': [
+            {'$in': [line['key'], '$$cart.key']},
+            {'$map': {
+                'input': '$$cart',
+                'in': {'$cond': [
+                    {'$eq': ['$$this.key', line['key']]},
+                    {'$mergeObjects': ['$$this', {
+                        'amount': {'$add': ['$$this.amount', line['amount']]},
+                        'unit_price': {'$literal': line.get('unit_price')},
+                        'currency': {'$literal': line.get('currency')}
+                    }]},
+                    '$$this'
+                ]}
+            }},
+            {'$concatArrays': ['$$cart', [{'$literal': line}]]}
+        ]}
+    }}}}]
+
+    try:
+        try:
+            await async_collection.update_one({'user_id': user_id}, pipeline, upsert=True)
+        except DuplicateKeyError:
+            await async_collection.update_one({'user_id': user_id}, pipeline, upsert=True)
+    except Exception as e:
+        raise e
+
+
+async def increment_cart_line_async(user_id: str, key: str, amount: int) -> bool:
+    try:
+        result = await async_collection.update_one({'user_id': user_id, 'cart.key': key},
+                                                   {'$inc': {'cart.$.amount': amount}})
+
+        return result.matched_count > 0
+    except Exception as e:
+        raise e
+
+
+async def set_cart_line_amount_async(user_id: str, key: str, amount: int) -> bool:
+    try:
+        result = await async_collection.update_one({'user_id': user_id, 'cart.key': key},
+                                                   {'$set': {'cart.$.amount': amount}})
+
+        return result.matched_count > 0
+    except Exception as e:
+        raise e
+
+
+async def remove_cart_line_async(user_id: str, key: str) -> bool:
+    try:
+        result = await async_collection.update_one({'user_id': user_id, 'cart.key': key},
+                                                   {'$pull': {'cart': {'key': key}}})
+
+        return result.matched_count > 0
+    except Exception as e:
+        raise e
@@ -1,5 +1,6 @@
 from typing import Optional, Mapping, Any, List
 
+from pymongo import ASCENDING
 from pymongo.collection import Collection
 from pymongo.database import Database
 
@@ -25,3 +26,10 @@ def get_categories() -> Optional[List[CategoriesModel]]:
         return categories
     except Exception as e:
         raise e
+
+
+def get_category_documents() -> List[CategoryCatalogCollectionSchema]:
+    try:
+        return list(collection.find().sort('_id', ASCENDING))
+    except Exception as e:
+        raise e
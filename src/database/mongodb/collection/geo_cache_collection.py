@@ -0,0 +1,31 @@
+from typing import Mapping, Any, Optional
+
+from pymongo import ASCENDING
+from pymongo.collection import Collection
+from pymongo.database import Database
+
+from dependencies.mongodb import MongoDBClient
+from src.database.mongodb.schema.geo_cache_schema import GeoCacheCollectionSchema
+
+mongo_client: Database[Mapping[str, Any] | Any] = MongoDBClient()()
+collection: Collection[GeoCacheCollectionSchema] = mongo_client.geo_cache
+
+
+def create_indexes():
+    collection.create_index([('expires_at', ASCENDING)], expireAfterSeconds=0)
+
+
+def get_geo_cache(key: str) -> Optional[GeoCacheCollectionSchema]:
+    try:
+        return collection.find_one({'_id': key})
+    except Exception as e:
+        raise e
+
+
+def upsert_geo_cache(geo_cache: GeoCacheCollectionSchema) -> bool:
+    try:
+        collection.replace_one({'_id': geo_cache['_id']}, geo_cache, upsert=True)
+
+        return True
+    except Exception as e:
+        raise e
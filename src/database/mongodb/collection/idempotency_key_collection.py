@@ -0,0 +1,58 @@
+from datetime import datetime
+from typing import Mapping, Any, Optional
+
+from pymongo import ASCENDING
+from pymongo.collection import Collection
+from pymongo.database import Database
+from pymongo.errors import DuplicateKeyError
+
+from dependencies.mongodb import MongoDBClient
+from src.database.mongodb.schema.idempotency_key_schema import IdempotencyKeyCollectionSchema
+
+mongo_client: Database[Mapping[str, Any] | Any] = MongoDBClient()()
+collection: Collection[IdempotencyKeyCollectionSchema] = mongo_client.idempotency_keys
+
+
+def create_indexes():
+    collection.create_index([('expires_at', ASCENDING)], expireAfterSeconds=0)
+
+
+def claim_idempotency_key(idempotency_key: IdempotencyKeyCollectionSchema) -> bool:
+    try:
+        collection.insert_one(idempotency_key)
+
+        return True
+    except DuplicateKeyError:
+        return False
+    except Exception as e:
+        raise e
+
+
+def get_idempotency_key(key: str) -> Optional[IdempotencyKeyCollectionSchema]:
+    try:
+        return collection.find_one({'_id': key})
+    except Exception as e:
+        raise e
+
+
+def take_over_idempotency_key(key: str, state: str, stale_before: datetime,
+                              idempotency_key: IdempotencyKeyCollectionSchema) -> bool:
+    try:
+        return collection.replace_one({'_id': key, 'state': state, 'expires_at': {'$lte': stale_before}},
+                                      idempotency_key).modified_count > 0
+    except Exception as e:
+        raise e
+
+
+def complete_idempotency_key(key: str, idempotency_key: IdempotencyKeyCollectionSchema) -> bool:
+    try:
+        return collection.replace_one({'_id': key}, idempotency_key).modified_count > 0
+    except Exception as e:
+        raise e
+
+
+def remove_idempotency_key(key: str) -> bool:
+    try:
+        return collection.delete_one({'_id': key}).deleted_count > 0
+    except Exception as e:
+        raise e
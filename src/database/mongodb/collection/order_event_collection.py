@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import Mapping, Any, List, Optional
+
+from bson import ObjectId
+from pymongo import ASCENDING
+from pymongo.collection import Collection
+from pymongo.database import Database
+
+from dependencies.mongodb import MongoDBClient, AsyncMongoDBClient
+from src.database.mongodb.schema.order_event_schema import OrderEventCollectionSchema
+from src.env_variables.env import env_variables
+
+mongo_client: Database[Mapping[str, Any] | Any] = MongoDBClient()()
+collection: Collection[OrderEventCollectionSchema] = mongo_client.order_events
+async_collection = AsyncMongoDBClient()().order_events
+
+
+def create_indexes():
+    collection.create_index([('order_id', ASCENDING), ('_id', ASCENDING)])
+    collection.create_index([('created_at', ASCENDING)],
+                            expireAfterSeconds=env_variables.order_events_retention_seconds)
+
+
+def insert_order_event(order_event: OrderEventCollectionSchema) -> ObjectId:
+    try:
+        return collection.insert_one(order_event).inserted_id
+    except Exception as e:
+        raise e
+
+
+def get_order_events_since(since: datetime, order_ids: List[str], origin: str) -> List[OrderEventCollectionSchema]:
+    try:
+        return list(collection.find({
+            '_id': {'$gte': ObjectId.from_datetime(since)},
+            'order_id': {'$in': order_ids},
+            'origin': {'$ne': origin}
+        }).sort('_id', ASCENDING))
+    except Exception as e:
+        raise e
+
+
+async def get_order_events_async(order_id: str, after: Optional[ObjectId] = None) \
+        -> List[OrderEventCollectionSchema]:
+    try:
+        query = {'order_id': order_id}
+
+        if after:
+            query['_id'] = {'$gt': after}
+
+        return await async_collection.find(query).sort('_id', ASCENDING).to_list(length=None)
+    except Exception as e:
+        raise e
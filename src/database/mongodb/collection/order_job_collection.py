@@ -0,0 +1,176 @@
+from datetime import datetime
+from typing import Mapping, Any, Optional, List
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
+from pymongo.collection import Collection
+from pymongo.database import Database
+
+from dependencies.mongodb import MongoDBClient, AsyncMongoDBClient
+from src.database.mongodb.schema.order_job_schema import OrderJobCollectionSchema, OrderJobErrorSchema, \
+    OrderJobCheckoutSchema
+from src.utils.constants import OrderJobStatus
+
+mongo_client: Database[Mapping[str, Any] | Any] = MongoDBClient()()
+collection: Collection[OrderJobCollectionSchema] = mongo_client.order_jobs
+async_collection = AsyncMongoDBClient()().order_jobs
+
+
+def create_indexes():
+    collection.create_index([('status', ASCENDING), ('available_at', ASCENDING)])
+    collection.create_index([('status', ASCENDING), ('lease_expires_at', ASCENDING)])
+    collection.create_index([('user_id', ASCENDING), ('_id', ASCENDING)])
+    collection.create_index([('payment_intent_id', ASCENDING), ('_id', DESCENDING)])
+    collection.create_index([('expires_at', ASCENDING)], expireAfterSeconds=0)
+
+
+def insert_order_job(order_job: OrderJobCollectionSchema) -> ObjectId:
+    try:
+        return collection.insert_one(order_job).inserted_id
+    except Exception as e:
+        raise e
+
+
+def count_pending_order_jobs() -> int:
+    try:
+        return collection.count_documents(
+            {'status': {'$in': [OrderJobStatus.QUEUED.value, OrderJobStatus.PROCESSING.value]}})
+    except Exception as e:
+        raise e
+
+
+def get_order_job(order_job_id: str, user_id: str) -> Optional[OrderJobCollectionSchema]:
+    try:
+        return collection.find_one({'_id': ObjectId(order_job_id), 'user_id': user_id})
+    except Exception as e:
+        raise e
+
+
+async def get_order_job_async(order_job_id: str, user_id: str) -> Optional[OrderJobCollectionSchema]:
+    try:
+        return await async_collection.find_one({'_id': ObjectId(order_job_id), 'user_id': user_id})
+    except Exception as e:
+        raise e
+
+
+async def get_order_job_by_payment_intent_async(payment_intent_id: str) -> Optional[OrderJobCollectionSchema]:
+    try:
+        return await async_collection.find_one({'payment_intent_id': payment_intent_id},
+                                               sort=[('_id', DESCENDING)])
+    except Exception as e:
+        raise e
+
+
+def lease_order_job(lease_owner: str, max_attempts: int, now: datetime, lease_expires_at: datetime) \
+        -> Optional[OrderJobCollectionSchema]:
+    try:
+        return collection.find_one_and_update(
+            {'$or': [
+                {'status': OrderJobStatus.QUEUED.value, 'available_at': {'$lte': now}},
+                {'status': OrderJobStatus.PROCESSING.value, 'lease_expires_at': {'$lte': now},
+                 'attempts': {'$lt': max_attempts}}
+            ]},
+            {
+                '$set': dict(
+                    status=OrderJobStatus.PROCESSING.value,
+                    lease_owner=lease_owner,
+                    lease_expires_at=lease_expires_at,
+                    updated_at=now
+                ),
+                '$inc': {'attempts': 1}
+            },
+            sort=[('available_at', ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+    except Exception as e:
+        raise e
+
+
+def renew_order_job_lease(order_job_id: ObjectId, lease_owner: str, now: datetime,
+                          lease_expires_at: datetime) -> bool:
+    try:
+        return collection.update_one(
+            {'_id': order_job_id, 'status': OrderJobStatus.PROCESSING.value, 'lease_owner': lease_owner},
+            {'$set': dict(lease_expires_at=lease_expires_at, updated_at=now)}
+        ).matched_count > 0
+    except Exception as e:
+        raise e
+
+
+def fail_abandoned_order_job(max_attempts: int, error: OrderJobErrorSchema, now: datetime,
+                             expires_at: datetime) -> Optional[OrderJobCollectionSchema]:
+    try:
+        return collection.find_one_and_update(
+            {'status': OrderJobStatus.PROCESSING.value, 'lease_expires_at': {'$lte': now},
+             'attempts': {'$gte': max_attempts}},
+            {'$set': dict(
+                status=OrderJobStatus.FAILED.value,
+                lease_owner=None,
+                lease_expires_at=None,
+                error=error,
+                updated_at=now,
+                expires_at=expires_at
+            )},
+            return_document=ReturnDocument.AFTER
+        )
+    except Exception as e:
+        raise e
+
+
+def _update_leased_order_job(order_job_id: ObjectId, lease_owner: str, update: dict) -> bool:
+    return collection.update_one(
+        {'_id': order_job_id, 'status': OrderJobStatus.PROCESSING.value, 'lease_owner': lease_owner},
+        {'$set': dict(lease_owner=None, lease_expires_at=None, **update)}
+    ).modified_count > 0
+
+
+def checkpoint_order_job(order_job_id: ObjectId, lease_owner: str, checkout: Optional[OrderJobCheckoutSchema],
+                         now: datetime) -> bool:
+    try:
+        return collection.update_one(
+            {'_id': order_job_id, 'status': OrderJobStatus.PROCESSING.value, 'lease_owner': lease_owner},
+            {'$set': dict(checkout=checkout, updated_at=now,
+                          **(dict(payment_intent_id=checkout['payment_intent_id']) if checkout else {}))}
+        ).matched_count > 0
+    except Exception as e:
+        raise e
+
+
+def complete_order_job(order_job_id: ObjectId, lease_owner: str, order_ids: List[str], now: datetime,
+                       expires_at: datetime) -> bool:
+    try:
+        return _update_leased_order_job(order_job_id, lease_owner, dict(
+            status=OrderJobStatus.SUCCEEDED.value,
+            order_ids=order_ids,
+            error=None,
+            updated_at=now,
+            expires_at=expires_at
+        ))
+    except Exception as e:
+        raise e
+
+
+def retry_order_job(order_job_id: ObjectId, lease_owner: str, error: OrderJobErrorSchema, now: datetime,
+                    available_at: datetime) -> bool:
+    try:
+        return _update_leased_order_job(order_job_id, lease_owner, dict(
+            status=OrderJobStatus.QUEUED.value,
+            error=error,
+            updated_at=now,
+            available_at=available_at
+        ))
+    except Exception as e:
+        raise e
+
+
+def fail_order_job(order_job_id: ObjectId, lease_owner: str, error: OrderJobErrorSchema, now: datetime,
+                   expires_at: datetime) -> bool:
+    try:
+        return _update_leased_order_job(order_job_id, lease_owner, dict(
+            status=OrderJobStatus.FAILED.value,
+            error=error,
+            updated_at=now,
+            expires_at=expires_at
+        ))
+    except Exception as e:
+        raise e
@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+from typing import Mapping, Any, List
+
+from bson import ObjectId
+from pymongo import ASCENDING
+from pymongo.collection import Collection
+from pymongo.database import Database
+
+from dependencies.mongodb import MongoDBClient
+from src.database.mongodb.schema.reservation_schema import ReservationCollectionSchema
+
+mongo_client: Database[Mapping[str, Any] | Any] = MongoDBClient()()
+collection: Collection[ReservationCollectionSchema] = mongo_client.reservations
+
+
+def create_indexes():
+    if collection.index_information().get('expires_at_1', {}).get('expireAfterSeconds') is not None:
+        collection.drop_index('expires_at_1')
+
+    collection.create_index([('expires_at', ASCENDING)])
+    collection.create_index([('product_id', ASCENDING), ('expires_at', ASCENDING)])
+    collection.create_index([('user_id', ASCENDING)])
+
+
+def insert_reservations(reservations: List[ReservationCollectionSchema]) -> List[ObjectId]:
+    try:
+        return collection.insert_many(reservations, ordered=False).inserted_ids
+    except Exception as e:
+        raise e
+
+
+def get_user_reservations(user_id: str) -> List[ReservationCollectionSchema]:
+    try:
+        return list(collection.find({'user_id': user_id}))
+    except Exception as e:
+        raise e
+
+
+def get_reservations(reservation_ids: List[ObjectId]) -> List[ReservationCollectionSchema]:
+    try:
+        return list(collection.find({'_id': {'$in': reservation_ids}}))
+    except Exception as e:
+        raise e
+
+
+def get_expired_reservations(limit: int) -> List[ReservationCollectionSchema]:
+    try:
+        return list(collection.find({'expires_at': {'$lte': datetime.now(timezone.utc)}}).limit(limit))
+    except Exception as e:
+        raise e
+
+
+def remove_reservations(reservation_ids: List[ObjectId]) -> int:
+    try:
+        return collection.delete_many({'_id': {'$in': reservation_ids}}).deleted_count
+    except Exception as e:
+        raise e
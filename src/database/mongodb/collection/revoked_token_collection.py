@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+from typing import Mapping, Any, List
+
+from pymongo import ASCENDING, UpdateOne
+from pymongo.collection import Collection
+from pymongo.database import Database
+
+from dependencies.mongodb import MongoDBClient, AsyncMongoDBClient
+from src.database.mongodb.schema.revoked_token_schema import RevokedTokenCollectionSchema
+
+mongo_client: Database[Mapping[str, Any] | Any] = MongoDBClient()()
+collection: Collection[RevokedTokenCollectionSchema] = mongo_client.revoked_token
+async_collection = AsyncMongoDBClient()().revoked_token
+
+
+def create_indexes():
+    collection.create_index([('expires_at', ASCENDING)], expireAfterSeconds=0)
+
+
+def get_revoked_tokens() -> List[RevokedTokenCollectionSchema]:
+    try:
+        return list(collection.find({'expires_at': {'$gt': datetime.now(timezone.utc)}}))
+    except Exception as e:
+        raise e
+
+
+def is_token_revoked(jti: str) -> bool:
+    try:
+        return collection.count_documents({'_id': jti}, limit=1) > 0
+    except Exception as e:
+        raise e
+
+
+async def is_token_revoked_async(jti: str) -> bool:
+    try:
+        return await async_collection.count_documents({'_id': jti}, limit=1) > 0
+    except Exception as e:
+        raise e
+
+
+def _revoked_token_upserts(revoked_tokens: List[RevokedTokenCollectionSchema]) -> List[UpdateOne]:
+    return [UpdateOne({'_id': revoked_token['_id']}, {'$set': revoked_token}, upsert=True)
+            for revoked_token in revoked_tokens]
+
+
+def insert_revoked_tokens(revoked_tokens: List[RevokedTokenCollectionSchema]) -> bool:
+    try:
+        if revoked_tokens:
+            collection.bulk_write(_revoked_token_upserts(revoked_tokens), ordered=False)
+
+        return True
+    except Exception as e:
+        raise e
+
+
+async def insert_revoked_tokens_async(revoked_tokens: List[RevokedTokenCollectionSchema]) -> bool:
+    try:
+        if revoked_tokens:
+            await async_collection.bulk_write(_revoked_token_upserts(revoked_tokens), ordered=False)
+
+        return True
+    except Exception as e:
+        raise e
@@ -1,35 +1,147 @@
-from typing import Optional, Mapping, Any
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Mapping, Any, List, Tuple
 
 from bson import ObjectId
+from jose import jwt, JWTError
+from pymongo import ReturnDocument, ASCENDING, DESCENDING
 from pymongo.collection import Collection
 from pymongo.database import Database
 
-from dependencies.mongodb import MongoDBClient
+from dependencies.auth_cache import evict_token_digest, evict_user_tokens
+from dependencies.mongodb import MongoDBClient, AsyncMongoDBClient
+from dependencies.revocation import revoke_tokens, revoke_tokens_async
 from src.database.mongodb.schema.session_token_schema import SessionTokenCollectionSchema
 from src.models.session_token import SessionTokenModel
-from src.utils.utils import snake_to_camel_case
+from src.utils.constants import Params
+from src.utils.utils import snake_to_camel_case, token_digest
 
 mongo_client: Database[Mapping[str, Any] | Any] = MongoDBClient()()
 collection: Collection[SessionTokenCollectionSchema] = mongo_client.session_token
+async_collection = AsyncMongoDBClient()().session_token
+
+revocation_projection = {'access_token_digest': 1, 'access_token_jti': 1, 'access_expires_at': 1}
+
+
+def create_indexes():
+    migrate_legacy_session_tokens()
+    remove_duplicate_session_tokens('access_token_digest')
+    remove_duplicate_session_tokens('refresh_token_digest')
+    collection.create_index([('access_token_digest', ASCENDING)], unique=True)
+    collection.create_index([('refresh_token_digest', ASCENDING)], unique=True)
+    collection.create_index([('username', ASCENDING), ('session_date', DESCENDING)])
+    collection.create_index([('expires_at', ASCENDING)], expireAfterSeconds=0)
+
+
+def migrate_legacy_session_tokens():
+    for session_token in collection.find({'data': {'$exists': True}}):
+        try:
+            expires_at = datetime.fromtimestamp(
+                jwt.get_unverified_claims(session_token['data']['refresh_token'])['exp'], tz=timezone.utc)
+        except (JWTError, KeyError):
+            expires_at = session_token['session_date'] + timedelta(minutes=Params.REFRESH_TOKEN_EXPIRE_MINUTES)
+
+        collection.update_one(
+            {'_id': session_token['_id']},
+            {'$set': {'access_token_digest': token_digest(session_token['data']['access_token']),
+                      'refresh_token_digest': token_digest(session_token['data']['refresh_token']),
+                      'expires_at': expires_at},
+             '$unset': {'data': ''}}
+        )
+
+
+def remove_duplicate_session_tokens(field: str) -> int:
+    removed = 0
+
+    for duplicate in collection.aggregate([
+        {'$match': {field: {'$exists': True}}},
+        {'$sort': {'session_date': DESCENDING, '_id': DESCENDING}},
+        {'$group': {'_id': f'${field}', 'ids': {'$push': '$_id'}, 'count': {'$sum': 1}}},
+        {'$match': {'count': {'$gt': 1}}}
+    ], allowDiskUse=True):
+        removed += collection.delete_many({'_id': {'$in': duplicate['ids'][1:]}}).deleted_count
+
+    return removed
+
+
+def _revocable_tokens(session_tokens: List[SessionTokenCollectionSchema]) -> List[Tuple[str, datetime]]:
+    return [(session_token['access_token_jti'], session_token['access_expires_at']) for session_token in session_tokens
+            if session_token.get('access_token_jti') and session_token.get('access_expires_at')]
+
+
+def _revoke_session_token(session_token: SessionTokenCollectionSchema):
+    evict_token_digest(session_token['access_token_digest'])
+    revoke_tokens(_revocable_tokens([session_token]))
+
+
+async def _revoke_session_token_async(session_token: SessionTokenCollectionSchema):
+    evict_token_digest(session_token['access_token_digest'])
+    await revoke_tokens_async(_revocable_tokens([session_token]))
+
+
+def _session_token_query(refresh_token: Optional[str] = None, username: Optional[str] = None,
+                         access_token: Optional[str] = None) -> Optional[dict]:
+    if refresh_token:
+        return {'refresh_token_digest': token_digest(refresh_token)}
+    elif username:
+        return {'username': username}
+    elif access_token:
+        return {'access_token_digest': token_digest(access_token)}
+
+    return None
+
+
+def _to_model(session_token: Optional[SessionTokenCollectionSchema]) -> Optional[SessionTokenModel]:
+    if not session_token:
+        return None
+
+    return SessionTokenModel(**snake_to_camel_case(session_token))
+
+
+def _revoke_session_tokens(session_tokens: List[SessionTokenCollectionSchema], username: str):
+    evict_user_tokens(username)
+    revoke_tokens(_revocable_tokens(session_tokens))
+
+
+async def _revoke_session_tokens_async(session_tokens: List[SessionTokenCollectionSchema], username: str):
+    evict_user_tokens(username)
+    await revoke_tokens_async(_revocable_tokens(session_tokens))
 
 
 def get_session_token(refresh_token: Optional[str] = None, username: Optional[str] = None,
                       access_token: Optional[str] = None) -> (
         Optional)[SessionTokenModel]:
     try:
-        session_token = None
+        query = _session_token_query(refresh_token=refresh_token, username=username, access_token=access_token)
 
-        if refresh_token:
-            session_token = collection.find_one({'data.refresh_token': refresh_token})
-        elif username:
-            session_token = collection.find_one({'username': username})
-        elif access_token:
-            session_token = collection.find_one({'data.access_token': access_token})
+        return _to_model(collection.find_one(query)) if query else None
+    except Exception as e:
+        raise e
 
-        if not session_token:
-            return None
 
-        return SessionTokenModel(**snake_to_camel_case(session_token))
+async def get_session_token_async(refresh_token: Optional[str] = None, username: Optional[str] = None,
+                                  access_token: Optional[str] = None) -> Optional[SessionTokenModel]:
+    try:
+        query = _session_token_query(refresh_token=refresh_token, username=username, access_token=access_token)
+
+        return _to_model(await async_collection.find_one(query)) if query else None
+    except Exception as e:
+        raise e
+
+
+def get_session_tokens_by_username(username: str) -> List[SessionTokenModel]:
+    try:
+        session_tokens = collection.find({'username': username}).sort('session_date', DESCENDING)
+
+        return [_to_model(session_token) for session_token in session_tokens]
+    except Exception as e:
+        raise e
+
+
+async def get_session_tokens_by_username_async(username: str) -> List[SessionTokenModel]:
+    try:
+        session_tokens = async_collection.find({'username': username}).sort('session_date', DESCENDING)
+
+        return [_to_model(session_token) async for session_token in session_tokens]
     except Exception as e:
         raise e
 
@@ -46,17 +158,51 @@ def insert_session_token(session_token: SessionTokenCollectionSchema) -> Optiona
         raise e
 
 
+async def insert_session_token_async(session_token: SessionTokenCollectionSchema) -> Optional[str]:
+    try:
+        inserted_session_token_id = (await async_collection.insert_one(session_token)).inserted_id
+
+        if not inserted_session_token_id:
+            return None
+
+        return str(inserted_session_token_id)
+    except Exception as e:
+        raise e
+
+
 def update_session_token_with_id(token_id: str, session_token: SessionTokenCollectionSchema) -> Optional[str]:
     try:
-        updated_session_token_id = collection.update_one(
+        previous_session_token = collection.find_one_and_update(
             {"_id": ObjectId(token_id)},
-            {"$set": session_token}
-        ).upserted_id
+            {"$set": session_token},
+            return_document=ReturnDocument.BEFORE
+        )
 
-        if not updated_session_token_id:
+        if not previous_session_token:
             return None
 
-        return str(updated_session_token_id)
+        _revoke_session_token(previous_session_token)
+
+        return str(previous_session_token['_id'])
+    except Exception as e:
+        raise e
+
+
+async def update_session_token_with_id_async(token_id: str,
+                                             session_token: SessionTokenCollectionSchema) -> Optional[str]:
+    try:
+        previous_session_token = await async_collection.find_one_and_update(
+            {"_id": ObjectId(token_id)},
+            {"$set": session_token},
+            return_document=ReturnDocument.BEFORE
+        )
+
+        if not previous_session_token:
+            return None
+
+        await _revoke_session_token_async(previous_session_token)
+
+        return str(previous_session_token['_id'])
     except Exception as e:
         raise e
 
@@ -64,10 +210,27 @@ def update_session_token_with_id(token_id: str, session_token: SessionTokenColle
 def remove_session_token(refresh_token: Optional[str] = None,
                          username: Optional[str] = None) -> bool:
     try:
-        if refresh_token:
-            collection.delete_one({'data.refresh_token': refresh_token})
-        elif username:
-            collection.delete_one({'username': username})
+        query = _session_token_query(refresh_token=refresh_token, username=username)
+        session_token = collection.find_one(query) if query else None
+
+        if session_token:
+            _revoke_session_token(session_token)
+            collection.delete_one({'_id': session_token['_id']})
+
+        return True
+    except Exception as e:
+        raise e
+
+
+async def remove_session_token_async(refresh_token: Optional[str] = None,
+                                     username: Optional[str] = None) -> bool:
+    try:
+        query = _session_token_query(refresh_token=refresh_token, username=username)
+        session_token = await async_collection.find_one(query) if query else None
+
+        if session_token:
+            await _revoke_session_token_async(session_token)
+            await async_collection.delete_one({'_id': session_token['_id']})
 
         return True
     except Exception as e:
@@ -78,9 +241,29 @@ def remove_many_sessions_token(refresh_token: Optional[str] = None,
                                username: Optional[str] = None) -> bool:
     try:
         if refresh_token:
-            collection.delete_many({'data.refresh_token': refresh_token})
+            remove_session_token(refresh_token=refresh_token)
         elif username:
-            collection.delete_many({'username': username})
+            session_tokens = list(collection.find({'username': username}, revocation_projection))
+
+            _revoke_session_tokens(session_tokens, username)
+            collection.delete_many({'_id': {'$in': [session_token['_id'] for session_token in session_tokens]}})
+
+        return True
+    except Exception as e:
+        raise e
+
+
+async def remove_many_sessions_token_async(refresh_token: Optional[str] = None,
+                                           username: Optional[str] = None) -> bool:
+    try:
+        if refresh_token:
+            await remove_session_token_async(refresh_token=refresh_token)
+        elif username:
+            session_tokens = await async_collection.find({'username': username}, revocation_projection).to_list(None)
+
+            await _revoke_session_tokens_async(session_tokens, username)
+            await async_collection.delete_many(
+                {'_id': {'$in': [session_token['_id'] for session_token in session_tokens]}})
 
         return True
     except Exception as e:
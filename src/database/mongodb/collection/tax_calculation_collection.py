@@ -0,0 +1,32 @@
+from datetime import datetime, timezone
+from typing import Mapping, Any, Optional
+
+from pymongo import ASCENDING
+from pymongo.collection import Collection
+from pymongo.database import Database
+
+from dependencies.mongodb import MongoDBClient
+from src.database.mongodb.schema.tax_calculation_schema import TaxCalculationCollectionSchema
+
+mongo_client: Database[Mapping[str, Any] | Any] = MongoDBClient()()
+collection: Collection[TaxCalculationCollectionSchema] = mongo_client.tax_calculation
+
+
+def create_indexes():
+    collection.create_index([('expires_at', ASCENDING)], expireAfterSeconds=0)
+
+
+def get_tax_calculation(fingerprint: str) -> Optional[TaxCalculationCollectionSchema]:
+    try:
+        return collection.find_one({'_id': fingerprint, 'expires_at': {'$gt': datetime.now(timezone.utc)}})
+    except Exception as e:
+        raise e
+
+
+def upsert_tax_calculation(tax_calculation: TaxCalculationCollectionSchema) -> bool:
+    try:
+        collection.replace_one({'_id': tax_calculation['_id']}, tax_calculation, upsert=True)
+
+        return True
+    except Exception as e:
+        raise e
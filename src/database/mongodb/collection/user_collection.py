@@ -3,23 +3,96 @@ from typing import Optional, Mapping, Any
 from pymongo.collection import Collection
 from pymongo.database import Database
 
-from dependencies.mongodb import MongoDBClient
+from dependencies.auth_cache import evict_principal
+from dependencies.mongodb import MongoDBClient, AsyncMongoDBClient
 from src.database.mongodb.schema.user_schema import UserCollectionSchema
-from src.models.user import UserModel
+from src.models.user import UserModel, BaseUserModel, UserPreferencesModel
 from src.utils.utils import snake_to_camel_case
 
 mongo_client: Database[Mapping[str, Any] | Any] = MongoDBClient()()
 collection: Collection[UserCollectionSchema] = mongo_client.user
+async_collection = AsyncMongoDBClient()().user
+
+principal_projection = {'password': 0}
+
+
+def _email_query(email: str) -> dict:
+    return {'email.value': email}
+
+
+def _to_user_model(user_schema: Optional[UserCollectionSchema]) -> Optional[UserModel]:
+    if not user_schema:
+        return None
+
+    return UserModel(**snake_to_camel_case(user_schema))
+
+
+def _to_principal(user_schema: Optional[UserCollectionSchema],
+                  preferences: Optional[UserPreferencesModel]) -> Optional[BaseUserModel]:
+    if not user_schema:
+        return None
+
+    user = snake_to_camel_case(user_schema)
+
+    return BaseUserModel(
+        id=str(user['id']),
+        stripeId=user.get('stripeId'),
+        name=user['name'],
+        lastName=user['lastName'],
+        email=user['email'],
+        phone=user.get('phone'),
+        role=user['role'],
+        preferences=preferences
+    )
+
+
+def _password_update(hashed_password: str) -> dict:
+    return {'$set': {'password': hashed_password}}
 
 
 def get_user_by_email(email: str) -> Optional[UserModel]:
     try:
-        user_schema = collection.find_one({'email.value': email})
+        return _to_user_model(collection.find_one(_email_query(email)))
+    except Exception as e:
+        raise e
 
-        if not user_schema:
-            return None
 
-        return UserModel(**snake_to_camel_case(user_schema))
+async def get_user_by_email_async(email: str) -> Optional[UserModel]:
+    try:
+        return _to_user_model(await async_collection.find_one(_email_query(email)))
+    except Exception as e:
+        raise e
+
+
+def get_user_principal_by_email(email: str,
+                                preferences: Optional[UserPreferencesModel] = None) -> Optional[BaseUserModel]:
+    try:
+        return _to_principal(collection.find_one(_email_query(email), projection=principal_projection), preferences)
+    except Exception as e:
+        raise e
+
+
+async def get_user_principal_by_email_async(email: str, preferences: Optional[UserPreferencesModel] = None) -> \
+        Optional[BaseUserModel]:
+    try:
+        return _to_principal(await async_collection.find_one(_email_query(email), projection=principal_projection),
+                             preferences)
+    except Exception as e:
+        raise e
+
+
+def update_user_password(email: str, hashed_password: str) -> bool:
+    try:
+        return collection.update_one(_email_query(email), _password_update(hashed_password)).modified_count > 0
+    except Exception as e:
+        raise e
+
+
+async def update_user_password_async(email: str, hashed_password: str) -> bool:
+    try:
+        result = await async_collection.update_one(_email_query(email), _password_update(hashed_password))
+
+        return result.modified_count > 0
     except Exception as e:
         raise e
 
@@ -31,6 +104,22 @@ def insert_user(new_user: UserCollectionSchema) -> Optional[str]:
         if not inserted_user_id:
             return None
 
+        evict_principal(new_user['email']['value'])
+
+        return str(inserted_user_id)
+    except Exception as e:
+        raise e
+
+
+async def insert_user_async(new_user: UserCollectionSchema) -> Optional[str]:
+    try:
+        inserted_user_id = (await async_collection.insert_one(new_user)).inserted_id
+
+        if not inserted_user_id:
+            return None
+
+        evict_principal(new_user['email']['value'])
+
         return str(inserted_user_id)
     except Exception as e:
         raise e
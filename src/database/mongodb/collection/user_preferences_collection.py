@@ -3,23 +3,48 @@ from typing import Optional, Mapping, Any
 from pymongo.collection import Collection
 from pymongo.database import Database
 
-from dependencies.mongodb import MongoDBClient
+from dependencies.auth_cache import evict_principal_by_id
+from dependencies.mongodb import MongoDBClient, AsyncMongoDBClient
 from src.database.mongodb.schema.user_preferences_schema import UserPreferencesCollectionSchema
-from src.database.mongodb.schema.user_schema import UserCollectionSchema
-from src.models.user import UserModel, UserPreferencesModel
+from src.models.user import UserPreferencesModel
 from src.utils.utils import snake_to_camel_case
 
 mongo_client: Database[Mapping[str, Any] | Any] = MongoDBClient()()
 collection: Collection[UserPreferencesCollectionSchema] = mongo_client.preferences
+async_collection = AsyncMongoDBClient()().preferences
+
+
+def _to_model(user_preferences_schema: Optional[dict]) -> Optional[UserPreferencesModel]:
+    if not user_preferences_schema:
+        return None
+
+    return UserPreferencesModel(**snake_to_camel_case(user_preferences_schema)['preferences'])
 
 
 def get_user_preferences_by_id(user_id: str) -> Optional[UserPreferencesModel]:
     try:
-        user_preferences_schema = collection.find_one({'user_id': user_id})
+        return _to_model(collection.find_one({'user_id': user_id}))
+    except Exception as e:
+        raise e
+
+
+async def get_user_preferences_by_id_async(user_id: str) -> Optional[UserPreferencesModel]:
+    try:
+        return _to_model(await async_collection.find_one({'user_id': user_id}))
+    except Exception as e:
+        raise e
+
+
+def upsert_user_preferences(user_id: str, preferences: UserPreferencesModel) -> bool:
+    try:
+        collection.update_one(
+            {'user_id': user_id},
+            {'$set': {'preferences': preferences.to_schema()}},
+            upsert=True
+        )
 
-        if not user_preferences_schema:
-            return None
+        evict_principal_by_id(user_id)
 
-        return UserPreferencesModel(**snake_to_camel_case(user_preferences_schema)['preferences'])
+        return True
     except Exception as e:
         raise e
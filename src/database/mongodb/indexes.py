@@ -0,0 +1,18 @@
+from src.database.mongodb.collection import cache_invalidation_collection, api_key_collection, \
+    session_token_collection, revoked_token_collection, geo_cache_collection, \
+    tax_calculation_collection, reservation_collection, idempotency_key_collection, \
+    order_job_collection, order_event_collection, cart_collection
+
+
+def create_indexes():
+    cache_invalidation_collection.create_indexes()
+    api_key_collection.create_indexes()
+    session_token_collection.create_indexes()
+    revoked_token_collection.create_indexes()
+    geo_cache_collection.create_indexes()
+    tax_calculation_collection.create_indexes()
+    reservation_collection.create_indexes()
+    idempotency_key_collection.create_indexes()
+    order_job_collection.create_indexes()
+    order_event_collection.create_indexes()
+    cart_collection.create_indexes()
@@ -0,0 +1,12 @@
+from datetime import datetime
+from typing import TypedDict, NotRequired, List
+
+from bson import ObjectId
+
+
+class ApiKeyCollectionSchema(TypedDict):
+    _id: NotRequired[ObjectId]
+    name: str
+    hash: str
+    creation_date: datetime
+    scopes: NotRequired[List[str]]
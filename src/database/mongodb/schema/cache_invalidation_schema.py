@@ -0,0 +1,12 @@
+from datetime import datetime
+from typing import TypedDict, NotRequired
+
+from bson import ObjectId
+
+
+class CacheInvalidationCollectionSchema(TypedDict):
+    _id: NotRequired[ObjectId]
+    kind: str
+    key: str
+    origin: str
+    created_at: datetime
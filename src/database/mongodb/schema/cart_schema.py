@@ -0,0 +1,18 @@
+from typing import TypedDict, NotRequired, List, Optional
+
+from bson import ObjectId
+
+
+class CartLineSchema(TypedDict):
+    key: str
+    product_id: ObjectId
+    variant_keys: List[str]
+    amount: int
+    unit_price: NotRequired[Optional[float]]
+    currency: NotRequired[Optional[str]]
+
+
+class CartCollectionSchema(TypedDict):
+    _id: NotRequired[ObjectId]
+    user_id: str
+    cart: List[CartLineSchema]
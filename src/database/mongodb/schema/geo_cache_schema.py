@@ -0,0 +1,10 @@
+from datetime import datetime
+from typing import TypedDict
+
+
+class GeoCacheCollectionSchema(TypedDict):
+    _id: str
+    payload: bytes
+    fetched_at: datetime
+    fresh_until: datetime
+    expires_at: datetime
@@ -0,0 +1,14 @@
+from datetime import datetime
+from typing import TypedDict, NotRequired, Optional, Any
+
+
+class IdempotencyKeyCollectionSchema(TypedDict):
+    _id: str
+    state: str
+    fingerprint: str
+    status_code: NotRequired[int]
+    response: NotRequired[Any]
+    error_id: NotRequired[Optional[int]]
+    description: NotRequired[Optional[str]]
+    created_at: datetime
+    expires_at: datetime
@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import TypedDict, NotRequired, Any, Dict
+
+from bson import ObjectId
+
+
+class OrderEventCollectionSchema(TypedDict):
+    _id: NotRequired[ObjectId]
+    order_id: str
+    user_id: str
+    type: str
+    status: str
+    data: Dict[str, Any]
+    origin: str
+    created_at: datetime
@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import TypedDict, NotRequired, Optional, List, Any, Dict
+
+from bson import ObjectId
+
+
+class OrderJobErrorSchema(TypedDict):
+    status_code: int
+    error_id: int
+    description: str
+
+
+class OrderJobCheckoutSchema(TypedDict):
+    stage: str
+    payment_intent_id: str
+    orders: List[Dict[str, Any]]
+    stock_update: Dict[str, Any]
+
+
+class OrderJobCollectionSchema(TypedDict):
+    _id: NotRequired[ObjectId]
+    user_id: str
+    user: Dict[str, Any]
+    request: Dict[str, Any]
+    payment_intent_id: str
+    status: str
+    attempts: int
+    available_at: datetime
+    lease_owner: Optional[str]
+    lease_expires_at: Optional[datetime]
+    order_ids: List[str]
+    checkout: Optional[OrderJobCheckoutSchema]
+    error: Optional[OrderJobErrorSchema]
+    created_at: datetime
+    updated_at: datetime
+    expires_at: NotRequired[datetime]
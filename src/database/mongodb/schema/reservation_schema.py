@@ -0,0 +1,12 @@
+from datetime import datetime
+from typing import TypedDict, NotRequired
+
+from bson import ObjectId
+
+
+class ReservationCollectionSchema(TypedDict):
+    _id: NotRequired[ObjectId]
+    product_id: ObjectId
+    user_id: str
+    quantity: int
+    expires_at: datetime
@@ -0,0 +1,7 @@
+from datetime import datetime
+from typing import TypedDict
+
+
+class RevokedTokenCollectionSchema(TypedDict):
+    _id: str
+    expires_at: datetime
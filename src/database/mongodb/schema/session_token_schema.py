@@ -4,15 +4,12 @@ from typing import TypedDict, NotRequired
 from bson import ObjectId
 
 
-class TokenSchema(TypedDict):
-    access_token: str
-    token_type: str
-    expires_in: datetime
-    refresh_token: str
-
-
 class SessionTokenCollectionSchema(TypedDict):
     _id: NotRequired[ObjectId]
     username: str
     session_date: datetime
-    data: TokenSchema
+    access_token_digest: str
+    refresh_token_digest: str
+    access_token_jti: NotRequired[str]
+    access_expires_at: NotRequired[datetime]
+    expires_at: datetime
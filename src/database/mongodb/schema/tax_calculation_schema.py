@@ -0,0 +1,11 @@
+from datetime import datetime
+from typing import TypedDict, Optional
+
+
+class TaxCalculationCollectionSchema(TypedDict):
+    _id: str
+    calculation_id: Optional[str]
+    amount_total: int
+    tax_amount_inclusive: int
+    tax_amount_exclusive: int
+    expires_at: datetime
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -12,6 +14,56 @@ class EnvVariables(BaseSettings):
     countries_api_url: str
     countries_api_key: str
     currency_convertion_api_url: str
+    auth_token_cache_size: int = 10000
+    auth_token_cache_ttl_seconds: int = 300
+    auth_principal_cache_size: int = 10000
+    auth_principal_cache_ttl_seconds: int = 30
+    cache_invalidation_poll_seconds: int = 2
+    api_key_refresh_seconds: int = 300
+    auth_stateless_tokens: bool = False
+    auth_revocation_filter_capacity: int = 100000
+    auth_revocation_recent_size: int = 10000
+    auth_revocation_rebuild_seconds: int = 3600
+    password_hash_rounds: int = 535000
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 32
+    mongodb_max_pool_size: int = 100
+    mongodb_min_pool_size: int = 0
+    mongodb_max_idle_time_ms: int = 300000
+    mongodb_wait_queue_timeout_ms: int = 5000
+    http_connect_timeout_seconds: float = 3.05
+    http_read_timeout_seconds: float = 10
+    http_pool_max_connections: int = 20
+    geo_cache_fresh_seconds: int = 604800
+    geo_cache_expire_seconds: int = 7776000
+    geo_cache_empty_seconds: int = 300
+    geo_cache_local_size: int = 1024
+    geo_cache_local_ttl_seconds: int = 300
+    geo_catalog_path: str = 'data/geo_catalog.bin'
+    category_catalog_poll_seconds: int = 60
+    stripe_tax_max_concurrency: int = 8
+    stripe_tax_pool_size: int = 64
+    stripe_tax_deadline_seconds: float = 10
+    tax_cache_size: int = 10000
+    tax_cache_ttl_seconds: int = 900
+    stripe_webhook_secret: Optional[str] = None
+    payment_methods_cache_size: int = 10000
+    payment_methods_cache_ttl_seconds: int = 86400
+    reservation_ttl_seconds: int = 900
+    reservation_release_seconds: int = 60
+    idempotency_key_ttl_seconds: int = 86400
+    idempotency_lock_seconds: int = 120
+    idempotency_wait_seconds: float = 10
+    order_queue_max_pending: int = 1000
+    order_job_lease_seconds: int = 120
+    order_job_max_attempts: int = 5
+    order_job_retry_backoff_seconds: float = 5
+    order_job_retention_seconds: int = 604800
+    order_worker_concurrency: int = 4
+    order_worker_poll_seconds: float = 1
+    order_events_poll_seconds: float = 1
+    order_events_heartbeat_seconds: float = 15
+    order_events_retention_seconds: int = 86400
 
     model_config = SettingsConfigDict(env_file=".env", extra="allow")
 
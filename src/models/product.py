@@ -102,9 +102,9 @@ class ProductModel(CommonModel):
         )
     )
 
-    @staticmethod
-    def to_model(product: dict):
-        return ProductModel(
+    @classmethod
+    def to_model(cls, product: dict):
+        return cls(
             id=str(product.get('_id') or product.get('id')),
             storeId=str(product['store_id']),
             name=product['name'],
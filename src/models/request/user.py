@@ -4,7 +4,7 @@ from typing import List, Optional, Union
 
 from pydantic import Field, field_validator, BaseModel
 
-from src.models.product import ProductModel, AttributeType
+from src.models.product import AttributeType
 from src.shared.generics import CommonModel
 from src.utils.constants import PaymentMethodType
 from src.utils.regex import email_regex
@@ -113,8 +113,13 @@ class CartInfoModel(CommonModel):
 
 
 class CartModelRequest(CommonModel):
-    product: ProductModel
-    cartInfo: CartInfoModel
+    productId: str = Field(min_length=24, max_length=24)
+    variantKeys: Optional[List[str]] = None
+    amount: int = Field(ge=1)
+
+
+class CartLineAmountRequest(CommonModel):
+    amount: int = Field(ge=1)
 
 
 class CartRequest(CommonModel):
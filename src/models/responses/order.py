@@ -0,0 +1,13 @@
+from datetime import datetime
+from typing import Any, Dict
+
+from src.shared.generics import CommonModel
+
+
+class OrderEventResponse(CommonModel):
+    id: str
+    orderId: str
+    type: str
+    status: str
+    data: Dict[str, Any]
+    createdAt: datetime
@@ -1,9 +1,9 @@
 from datetime import datetime
-from typing import Union
+from typing import Union, List, Optional
 
 from pydantic import Field
 
-from src.shared.generics import CommonModel
+from src.shared.generics import CommonModel, ErrorResponse
 from src.utils.constants import PaymentIntentStatus
 
 
@@ -41,3 +41,13 @@ class PlaceOrderRequest(CommonModel):
     contactInfo: OrderContactInfoModel
     shippingAddress: str = Field(min_length=1)
     paymentMethod: str = Field(min_length=1)
+
+
+class OrderJobResponse(CommonModel):
+    jobId: str
+    status: str
+    attempts: int
+    orderIds: List[str]
+    error: Optional[ErrorResponse] = None
+    createdAt: datetime
+    updatedAt: datetime
@@ -8,3 +8,9 @@ class TokenResponse(CommonModel):
     tokenType: str
     expiresIn: datetime
     refreshToken: str
+
+
+class SessionResponse(CommonModel):
+    id: str
+    sessionDate: datetime
+    expiresAt: datetime
@@ -1,6 +1,8 @@
-from typing import Optional
+from typing import Optional, List
 
 from src.models.common import MediaModel
+from pydantic import Field
+
 from src.models.product import ProductModel
 from src.models.request.user import CartInfoModel
 from src.shared.generics import CommonModel
@@ -13,9 +15,26 @@ class UserResponse(CommonModel):
     profilePhoto: Optional[MediaModel] = None
 
 
+class CartProductModel(ProductModel):
+    stock: int = Field(ge=0)
+
+
 class CartResponse(CommonModel):
-    product: ProductModel
+    key: Optional[str] = None
+    product: CartProductModel
     cartInfo: CartInfoModel
+    outOfStock: bool = False
+    priceChanged: bool = False
+    previousUnitPrice: Optional[float] = None
+
+
+class CartLineResponse(CommonModel):
+    key: str
+    productId: str
+    variantKeys: List[str]
+    amount: int
+    unitPrice: Optional[float] = None
+    currency: Optional[str] = None
 
 
 class AddressResponse(CommonModel):
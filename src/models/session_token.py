@@ -1,18 +1,16 @@
 from datetime import datetime
+from typing import Optional
 
 from src.shared.generics import CommonModel
 from src.utils.utils import ObjectIdTypeConverter
 
 
-class SessionTokenDataModel(CommonModel):
-    accessToken: str
-    tokenType: str
-    expiresIn: datetime
-    refreshToken: str
-
-
 class SessionTokenModel(CommonModel):
     id: ObjectIdTypeConverter
     username: str
     sessionDate: datetime
-    data: SessionTokenDataModel
+    accessTokenDigest: str
+    refreshTokenDigest: str
+    accessTokenJti: Optional[str] = None
+    accessExpiresAt: Optional[datetime] = None
+    expiresAt: datetime
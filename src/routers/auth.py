@@ -1,27 +1,31 @@
+import uuid
 from datetime import timedelta, timezone, datetime
-from typing import Annotated
+from typing import Annotated, List
 
 import stripe
 from fastapi import APIRouter, Depends, Form, Query
 from fastapi import status
+from fastapi.concurrency import run_in_threadpool
 from jose import jwt, ExpiredSignatureError, JWTError
-from passlib.context import CryptContext
 
 from dependencies.auth import get_current_user, validate_api_key
-from src.database.mongodb.collection.session_token_collection import insert_session_token, \
-    get_session_token, update_session_token_with_id, remove_session_token, remove_many_sessions_token
-from src.database.mongodb.collection.user_collection import get_user_by_email, insert_user
+from src.database.mongodb.collection.session_token_collection import insert_session_token_async, \
+    get_session_token_async, update_session_token_with_id_async, remove_session_token_async, \
+    remove_many_sessions_token_async, get_session_tokens_by_username_async
+from src.database.mongodb.collection.user_collection import get_user_by_email_async, insert_user_async, \
+    update_user_password_async
 from src.database.mongodb.schema.session_token_schema import SessionTokenCollectionSchema
 from src.env_variables.env import env_variables
 from src.models.request.user import UserRequest
-from src.models.responses.token import TokenResponse
+from src.models.responses.token import TokenResponse, SessionResponse
 from src.models.user import BaseUserModel
 from src.shared.exceptions import HttpException, AuthException
 from src.shared.generics import ErrorResponse, Error, Data, MessageResponse
 from src.utils.constants import ErrorsIDs, ErrorsDescriptions, Params, ResponseDescriptions, ErrorsDescriptionsObject
+from src.utils.passwords import hash_password_async, verify_password_async
+from src.utils.utils import token_digest
 
 auth_router = APIRouter(tags=['Auth'])
-pwd_context = CryptContext(schemes=["sha256_crypt"], deprecated="auto")
 stripe.api_key = env_variables.stripe_secret_key
 
 
@@ -29,26 +33,27 @@ stripe.api_key = env_variables.stripe_secret_key
     status.HTTP_201_CREATED: {"model": Data[MessageResponse], 'description': 'User Created'},
     status.HTTP_400_BAD_REQUEST: {"model": Error[ErrorResponse], 'description': 'Bad Request Error'}
 }, status_code=status.HTTP_201_CREATED)
-def create_new_user(
+async def create_new_user(
         new_user: UserRequest,
         _: str = Depends(validate_api_key)
 ):
     try:
-        user_exists = get_user_by_email(email=new_user.email.value) is not None
+        user_exists = await get_user_by_email_async(email=new_user.email.value) is not None
 
         if user_exists:
             raise HttpException(status_code=status.HTTP_400_BAD_REQUEST, error_id=ErrorsIDs.EMAIL_USER_EXISTS,
                                 description=ErrorsDescriptions.EMAIL_USER_EXISTS.value.format(new_user.email.value))
 
-        new_stripe_user = stripe.Customer.create(
+        new_stripe_user = await run_in_threadpool(
+            stripe.Customer.create,
             email=new_user.email.value,
             name=f"{new_user.name} {new_user.lastName}"
         )
 
-        new_user.password = pwd_context.hash(new_user.password)
+        new_user.password = await hash_password_async(new_user.password)
         new_user.stripeId = new_stripe_user.id
 
-        insert_user(new_user.to_schema())
+        await insert_user_async(new_user.to_schema())
 
         return Data[MessageResponse](data=MessageResponse(message=ResponseDescriptions.USER_CREATED_SUCCESS))
 
@@ -64,13 +69,13 @@ def create_new_user(
     status.HTTP_400_BAD_REQUEST: {"model": Error[ErrorResponse], 'description': 'Bad Request Error'}
 
 }, status_code=status.HTTP_200_OK)
-def sign_in(
+async def sign_in(
         _: str = Depends(validate_api_key),
         username: str = Form(alias='username'),
         password: str = Form(alias='password')
 ):
     try:
-        user = get_user_by_email(username)
+        user = await get_user_by_email_async(username)
 
         if not user:
             raise HttpException(
@@ -79,7 +84,7 @@ def sign_in(
                 description=ErrorsDescriptions.EMAIL_OR_PASSWORD_INVALID
             )
 
-        is_password_valid = pwd_context.verify(password, user.password)
+        is_password_valid, upgraded_password = await verify_password_async(password, user.password)
 
         if not is_password_valid:
             raise HttpException(
@@ -88,13 +93,19 @@ def sign_in(
                 description=ErrorsDescriptions.EMAIL_OR_PASSWORD_INVALID
             )
 
+        if upgraded_password:
+            await update_user_password_async(email=user.email.value, hashed_password=upgraded_password)
+
         access_token_expires = datetime.now(timezone.utc) + timedelta(minutes=Params.ACCESS_TOKEN_EXPIRE_MINUTES)
         refresh_token_expires = datetime.now(timezone.utc) + timedelta(minutes=Params.REFRESH_TOKEN_EXPIRE_MINUTES)
 
+        access_token_jti = uuid.uuid4().hex
+
         encoded_jwt = jwt.encode(
             claims=dict(
                 exp=access_token_expires,
-                sub=user.email.value
+                sub=user.email.value,
+                jti=access_token_jti
             ),
             key=env_variables.auth_secret_key,
             algorithm=env_variables.auth_algorithm
@@ -103,7 +114,8 @@ def sign_in(
         refresh_token = jwt.encode(
             claims=dict(
                 exp=refresh_token_expires,
-                sub=user.email.value
+                sub=user.email.value,
+                jti=uuid.uuid4().hex
             ),
             key=env_variables.auth_secret_key,
             algorithm=env_variables.auth_algorithm
@@ -116,10 +128,14 @@ def sign_in(
             refreshToken=refresh_token
         )
 
-        insert_session_token(session_token=SessionTokenCollectionSchema(
+        await insert_session_token_async(session_token=SessionTokenCollectionSchema(
             username=user.email.value,
             session_date=datetime.now(),
-            data=token.to_schema()
+            access_token_digest=token_digest(encoded_jwt),
+            refresh_token_digest=token_digest(refresh_token),
+            access_token_jti=access_token_jti,
+            access_expires_at=access_token_expires,
+            expires_at=refresh_token_expires
         ))
 
         return Data[TokenResponse](data=token)
@@ -134,7 +150,7 @@ def sign_in(
 @auth_router.get('/current-user', responses={
     status.HTTP_200_OK: {"model": Data[BaseUserModel], 'description': 'User Authenticated'},
 }, status_code=status.HTTP_200_OK)
-def get_auth_current_user(current_user: Annotated[BaseUserModel, Depends(get_current_user)]):
+async def get_auth_current_user(current_user: Annotated[BaseUserModel, Depends(get_current_user)]):
     return Data[BaseUserModel](
         data=current_user.to_json()
     )
@@ -144,11 +160,11 @@ def get_auth_current_user(current_user: Annotated[BaseUserModel, Depends(get_cur
     status.HTTP_200_OK: {"model": Data[TokenResponse], 'description': 'Refreshed Token'},
     status.HTTP_400_BAD_REQUEST: {"model": Error[ErrorResponse], 'description': 'Bad Request Error'}
 }, status_code=status.HTTP_200_OK)
-def refresh_access_token(
+async def refresh_access_token(
         refresh_token: str = Query(alias="refreshToken"), _: str = Depends(validate_api_key)
 ):
     try:
-        token = get_session_token(refresh_token=refresh_token)
+        token = await get_session_token_async(refresh_token=refresh_token)
 
         if not token:
             raise AuthException(
@@ -158,18 +174,18 @@ def refresh_access_token(
 
         try:
             jwt.decode(
-                token=token.data.refreshToken,
+                token=refresh_token,
                 key=env_variables.auth_secret_key,
                 algorithms=[env_variables.auth_algorithm]
             )
         except ExpiredSignatureError as err:
-            remove_session_token(refresh_token=token.data.refreshToken)
+            await remove_session_token_async(refresh_token=refresh_token)
             raise AuthException(error_id=ErrorsIDs.REFRESH_TOKEN_EXPIRED,
                                 description=ErrorsDescriptionsObject[ErrorsIDs.REFRESH_TOKEN_EXPIRED]
                                 )
 
         except JWTError as err:
-            remove_session_token(refresh_token=token.data.refreshToken)
+            await remove_session_token_async(refresh_token=refresh_token)
             raise AuthException(
                 error_id=ErrorsIDs.REFRESH_TOKEN_COULD_NOT_BE_VALIDATED,
                 description=ErrorsDescriptionsObject[ErrorsIDs.REFRESH_TOKEN_COULD_NOT_BE_VALIDATED]
@@ -178,19 +194,23 @@ def refresh_access_token(
         access_token_expires = datetime.now(timezone.utc) + timedelta(minutes=Params.ACCESS_TOKEN_EXPIRE_MINUTES)
         refresh_token_expires = datetime.now(timezone.utc) + timedelta(minutes=Params.REFRESH_TOKEN_EXPIRE_MINUTES)
 
+        access_token_jti = uuid.uuid4().hex
+
         encoded_jwt = jwt.encode(
             claims=dict(
                 exp=access_token_expires,
-                sub=token.username
+                sub=token.username,
+                jti=access_token_jti
             ),
             key=env_variables.auth_secret_key,
             algorithm=env_variables.auth_algorithm
         )
 
-        refresh_token = jwt.encode(
+        new_refresh_token = jwt.encode(
             claims=dict(
                 exp=refresh_token_expires,
-                sub=token.username
+                sub=token.username,
+                jti=uuid.uuid4().hex
             ),
             key=env_variables.auth_secret_key,
             algorithm=env_variables.auth_algorithm
@@ -200,15 +220,19 @@ def refresh_access_token(
             accessToken=encoded_jwt,
             tokenType='bearer',
             expiresIn=access_token_expires,
-            refreshToken=refresh_token
+            refreshToken=new_refresh_token
         )
 
-        update_session_token_with_id(
+        await update_session_token_with_id_async(
             token_id=token.id,
             session_token=SessionTokenCollectionSchema(
                 username=token.username,
                 session_date=datetime.now(),
-                data=new_token.to_schema()
+                access_token_digest=token_digest(encoded_jwt),
+                refresh_token_digest=token_digest(new_refresh_token),
+                access_token_jti=access_token_jti,
+                access_expires_at=access_token_expires,
+                expires_at=refresh_token_expires
             ))
 
         return Data[TokenResponse](
@@ -222,17 +246,39 @@ def refresh_access_token(
         raise ex
 
 
+@auth_router.get('/sessions', responses={
+    status.HTTP_200_OK: {"model": Data[List[SessionResponse]], 'description': 'Sessions Found'},
+}, status_code=status.HTTP_200_OK)
+async def get_auth_sessions(current_user: Annotated[BaseUserModel, Depends(get_current_user)]):
+    try:
+        sessions = [SessionResponse(
+            id=session.id,
+            sessionDate=session.sessionDate,
+            expiresAt=session.expiresAt
+        ) for session in await get_session_tokens_by_username_async(current_user.email.value)]
+
+        return Data[List[SessionResponse]](
+            data=sessions
+        )
+
+    except HttpException as ex:
+        raise ex
+
+    except Exception as ex:
+        raise ex
+
+
 @auth_router.post('/sign-out', responses={
     status.HTTP_200_OK: {"model": Data[MessageResponse], 'description': 'Sign Out Successfully'},
 }, status_code=status.HTTP_200_OK)
-def sign_out(
+async def sign_out(
         current_user: Annotated[BaseUserModel, Depends(get_current_user)]
 ):
     try:
-        token = get_session_token(username=current_user.email.value)
+        token = await get_session_token_async(username=current_user.email.value)
 
         if token:
-            remove_many_sessions_token(username=current_user.email.value)
+            await remove_many_sessions_token_async(username=current_user.email.value)
 
         return Data[MessageResponse](
             data=MessageResponse(message=ResponseDescriptions.USER_SIGNED_OUT_SUCCESS)
@@ -1,22 +1,85 @@
-from typing import List, Mapping, Any
+import json
+from typing import List, Mapping, Any, Optional, Iterable
 
-import requests
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Response, Query, Header
 from fastapi import status
+from requests import Response as UpstreamResponse
 from pymongo.database import Database
 
 from dependencies.auth import validate_api_key
+from dependencies.category_catalog import category_catalog
+from dependencies.geo_cache import geo_cache, GeoPayload
+from dependencies.http_client import http_client, COUNTRIES_UPSTREAM
 from dependencies.mongodb import MongoDBClient
-from src.database.mongodb.collection.catalog_collection import get_categories
 from src.env_variables.env import env_variables
 from src.models.responses.catalogs import CountriesResponse, StatesResponse, CitiesResponse, CategoriesResponse
 from src.shared.exceptions import HttpException
 from src.shared.generics import Data, ErrorResponse
-from src.utils.constants import ErrorsIDs, ErrorsDescriptionsObject
+from src.utils.constants import ErrorsIDs, ErrorsDescriptionsObject, Params
+from src.utils.geo_catalog import open_geo_catalog, normalize_city_name, GeoCity
 
 catalogs_router = APIRouter(tags=['Catalogs'])
-countries_api_url = env_variables.countries_api_url
-countries_api_key = env_variables.countries_api_key
+
+COUNTRY_CODE_PATTERN = r'^[A-Za-z]{2}$'
+STATE_CODE_PATTERN = r'^[A-Za-z0-9]{1,3}$'
+geo_catalog = open_geo_catalog(env_variables.geo_catalog_path)
+
+
+def _raise_for_upstream_status(response: UpstreamResponse, record: str):
+    if response.status_code == status.HTTP_404_NOT_FOUND:
+        raise HttpException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            error_id=ErrorsIDs.NO_RECORDS_FOUND,
+            description=ErrorsDescriptionsObject[ErrorsIDs.NO_RECORDS_FOUND].format(record)
+        )
+
+    response.raise_for_status()
+
+
+def _render_countries() -> GeoPayload:
+    countries = http_client.get(COUNTRIES_UPSTREAM, '/countries')
+    _raise_for_upstream_status(countries, 'countries')
+
+    countries = [CountriesResponse(
+        id=str(country['id']),
+        name=country['name'],
+        countryCode=country['iso2'],
+        phoneCode=str(country['phonecode']).split(' and '),
+        currency=country['currency'],
+        emoji=country['emoji']
+    ) for country in countries.json()]
+
+    return GeoPayload(Data[List[CountriesResponse]](data=countries).model_dump_json().encode(), empty=not countries)
+
+
+def _render_country_states(country_code: str) -> GeoPayload:
+    states = http_client.get(COUNTRIES_UPSTREAM, f'/countries/{country_code}/states')
+    _raise_for_upstream_status(states, 'states')
+
+    states = [StatesResponse(
+        id=str(state['id']),
+        name=state['name'],
+        stateCode=state['iso2'],
+    ) for state in states.json()]
+
+    return GeoPayload(Data[List[StatesResponse]](data=states).model_dump_json().encode(), empty=not states)
+
+
+def _render_country_state_cities(country_code: str, state_code: str) -> GeoPayload:
+    cities = http_client.get(COUNTRIES_UPSTREAM, f'/countries/{country_code}/states/{state_code}/cities')
+    _raise_for_upstream_status(cities, 'cities')
+
+    cities = [CitiesResponse(
+        id=str(city['id']),
+        name=city['name']
+    ) for city in cities.json()]
+
+    return GeoPayload(Data[List[CitiesResponse]](data=cities).model_dump_json().encode(), empty=not cities)
+
+
+def _render_geo_cities(cities: Iterable[GeoCity]) -> bytes:
+    return json.dumps({'data': [{'id': str(city.id), 'name': city.name} for city in cities]},
+                      ensure_ascii=False, separators=(',', ':')).encode()
 
 
 @catalogs_router.get('/countries', responses={
@@ -26,22 +89,9 @@ def get_countries(
         _: str = Depends(validate_api_key),
 ):
     try:
-        countries = requests.get(f'{countries_api_url}/countries', headers={
-            "X-CSCAPI-KEY": countries_api_key
-        })
-
-        countries = [CountriesResponse(
-            id=str(country['id']),
-            name=country['name'],
-            countryCode=country['iso2'],
-            phoneCode=str(country['phonecode']).split(' and '),
-            currency=country['currency'],
-            emoji=country['emoji']
-        ) for country in countries.json()]
-
-        return Data[List[CountriesResponse]](
-            data=countries
-        )
+        countries = geo_cache.get('countries', _render_countries)
+
+        return Response(content=countries, media_type='application/json')
 
     except HttpException as ex:
         raise ex
@@ -55,22 +105,13 @@ def get_countries(
 }, status_code=status.HTTP_200_OK)
 def get_country_states(
         _: str = Depends(validate_api_key),
-        country_code: str = Path(alias='countryCode', min_length=1)
+        country_code: str = Path(alias='countryCode', pattern=COUNTRY_CODE_PATTERN)
 ):
     try:
-        states = requests.get(f'{countries_api_url}/countries/{country_code}/states', headers={
-            "X-CSCAPI-KEY": countries_api_key
-        })
-
-        states = [StatesResponse(
-            id=str(state['id']),
-            name=state['name'],
-            stateCode=state['iso2'],
-        ) for state in states.json()]
-
-        return Data[List[StatesResponse]](
-            data=states
-        )
+        country_code = country_code.upper()
+        states = geo_cache.get(f'states:{country_code}', lambda: _render_country_states(country_code))
+
+        return Response(content=states, media_type='application/json')
 
     except HttpException as ex:
         raise ex
@@ -84,22 +125,29 @@ def get_country_states(
 }, status_code=status.HTTP_200_OK)
 def get_country_state_cities(
         _: str = Depends(validate_api_key),
-        country_code: str = Path(alias='countryCode', min_length=1),
-        state_code: str = Path(alias='stateCode', min_length=1)
+        country_code: str = Path(alias='countryCode', pattern=COUNTRY_CODE_PATTERN),
+        state_code: str = Path(alias='stateCode', pattern=STATE_CODE_PATTERN),
+        prefix: Optional[str] = Query(default=None, min_length=1)
 ):
     try:
-        cities = requests.get(f'{countries_api_url}/countries/{country_code}/states/{state_code}/cities', headers={
-            "X-CSCAPI-KEY": countries_api_key
-        })
+        country_code, state_code = country_code.upper(), state_code.upper()
 
-        cities = [CitiesResponse(
-            id=str(city['id']),
-            name=city['name']
-        ) for city in cities.json()]
+        if geo_catalog and geo_catalog.has_state(country_code, state_code):
+            cities = geo_catalog.search_cities(country_code, state_code, prefix, Params.CITY_SEARCH_LIMIT) \
+                if prefix else geo_catalog.cities(country_code, state_code)
 
-        return Data[List[CitiesResponse]](
-            data=cities
-        )
+            return Response(content=_render_geo_cities(cities), media_type='application/json')
+
+        cities = geo_cache.get(f'cities:{country_code}:{state_code}',
+                               lambda: _render_country_state_cities(country_code, state_code))
+
+        if prefix:
+            prefix = normalize_city_name(prefix)
+            cities = [GeoCity(id=city['id'], name=city['name']) for city in json.loads(cities)['data']
+                      if normalize_city_name(city['name']).startswith(prefix)]
+            cities = _render_geo_cities(cities[:Params.CITY_SEARCH_LIMIT])
+
+        return Response(content=cities, media_type='application/json')
 
     except HttpException as ex:
         raise ex
@@ -113,21 +161,25 @@ def get_country_state_cities(
     status.HTTP_404_NOT_FOUND: {"model": Data[ErrorResponse], 'description': 'Categories not found'},
 }, status_code=status.HTTP_200_OK)
 def get_product_categories(
-        _: str = Depends(validate_api_key)
+        _: str = Depends(validate_api_key),
+        if_none_match: Optional[str] = Header(default=None, alias='If-None-Match')
 ):
     try:
-        categories = get_categories()
+        categories = category_catalog.current()
 
-        if not categories:
+        if categories.is_empty():
             raise HttpException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 error_id=ErrorsIDs.NO_RECORDS_FOUND,
                 description=ErrorsDescriptionsObject[ErrorsIDs.NO_RECORDS_FOUND].format('categories')
             )
 
-        categories = [CategoriesResponse(**category.to_json()) for category in categories]
+        headers = {'ETag': categories.etag, 'Cache-Control': 'no-cache'}
+
+        if if_none_match == categories.etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-        return Data[List[CategoriesResponse]](data=categories)
+        return Response(content=categories.payload, media_type='application/json', headers=headers)
 
     except HttpException as ex:
         raise ex
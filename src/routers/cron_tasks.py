@@ -1,19 +1,22 @@
 import logging
 from datetime import datetime
 
-import requests
 from fastapi import APIRouter
 from fastapi_utilities import repeat_every
-from pymongo import MongoClient
-from starlette import status
 
+from dependencies import invalidation
+from dependencies.api_key_registry import api_key_registry
+from dependencies.category_catalog import category_catalog
+from dependencies.mongodb import MongoDBClient
+from dependencies.order_events import order_event_broker
+from dependencies.revocation import revocation_filter
 from src.database.mongodb.collection.convertion_rates_collection import get_convertion_rates, update_convertion_rates
 from src.database.mongodb.schema.convertion_rates_schema import ConvertionRatesCollectionSchema
 from src.env_variables.env import env_variables
+from src.services.inventory import release_expired_reservations
+from src.utils.utils import fetch_convertion_rates
 
 cron_router = APIRouter(tags=['Auth'])
-mongo_client = MongoClient(host=env_variables.mongodb_connection_string)[env_variables.mongodb_database]
-currency_convertion_api_url = env_variables.currency_convertion_api_url
 
 
 @cron_router.on_event('startup')
@@ -32,21 +35,86 @@ def update_db_cached_currencies_convertion_rates():
             convertion_next_date = convertion_rate.nextUpdate
 
             if convertion_next_date <= now_date:
-                convertion = requests.get(
-                    url=f'{currency_convertion_api_url}/latest/{convertion_rate.baseCurrency}')
-
-                if convertion.status_code == status.HTTP_200_OK:
-                    convertion = convertion.json()
-
-                    convertion = ConvertionRatesCollectionSchema(
-                        base_currency=convertion_rate.baseCurrency,
-                        last_update=datetime.fromtimestamp(convertion['time_last_update_unix']),
-                        next_update=datetime.fromtimestamp(convertion['time_next_update_unix']),
-                        convertion_rates=convertion['conversion_rates']
-                    )
+                convertion = fetch_convertion_rates(convertion_rate.baseCurrency)
+
+                if convertion:
+                    convertion = ConvertionRatesCollectionSchema(**convertion)
                     update_convertion_rates(base_currency=convertion_rate.baseCurrency,
                                             convertion_rate_schema=convertion)
 
     except Exception as ex:
         logging.error(f'Executing task to update db cache currencies convertion rates throw exception -> {ex}')
         raise ex
+
+
+@cron_router.on_event('startup')
+@repeat_every(seconds=env_variables.cache_invalidation_poll_seconds)
+def apply_cache_invalidations():
+    try:
+        invalidation.poll()
+
+    except Exception as ex:
+        logging.error(f'Executing task to apply cache invalidations throw exception -> {ex}')
+        raise ex
+
+
+@cron_router.on_event('startup')
+@repeat_every(seconds=env_variables.api_key_refresh_seconds)
+def refresh_api_key_registry():
+    try:
+        api_key_registry.reload()
+        logging.info(f'Api key request counts -> {api_key_registry.request_counts()}')
+
+    except Exception as ex:
+        logging.error(f'Executing task to refresh api key registry throw exception -> {ex}')
+        raise ex
+
+
+@cron_router.on_event('startup')
+@repeat_every(seconds=env_variables.auth_revocation_rebuild_seconds)
+def rebuild_token_revocation_filter():
+    if not env_variables.auth_stateless_tokens:
+        return
+
+    try:
+        revocation_filter.rebuild()
+
+    except Exception as ex:
+        logging.error(f'Executing task to rebuild token revocation filter throw exception -> {ex}')
+        raise ex
+
+
+@cron_router.on_event('startup')
+@repeat_every(seconds=env_variables.category_catalog_poll_seconds)
+def refresh_category_catalog():
+    try:
+        category_catalog.reload()
+
+    except Exception as ex:
+        logging.error(f'Executing task to refresh category catalog throw exception -> {ex}')
+        raise ex
+
+
+@cron_router.on_event('startup')
+@repeat_every(seconds=env_variables.order_events_poll_seconds)
+def apply_order_events():
+    try:
+        order_event_broker.poll()
+
+    except Exception as ex:
+        logging.error(f'Executing task to apply order events throw exception -> {ex}')
+        raise ex
+
+
+@cron_router.on_event('startup')
+@repeat_every(seconds=env_variables.reservation_release_seconds)
+def release_expired_stock_reservations():
+    try:
+        released = release_expired_reservations(MongoDBClient()())
+
+        if released:
+            logging.info(f'Released {released} expired stock reservations')
+
+    except Exception as ex:
+        logging.error(f'Executing task to release expired stock reservations throw exception -> {ex}')
+        raise ex
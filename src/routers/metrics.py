@@ -0,0 +1,35 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
+from fastapi import status
+
+from dependencies.api_key_registry import api_key_registry
+from dependencies.auth import validate_api_key_scope
+from dependencies.http_client import http_client
+from dependencies.mongodb import pool_metrics
+from src.shared.exceptions import HttpException
+from src.shared.generics import Data, Error, ErrorResponse
+from src.utils.constants import ApiKeyScope
+
+metrics_router = APIRouter(tags=['Metrics'])
+
+
+@metrics_router.get('', responses={
+    status.HTTP_200_OK: {"model": Data[Dict[str, Any]], 'description': 'Process metrics'},
+    status.HTTP_403_FORBIDDEN: {"model": Error[ErrorResponse], 'description': 'Operations scope required'},
+}, status_code=status.HTTP_200_OK)
+def get_metrics(
+        _: str = Depends(validate_api_key_scope(ApiKeyScope.OPERATIONS))
+):
+    try:
+        return Data[Dict[str, Any]](data={
+            'mongodbPools': {name: metrics.snapshot() for name, metrics in pool_metrics.items()},
+            'httpUpstreams': http_client.snapshot(),
+            'apiKeyRequests': api_key_registry.request_counts()
+        })
+
+    except HttpException as ex:
+        raise ex
+
+    except Exception as ex:
+        raise ex
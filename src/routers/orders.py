@@ -0,0 +1,106 @@
+import asyncio
+import json
+from typing import Annotated, Any, AsyncIterator, Mapping, Optional, Set
+
+from bson import ObjectId
+from fastapi import APIRouter, Depends, Header, Path, Request
+from fastapi import status
+from fastapi.responses import StreamingResponse
+
+from dependencies.auth import get_current_user
+from dependencies.order_events import order_event_broker
+from src.database.mongodb.collection.order_event_collection import get_order_events_async
+from src.database.mongodb.collection.order_job_collection import get_order_job_async
+from src.env_variables.env import env_variables
+from src.models.responses.order import OrderEventResponse
+from src.models.user import BaseUserModel
+from src.shared.exceptions import HttpException
+from src.shared.generics import Error, ErrorResponse
+from src.utils.constants import ErrorsIDs, ErrorsDescriptionsObject, OrderEventType
+
+orders_router = APIRouter(tags=['Orders'])
+
+TERMINAL_EVENT_TYPES = {OrderEventType.SUCCEEDED.value, OrderEventType.FAILED.value}
+
+
+def _to_server_sent_event(order_event: Mapping[str, Any]) -> str:
+    order_event_response = OrderEventResponse(
+        id=str(order_event['_id']),
+        orderId=order_event['order_id'],
+        type=order_event['type'],
+        status=order_event['status'],
+        data=order_event['data'],
+        createdAt=order_event['created_at']
+    )
+
+    return (f'id: {order_event_response.id}\n'
+            f'event: {order_event_response.type}\n'
+            f'data: {json.dumps(order_event_response.to_json())}\n\n')
+
+
+async def _order_events_stream(request: Request, order_id: str, last_event_id: Optional[ObjectId]) \
+        -> AsyncIterator[str]:
+    queue = order_event_broker.subscribe(order_id)
+    sent: Set[ObjectId] = set()
+
+    try:
+        for order_event in await get_order_events_async(order_id, last_event_id):
+            sent.add(order_event['_id'])
+            yield _to_server_sent_event(order_event)
+
+            if order_event['type'] in TERMINAL_EVENT_TYPES:
+                return
+
+        while not await request.is_disconnected():
+            try:
+                order_event = await asyncio.wait_for(queue.get(), timeout=env_variables.order_events_heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ': keep-alive\n\n'
+                continue
+
+            if order_event['_id'] in sent:
+                continue
+
+            sent.add(order_event['_id'])
+            yield _to_server_sent_event(order_event)
+
+            if order_event['type'] in TERMINAL_EVENT_TYPES:
+                return
+
+    finally:
+        order_event_broker.unsubscribe(order_id, queue)
+
+
+@orders_router.get('/{orderId}/events', responses={
+    status.HTTP_200_OK: {'content': {'text/event-stream': {}}, 'description': 'Order status events stream'},
+    status.HTTP_404_NOT_FOUND: {"model": Error[ErrorResponse], 'description': 'Order not found'},
+}, status_code=status.HTTP_200_OK)
+async def get_order_events(
+        request: Request,
+        current_user: Annotated[BaseUserModel, Depends(get_current_user)],
+        order_id: str = Path(alias='orderId', min_length=24, max_length=24),
+        last_event_id: Optional[str] = Header(default=None, alias='Last-Event-ID')
+):
+    try:
+        order_job = await get_order_job_async(order_id, current_user.id) if ObjectId.is_valid(order_id) else None
+
+        if not order_job:
+            raise HttpException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                error_id=ErrorsIDs.NO_RECORDS_FOUND,
+                description=ErrorsDescriptionsObject[ErrorsIDs.NO_RECORDS_FOUND].format('Order')
+            )
+
+        return StreamingResponse(
+            _order_events_stream(request, order_id,
+                                 ObjectId(last_event_id) if last_event_id and ObjectId.is_valid(last_event_id)
+                                 else None),
+            media_type='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
+    except HttpException as ex:
+        raise ex
+
+    except Exception as ex:
+        raise ex
@@ -1,14 +1,14 @@
 import re
-from collections.abc import Mapping
-from typing import Annotated, Union, List, Any
+from typing import Annotated, Union, List
 
 from bson import ObjectId
 from fastapi import APIRouter, Depends, Query, Path
 from fastapi import status
-from pymongo.database import Database
+from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from dependencies.auth import get_current_user, validate_api_key, validate_api_key_or_auth
-from dependencies.mongodb import MongoDBClient
+from dependencies.category_catalog import category_catalog
+from dependencies.mongodb import AsyncMongoDBClient
 from src.models.product import ProductModel
 from src.models.request.review import ReviewRequest
 from src.models.responses.product import ProductResponse, ProductsResponse, \
@@ -19,8 +19,8 @@ from src.models.user import BaseUserModel
 from src.shared.exceptions import HttpException
 from src.shared.generics import ErrorResponse, Data, \
     Error, DataWithAdditional, PaginationData
-from src.utils.constants import ErrorsIDs, ErrorsDescriptions, Params
-from src.utils.utils import convert_currency
+from src.utils.constants import ErrorsIDs, ErrorsDescriptions, ErrorsDescriptionsObject, Params
+from src.utils.utils import convert_currency_async
 
 product_router = APIRouter()
 
@@ -29,14 +29,23 @@ product_router.tags = ['Product']
 
 @product_router.post('/create', responses={
     status.HTTP_201_CREATED: {"model": Data[ProductModel], 'description': 'Product Created'},
+    status.HTTP_400_BAD_REQUEST: {"model": Error[ErrorResponse], 'description': 'Category not valid'},
 }, status_code=status.HTTP_201_CREATED)
-def create_product(
+async def create_product(
         product: ProductModel,
         _: Annotated[BaseUserModel, Depends(get_current_user)],
-        mongo_client: Database[Mapping[str, Any]] = Depends(MongoDBClient())
+        mongo_client: AsyncIOMotorDatabase = Depends(AsyncMongoDBClient())
 ):
     try:
-        product_id = mongo_client.product.insert_one(product.to_schema()).inserted_id
+        if not category_catalog.is_valid(product.category, product.subcategory):
+            raise HttpException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                error_id=ErrorsIDs.CATEGORY_NOT_VALID,
+                description=ErrorsDescriptionsObject[ErrorsIDs.CATEGORY_NOT_VALID].format(product.category,
+                                                                                         product.subcategory)
+            )
+
+        product_id = (await mongo_client.product.insert_one(product.to_schema())).inserted_id
 
         product.id = str(product_id)
 
@@ -56,7 +65,7 @@ def create_product(
                          'description': 'Products Found'},
     status.HTTP_404_NOT_FOUND: {"model": Error[ErrorResponse], 'description': 'Products Not Found'},
 }, status_code=status.HTTP_200_OK)
-def get_products(
+async def get_products(
         current_user: Annotated[Union[BaseUserModel, str], Depends(validate_api_key_or_auth)],
         search: Union[str, None] = None,
         price_min: Union[int, None] = Query(default=None, alias='priceMin'),
@@ -66,7 +75,7 @@ def get_products(
         subcategory: Union[str, None] = None,
         sort: Union[str, None] = None,
         index: int = Query(default=1, gt=0),
-        mongo_client: Database[Mapping[str, Any]] = Depends(MongoDBClient())
+        mongo_client: AsyncIOMotorDatabase = Depends(AsyncMongoDBClient())
 ):
     try:
         queries = []
@@ -133,16 +142,16 @@ def get_products(
 
             products_db = mongo_client.product.find(query).skip(offset).limit(Params.RECORDS_LIMIT).sort(
                 sort_conditions)
-            total_products = mongo_client.product.count_documents(query)
+            total_products = await mongo_client.product.count_documents(query)
         else:
             products_db = mongo_client.product.find(query).skip(offset).limit(Params.RECORDS_LIMIT)
-            total_products = mongo_client.product.count_documents(query)
+            total_products = await mongo_client.product.count_documents(query)
 
         products = [ProductResponse(
             id=str(product['_id']),
             storeId=str(product['store_id']),
             name=product['name'],
-            cost=convert_currency(base_currency=product['currency'],
+            cost=await convert_currency_async(base_currency=product['currency'],
                                   target_currency=current_user.preferences.currency if current_user else product[
                                       'currency'],
                                   amount=product['cost'],
@@ -157,7 +166,7 @@ def get_products(
             dates=product['dates'],
             details=product['details'],
             variants=product.get('variants')
-        ).to_json() for product in products_db]
+        ).to_json() async for product in products_db]
 
         if price_min and price_max:
             products = list(filter(lambda product: price_min <= product['cost'] <= price_max, products))
@@ -199,13 +208,13 @@ def get_products(
                          'description': 'Product Found'},
     status.HTTP_404_NOT_FOUND: {"model": Error[ErrorResponse], 'description': 'Product Not Found'},
 }, status_code=status.HTTP_200_OK)
-def get_product_by_id(
+async def get_product_by_id(
         current_user: Annotated[Union[BaseUserModel, str], Depends(validate_api_key_or_auth)],
         product_id: str = Path(alias='productId'),
-        mongo_client: Database[Mapping[str, Any]] = Depends(MongoDBClient())
+        mongo_client: AsyncIOMotorDatabase = Depends(AsyncMongoDBClient())
 ):
     try:
-        product = mongo_client.product.find_one({'_id': ObjectId(product_id)})
+        product = await mongo_client.product.find_one({'_id': ObjectId(product_id)})
 
         if not product:
             raise HttpException(
@@ -220,8 +229,8 @@ def get_product_by_id(
 
         product_reviews: List[ReviewResponse] = []
 
-        for review in product_reviews_db:
-            user_review: dict = mongo_client.user.find_one({'_id': ObjectId(review['user_id'])})
+        async for review in product_reviews_db:
+            user_review: dict = await mongo_client.user.find_one({'_id': ObjectId(review['user_id'])})
 
             product_review: ReviewResponse = ReviewResponse(
                 id=str(review['_id']),
@@ -240,13 +249,13 @@ def get_product_by_id(
 
             product_reviews.append(product_review.to_json())
 
-        total_reviews = mongo_client.review.count_documents({'product_id': product_id})
+        total_reviews = await mongo_client.review.count_documents({'product_id': product_id})
 
         response = ProductResponse(
             id=str(product['_id']),
             storeId=str(product['store_id']),
             name=product['name'],
-            cost=convert_currency(base_currency=product['currency'],
+            cost=await convert_currency_async(base_currency=product['currency'],
                                   target_currency=current_user.preferences.currency if current_user else product[
                                       'currency'],
                                   amount=product['cost'],
@@ -283,25 +292,25 @@ def get_product_by_id(
 @product_router.post('/{productId}/add-review', responses={
     status.HTTP_201_CREATED: {"model": Data[str], 'description': 'Review added'},
 }, status_code=status.HTTP_201_CREATED)
-def add_product_review(
+async def add_product_review(
         current_user: Annotated[BaseUserModel, Depends(get_current_user)],
         review: ReviewRequest,
         product_id: str = Path(alias='productId'),
-        mongo_client: Database[Mapping[str, Any]] = Depends(MongoDBClient())
+        mongo_client: AsyncIOMotorDatabase = Depends(AsyncMongoDBClient())
 ):
     try:
         review.userId = current_user.id
         review.productId = product_id
 
-        review_id = mongo_client.review.insert_one(review.to_schema()).inserted_id
+        review_id = (await mongo_client.review.insert_one(review.to_schema())).inserted_id
 
         product_reviews_db = mongo_client.review.find({'product_id': product_id})
 
-        product_reviews = [pr for pr in product_reviews_db]
+        product_reviews = [pr async for pr in product_reviews_db]
 
         rating = float(str(sum([pr['rating'] for pr in product_reviews]) / len(product_reviews))[:3])
 
-        mongo_client.product.update_one(
+        await mongo_client.product.update_one(
             {"_id": ObjectId(product_id)},
             {"$set": {'rating': rating}}
         )
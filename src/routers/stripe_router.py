@@ -1,46 +1,62 @@
 import datetime
-import uuid
-from typing import Annotated, List, Mapping, Any, Union
+from typing import Annotated, List, Mapping, Any, Optional
 
-import requests
+import stripe
 from bson import ObjectId
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Header, Request
 from fastapi import status
+from fastapi.concurrency import run_in_threadpool
 from pymongo.database import Database
-from stripe import StripeClient, CustomerPaymentMethodService, SetupIntentService, PaymentIntentService, CardError
+from stripe import StripeClient, SetupIntentService, PaymentIntentService
 from stripe.tax import CalculationService
 
 from dependencies.auth import get_current_user
 from dependencies.mongodb import MongoDBClient
+from dependencies.order_events import order_event_broker
 from dependencies.stripe_client import StripeClientInstance
+from src.database.mongodb.collection.order_job_collection import get_order_job, \
+    get_order_job_by_payment_intent_async
 from src.env_variables.env import env_variables
-from src.models.product import ProductModel
-from src.models.request.order import OrderModel, OrderDatesModel, CustomerInfoOrderModel, ShippingInfoOrderModel, \
-    BillingInfoOrderModel, ProductItemOrderModel, OrderSummaryModel
 from src.models.request.stripe_integration import CalculateTaxesRequest
 from src.models.responses.stripe_integration import SetupIntentResponse, PaymentMethodResponse, CalculateTaxesResponse, \
-    PlaceOrderRequest
-from src.models.responses.user import CartResponse
+    PlaceOrderRequest, OrderJobResponse
+from src.models.responses.user import CartResponse, CartProductModel
 from src.models.user import BaseUserModel
+from src.services.cart import hydrate_cart
+from src.services.idempotency import run_idempotent
+from src.services.payment_methods import get_customer_payment_methods, evict_payment_methods
+from src.services.inventory import reserve_stock, release_reservations, cart_items
+from src.services.order_queue import enqueue_order
+from src.services.orders import place_order as place_order_service
+from src.services.pricing import price_cart_documents
+from src.services.taxes import calculate_tax
 from src.shared.exceptions import HttpException
 from src.shared.generics import Data, Error, ErrorResponse, MessageResponse, MessageWithStatusResponse
 from src.utils.constants import ErrorsIDs, ErrorsDescriptionsObject, PaymentIntentStatus, ResponseDescriptions, \
-    StripeErrorsIDs, StripeErrorsDescriptionsObject
-from src.utils.utils import convert_currency
+    OrderEventType
 
 stripe_router = APIRouter(tags=['Stripe integration'])
-currency_convertion_api_url = env_variables.currency_convertion_api_url
 
 
-@stripe_router.post('/payment-intent/setup', responses={
-    status.HTTP_201_CREATED: {"model": Data[SetupIntentResponse], 'description': 'Setup intent created'},
-}, status_code=status.HTTP_201_CREATED)
-def setup_stripe_payment_intent(
-        current_user: Annotated[BaseUserModel, Depends(get_current_user)],
-        mongo_client: Database[Mapping[str, Any]] = Depends(MongoDBClient()),
-        stripe_client: StripeClient = Depends(StripeClientInstance())
+def _setup_stripe_payment_intent(
+        current_user: BaseUserModel,
+        mongo_client: Database[Mapping[str, Any]],
+        stripe_client: StripeClient
 ):
     try:
+        user_cart_db = mongo_client.cart.find_one({'user_id': current_user.id})
+        user_cart = hydrate_cart(mongo_client, user_cart_db['cart']) if user_cart_db else []
+
+        reservation = reserve_stock(mongo_client, current_user.id, cart_items(user_cart))
+
+        if reservation.failed:
+            raise HttpException(
+                status_code=status.HTTP_409_CONFLICT,
+                error_id=ErrorsIDs.PRODUCTS_OUT_OF_STOCK,
+                description=ErrorsDescriptionsObject[ErrorsIDs.PRODUCTS_OUT_OF_STOCK].format(
+                    ', '.join(reservation.failed))
+            )
+
         payment_intent_initiated = mongo_client.payment_intent.find_one(
             {'user_id': current_user.id, 'status': PaymentIntentStatus.INITIATED.value})
 
@@ -106,17 +122,7 @@ def setup_stripe_payment_intent(
             )
         )
 
-        user_cart_db = mongo_client.cart.find_one({'user_id': current_user.id})
-
-        user_cart: List[CartResponse] = [CartResponse(
-            product=cart['product'],
-            cartInfo=cart['cart_info']
-        ) for cart in user_cart_db['cart']]
-
-        amount = sum([int((prod.product.cost + sum(
-            [variant.price for variant in prod.cartInfo.variants if variant.price] if prod.cartInfo.variants else [
-                0])) * prod.cartInfo.amount)
-                      for prod in user_cart])
+        amount = price_cart_documents(user_cart, current_user.preferences.currency, mongo_client).total
 
         payment_intent = stripe_client.payment_intents.create(
             params=PaymentIntentService.CreateParams(
@@ -150,6 +156,34 @@ def setup_stripe_payment_intent(
         raise ex
 
 
+@stripe_router.post('/payment-intent/setup', responses={
+    status.HTTP_201_CREATED: {"model": Data[SetupIntentResponse], 'description': 'Setup intent created'},
+    status.HTTP_409_CONFLICT: {"model": Error[ErrorResponse], 'description': 'Request with this key in progress'},
+    status.HTTP_422_UNPROCESSABLE_ENTITY: {"model": Error[ErrorResponse], 'description': 'Idempotency key reused'},
+}, status_code=status.HTTP_201_CREATED)
+def setup_stripe_payment_intent(
+        current_user: Annotated[BaseUserModel, Depends(get_current_user)],
+        mongo_client: Database[Mapping[str, Any]] = Depends(MongoDBClient()),
+        stripe_client: StripeClient = Depends(StripeClientInstance()),
+        idempotency_key: Optional[str] = Header(default=None, alias='Idempotency-Key', min_length=1,
+                                                max_length=255)
+):
+    try:
+        return run_idempotent(
+            idempotency_key=idempotency_key,
+            scope=f'{current_user.id}:payment-intent-setup',
+            request_fingerprint='',
+            status_code=status.HTTP_201_CREATED,
+            handler=lambda: _setup_stripe_payment_intent(current_user, mongo_client, stripe_client)
+        )
+
+    except HttpException as ex:
+        raise ex
+
+    except Exception as ex:
+        raise ex
+
+
 @stripe_router.delete('/payment-intent/{setupIntentId}/remove', responses={
     status.HTTP_200_OK: {"model": Data[MessageResponse], 'description': 'Payment intent removed'},
     status.HTTP_404_NOT_FOUND: {"model": Data[MessageResponse], 'description': 'Payment intent not found'},
@@ -172,6 +206,7 @@ def remove_stripe_payment_intent(
             )
 
         mongo_client.payment_intent.delete_one({'setup_intent_id': setup_intent_id, 'user_id': current_user.id})
+        release_reservations(mongo_client, current_user.id)
 
         # payment_intent_stripe = stripe_client.payment_intents.retrieve(payment_intent_db['payment_intent_id'])
 
@@ -200,12 +235,7 @@ def get_payment_methods(
         stripe_client: StripeClient = Depends(StripeClientInstance())
 ):
     try:
-        payment_methods = stripe_client.customers.payment_methods.list(
-            customer=current_user.stripeId,
-            params=CustomerPaymentMethodService.ListParams(
-                type='card'
-            )
-        ).data
+        payment_methods = get_customer_payment_methods(stripe_client, current_user.stripeId)
 
         if len(payment_methods) <= 0:
             raise HttpException(
@@ -214,16 +244,6 @@ def get_payment_methods(
                 description=ErrorsDescriptionsObject[ErrorsIDs.NO_RECORDS_FOUND].format('Payment methods')
             )
 
-        payment_methods = [PaymentMethodResponse(
-            id=pm.id,
-            default=False,
-            type=pm.type,
-            brand=pm.card.brand,
-            ending=pm.card.last4,
-            expirationDate=f'{pm.card.exp_month:02}/{pm.card.exp_year}' if len(
-                str(pm.card.exp_month)) <= 1 else f'{pm.card.exp_month}/{pm.card.exp_year}'
-        ) for pm in payment_methods]
-
         return Data[List[PaymentMethodResponse]](
             data=payment_methods
         )
@@ -235,6 +255,67 @@ def get_payment_methods(
         raise ex
 
 
+@stripe_router.post('/webhook', responses={
+    status.HTTP_200_OK: {"model": Data[MessageResponse], 'description': 'Webhook received'},
+    status.HTTP_400_BAD_REQUEST: {"model": Error[ErrorResponse], 'description': 'Webhook signature not valid'},
+}, status_code=status.HTTP_200_OK, include_in_schema=False)
+async def stripe_webhook(
+        request: Request,
+        stripe_signature: Optional[str] = Header(default=None, alias='Stripe-Signature')
+):
+    try:
+        if not env_variables.stripe_webhook_secret or not stripe_signature:
+            raise HttpException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                error_id=ErrorsIDs.WEBHOOK_SIGNATURE_NOT_VALID,
+                description=ErrorsDescriptionsObject[ErrorsIDs.WEBHOOK_SIGNATURE_NOT_VALID]
+            )
+
+        try:
+            event = stripe.Webhook.construct_event(await request.body(), stripe_signature,
+                                                   env_variables.stripe_webhook_secret)
+        except (ValueError, stripe.SignatureVerificationError):
+            raise HttpException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                error_id=ErrorsIDs.WEBHOOK_SIGNATURE_NOT_VALID,
+                description=ErrorsDescriptionsObject[ErrorsIDs.WEBHOOK_SIGNATURE_NOT_VALID]
+            )
+
+        if event.type == 'payment_method.attached':
+            evict_payment_methods(event.data.object.customer)
+
+        elif event.type == 'payment_method.detached':
+            previous_attributes = event.data.get('previous_attributes') or {}
+
+            if previous_attributes.get('customer'):
+                evict_payment_methods(previous_attributes['customer'])
+
+        elif event.type.startswith('payment_intent.'):
+            order_job = await get_order_job_by_payment_intent_async(event.data.object.id)
+
+            if order_job:
+                await run_in_threadpool(
+                    order_event_broker.publish,
+                    order_id=str(order_job['_id']),
+                    user_id=order_job['user_id'],
+                    type=OrderEventType.PAYMENT_UPDATED.value,
+                    status=event.data.object.status.upper(),
+                    data=dict(paymentIntentId=event.data.object.id, event=event.type)
+                )
+
+        return Data[MessageResponse](
+            data=MessageResponse(
+                message=ResponseDescriptions.WEBHOOK_RECEIVED
+            )
+        )
+
+    except HttpException as ex:
+        raise ex
+
+    except Exception as ex:
+        raise ex
+
+
 @stripe_router.post('/taxes/calculate', responses={
     status.HTTP_200_OK: {"model": Data[CalculateTaxesResponse], 'description': 'Taxes calculated'},
 }, status_code=status.HTTP_200_OK)
@@ -246,37 +327,28 @@ def calculate_taxes(
 ):
     try:
         user_cart_db = mongo_client.cart.find_one({'user_id': current_user.id})
+        carts = hydrate_cart(mongo_client, user_cart_db['cart'])
 
         user_cart: List[CartResponse] = [CartResponse(
-            product=cart['product'],
+            product=CartProductModel.to_model(cart['product']),
             cartInfo=cart['cart_info']
-        ) for cart in user_cart_db['cart']]
+        ) for cart in carts]
+
+        priced_cart = price_cart_documents(carts, current_user.preferences.currency, mongo_client)
 
         line_items_stripe = [CalculationService.CreateParamsLineItem(
-            amount=convert_currency(base_currency=prod.product.currency,
-                                    target_currency=current_user.preferences.currency,
-                                    amount=int((prod.product.cost + sum(
-                                        [variant.price for variant in prod.cartInfo.variants if
-                                         variant.price] if prod.cartInfo.variants else [0])) * prod.cartInfo.amount),
-                                    mongo_client=mongo_client
-                                    ),
+            amount=priced_cart.totals[index],
             reference=f"{prod.product.name}, {', '.join([variant.value for variant in prod.cartInfo.variants] if prod.cartInfo.variants else '')}."
-        ) for prod in user_cart]
+        ) for index, prod in enumerate(user_cart)]
 
         user_address_db = mongo_client.addresses.find_one({'_id': ObjectId(calculate_taxes_request.addressId)})
 
-        tax_calculation = stripe_client.tax.calculations.create(
-            params=CalculationService.CreateParams(
-                currency=current_user.preferences.currency,
-                customer_details=CalculationService.CreateParamsCustomerDetails(
-                    address=CalculationService.CreateParamsCustomerDetailsAddress(
-                        postal_code=user_address_db['postal_code'],
-                        country=user_address_db['country']
-                    ),
-                    address_source='shipping'
-                ),
-                line_items=line_items_stripe
-            )
+        tax_calculation = calculate_tax(
+            stripe_client=stripe_client,
+            currency=current_user.preferences.currency,
+            postal_code=user_address_db['postal_code'],
+            country=user_address_db['country'],
+            line_items=line_items_stripe
         )
 
         return Data[CalculateTaxesResponse](
@@ -294,267 +366,124 @@ def calculate_taxes(
         raise ex
 
 
+def _place_order(
+        current_user: BaseUserModel,
+        place_order_request: PlaceOrderRequest,
+        mongo_client: Database[Mapping[str, Any]],
+        stripe_client: StripeClient
+):
+    try:
+        place_order_service(mongo_client, stripe_client, current_user, place_order_request)
+
+        return Data[MessageResponse](
+            data=MessageResponse(message='testing')
+        )
+
+    except HttpException as ex:
+        raise ex
+
+    except Exception as ex:
+        raise ex
+
+
 @stripe_router.post('/place-order', responses={
     status.HTTP_200_OK: {"model": Data[MessageResponse], 'description': 'Order placed'},
     status.HTTP_202_ACCEPTED: {"model": Data[MessageWithStatusResponse], 'description': 'Order being processed'},
+    status.HTTP_409_CONFLICT: {"model": Error[ErrorResponse], 'description': 'Request with this key in progress'},
+    status.HTTP_422_UNPROCESSABLE_ENTITY: {"model": Error[ErrorResponse], 'description': 'Idempotency key reused'},
 }, status_code=status.HTTP_200_OK)
 def place_order(
         current_user: Annotated[BaseUserModel, Depends(get_current_user)],
         place_order_request: PlaceOrderRequest,
         mongo_client: Database[Mapping[str, Any]] = Depends(MongoDBClient()),
-        stripe_client: StripeClient = Depends(StripeClientInstance())
+        stripe_client: StripeClient = Depends(StripeClientInstance()),
+        idempotency_key: Optional[str] = Header(default=None, alias='Idempotency-Key', min_length=1,
+                                                max_length=255)
 ):
     try:
-        user_cart_db = mongo_client.cart.find_one({'user_id': current_user.id})
-        user_address_db = mongo_client.addresses.find_one(
-            {'_id': ObjectId(place_order_request.shippingAddress), 'user_id': ObjectId(current_user.id)})
-        payment_intent_db = mongo_client.payment_intent.find_one(
-            {'user_id': current_user.id, 'status': PaymentIntentStatus.INITIATED.value})
-
-        user_cart: List[CartResponse] = [CartResponse(
-            product=ProductModel.to_model(cart['product']),
-            cartInfo=cart['cart_info']
-        ) for cart in user_cart_db['cart']]
-
-        orders: List[OrderModel] = []
-
-        for product in user_cart:
-            existent_store_order: Union[List[OrderModel], OrderModel] = list(
-                filter(lambda order: order.storeId == product.product.storeId, orders))
-
-            if len(existent_store_order) > 0:
-                existent_store_order = existent_store_order[0]
-
-                existent_store_order.items.append(
-                    ProductItemOrderModel(
-                        id=product.product.id,
-                        image=product.product.imgs[0] if len(product.product.imgs) > 0 else None,
-                        storeId=product.product.storeId,
-                        name=product.product.name,
-                        category=product.product.category,
-                        quantity=product.cartInfo.amount,
-                        price=product.product.cost,
-                        currency=product.product.currency,
-                        variants=product.cartInfo.variants,
-                        totalPrice=int((product.product.cost + sum(
-                            [variant.price for variant in product.cartInfo.variants if
-                             variant.price] if product.cartInfo.variants else [0])) * product.cartInfo.amount)
-                    ))
-
-                total = int((product.product.cost + sum(
-                    [variant.price for variant in product.cartInfo.variants if
-                     variant.price])) * product.cartInfo.amount)
-
-                if product.product.currency != current_user.preferences.currency:
-                    subtotal_convertion = requests.get(
-                        url=f'{currency_convertion_api_url}/pair/{product.product.currency}/{current_user.preferences.currency}/{total}')
+        return run_idempotent(
+            idempotency_key=idempotency_key,
+            scope=f'{current_user.id}:place-order',
+            request_fingerprint=place_order_request.model_dump_json(),
+            status_code=status.HTTP_200_OK,
+            handler=lambda: _place_order(current_user, place_order_request, mongo_client, stripe_client)
+        )
 
-                    total = round(subtotal_convertion.json()['conversion_result'])
+    except HttpException as ex:
+        raise ex
 
-                existent_store_order.summary.subtotal += total
+    except Exception as ex:
+        raise ex
 
-            else:
-                total = int((product.product.cost + sum(
-                    [variant.price for variant in product.cartInfo.variants if
-                     variant.price] if product.cartInfo.variants else [0])) * product.cartInfo.amount)
-
-                if product.product.currency != current_user.preferences.currency:
-                    subtotal_convertion = requests.get(
-                        url=f'{currency_convertion_api_url}/pair/{product.product.currency}/{current_user.preferences.currency}/{total}')
-
-                    total = round(subtotal_convertion.json()['conversion_result'])
-
-                existent_store_order = OrderModel(
-                    storeId=product.product.storeId,
-                    dates=OrderDatesModel(
-                        order=datetime.datetime.now()
-                    ),
-                    userInfo=CustomerInfoOrderModel(
-                        id=current_user.id,
-                        email=place_order_request.contactInfo.email,
-                        phone=place_order_request.contactInfo.phone
-                    ),
-                    shippingInfo=ShippingInfoOrderModel(
-                        address=place_order_request.shippingAddress,
-                        method='express',
-                        trackingNumber=str(uuid.uuid4())
-                    ),
-                    billingInfo=BillingInfoOrderModel(
-                        paymentIntentId=payment_intent_db['payment_intent_id'],
-                        paymentMethod=place_order_request.paymentMethod
-                    ),
-                    items=[
-                        ProductItemOrderModel(
-                            id=product.product.id,
-                            image=product.product.imgs[0] if len(product.product.imgs) > 0 else None,
-                            storeId=product.product.storeId,
-                            name=product.product.name,
-                            category=product.product.category,
-                            quantity=product.cartInfo.amount,
-                            price=product.product.cost,
-                            currency=product.product.currency,
-                            variants=product.cartInfo.variants,
-                            totalPrice=int((product.product.cost + sum(
-                                [variant.price for variant in product.cartInfo.variants if
-                                 variant.price] if product.cartInfo.variants else [0])) * product.cartInfo.amount)
-                        )
-                    ],
-                    summary=OrderSummaryModel(
-                        currency=current_user.preferences.currency,
-                        subtotal=total,
-                        shipping=0,
-                        taxes=0,
-                        totalAmount=total
-                    )
-                )
 
-                orders.append(existent_store_order)
-
-        for order in orders:
-            line_items_stripe = [
-                CalculationService.CreateParamsLineItem(
-                    amount=int(order.summary.subtotal),
-                    reference=f'{order.storeId}',
-                    tax_behavior='exclusive'
-                )]
-
-            tax_calculation = stripe_client.tax.calculations.create(
-                params=CalculationService.CreateParams(
-                    currency=current_user.preferences.currency,
-                    customer_details=CalculationService.CreateParamsCustomerDetails(
-                        address=CalculationService.CreateParamsCustomerDetailsAddress(
-                            postal_code=user_address_db['postal_code'],
-                            country=user_address_db['country']
-                        ),
-                        address_source='shipping'
-                    ),
-                    line_items=line_items_stripe
-                )
-            )
+def _to_order_job_response(order_job: Mapping[str, Any]) -> OrderJobResponse:
+    error = order_job.get('error')
 
-            order.summary.taxes = tax_calculation.tax_amount_exclusive or tax_calculation.tax_amount_inclusive
-            order.summary.totalAmount = (order.summary.subtotal + order.summary.taxes + order.summary.shipping)
+    return OrderJobResponse(
+        jobId=str(order_job['_id']),
+        status=order_job['status'],
+        attempts=order_job['attempts'],
+        orderIds=order_job['order_ids'],
+        error=ErrorResponse(errorId=error['error_id'], description=error['description']) if error else None,
+        createdAt=order_job['created_at'],
+        updatedAt=order_job['updated_at']
+    )
 
-        amount_to_pay_in_cents = int(sum([
-            order.summary.totalAmount for order in orders
-        ]) * 100)
 
-        stripe_client.payment_intents.update(
-            payment_intent_db['payment_intent_id'],
-            params=PaymentIntentService.UpdateParams(
-                payment_method_types=['card'],
-                customer=current_user.stripeId,
-                amount=amount_to_pay_in_cents,
-                currency=current_user.preferences.currency,
-                payment_method=place_order_request.paymentMethod
+@stripe_router.post('/place-order/jobs', responses={
+    status.HTTP_202_ACCEPTED: {"model": Data[OrderJobResponse], 'description': 'Order queued'},
+    status.HTTP_404_NOT_FOUND: {"model": Error[ErrorResponse], 'description': 'Cart, address or intent not found'},
+    status.HTTP_503_SERVICE_UNAVAILABLE: {"model": Error[ErrorResponse], 'description': 'Order queue is full'},
+}, status_code=status.HTTP_202_ACCEPTED)
+def enqueue_place_order(
+        current_user: Annotated[BaseUserModel, Depends(get_current_user)],
+        place_order_request: PlaceOrderRequest,
+        mongo_client: Database[Mapping[str, Any]] = Depends(MongoDBClient()),
+        idempotency_key: Optional[str] = Header(default=None, alias='Idempotency-Key', min_length=1,
+                                                max_length=255)
+):
+    try:
+        return run_idempotent(
+            idempotency_key=idempotency_key,
+            scope=f'{current_user.id}:place-order-job',
+            request_fingerprint=place_order_request.model_dump_json(),
+            status_code=status.HTTP_202_ACCEPTED,
+            handler=lambda: Data[OrderJobResponse](
+                data=_to_order_job_response(enqueue_order(mongo_client, current_user, place_order_request))
             )
         )
 
-        payment_intent = stripe_client.payment_intents.confirm(
-            payment_intent_db['payment_intent_id'],
-            params=PaymentIntentService.ConfirmParams(
-                payment_method=place_order_request.paymentMethod
-            )
-        )
+    except HttpException as ex:
+        raise ex
 
-        # if payment_intent.status.upper() == PaymentIntentStatus.PROCESSING.value:
-        #     mongo_client.payment_intent.update_one(
-        #         {"payment_intent_id": payment_intent_db['payment_intent_id']},
-        #         {"$set": dict(
-        #             status=PaymentIntentStatus.PROCESSING.value
-        #         )}
-        #     )
-        #
-        #     return JSONResponse(
-        #         status_code=status.ACCEPTED.value,
-        #         content=Data[MessageResponse](
-        #             data=MessageWithStatusResponse(
-        #                 status=f'{PaymentIntentStatus.PROCESSING.value}_PAYMENT'.lower(),
-        #                 message=ResponseDescriptions.PROCESSING_PAYMENT
-        #             )
-        #         ).to_json()
-        #     )
-
-        if payment_intent.status.upper() != PaymentIntentStatus.SUCCESSFUL.value:
-            payment_intent = stripe_client.payment_intents.create(
-                params=PaymentIntentService.CreateParams(
-                    payment_method_types=['card'],
-                    customer=current_user.stripeId,
-                    amount=1,
-                    currency=current_user.preferences.currency
-                )
-            )
+    except Exception as ex:
+        raise ex
 
-            mongo_client.payment_intent.update_one(
-                {'user_id': current_user.id, 'status': PaymentIntentStatus.INITIATED.value},
-                {"$set": dict(
-                    payment_intent_id=payment_intent.id
-                )}
-            )
 
+@stripe_router.get('/place-order/jobs/{jobId}', responses={
+    status.HTTP_200_OK: {"model": Data[OrderJobResponse], 'description': 'Order job found'},
+    status.HTTP_404_NOT_FOUND: {"model": Error[ErrorResponse], 'description': 'Order job not found'},
+}, status_code=status.HTTP_200_OK)
+def get_place_order_job(
+        current_user: Annotated[BaseUserModel, Depends(get_current_user)],
+        job_id: str = Path(alias='jobId', min_length=24, max_length=24)
+):
+    try:
+        order_job = get_order_job(job_id, current_user.id) if ObjectId.is_valid(job_id) else None
+
+        if not order_job:
             raise HttpException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                error_id=0,
-                description="test"
+                status_code=status.HTTP_404_NOT_FOUND,
+                error_id=ErrorsIDs.NO_RECORDS_FOUND,
+                description=ErrorsDescriptionsObject[ErrorsIDs.NO_RECORDS_FOUND].format('Order job')
             )
 
-        mongo_client.payment_intent.update_one(
-            {"payment_intent_id": payment_intent_db['payment_intent_id']},
-            {"$set": dict(
-                status=PaymentIntentStatus.SUCCESSFUL.value,
-                end_date=datetime.datetime.now()
-            )}
-        )
-
-        mongo_client.orders.insert_many([order.to_schema() for order in orders])
-
-        for order in orders:
-            for product in order.items:
-                product_db = mongo_client.product.find_one({'_id': ObjectId(product.id)})
-
-                if product_db:
-                    mongo_client.product.update_one(
-                        {"_id": ObjectId(product.id)},
-                        {"$set": dict(
-                            stock=product_db['stock'] - product.quantity
-                        )}
-                    )
-
-        mongo_client.cart.delete_one({'user_id': current_user.id})
-
-        return Data[MessageResponse](
-            data=MessageResponse(message='testing')
+        return Data[OrderJobResponse](
+            data=_to_order_job_response(order_job)
         )
 
     except HttpException as ex:
         raise ex
 
-    except CardError as ex:
-        payment_intent = stripe_client.payment_intents.create(
-            params=PaymentIntentService.CreateParams(
-                payment_method_types=['card'],
-                customer=current_user.stripeId,
-                amount=1,
-                currency=current_user.preferences.currency
-            )
-        )
-
-        mongo_client.payment_intent.update_one(
-            {'user_id': current_user.id, 'status': PaymentIntentStatus.INITIATED.value},
-            {"$set": dict(
-                payment_intent_id=payment_intent.id
-            )}
-        )
-
-        error_id = StripeErrorsIDs.__dict__.get(
-            ex.error.decline_code.upper() if ex.error.decline_code else ex.error.code.upper())
-        error_description = StripeErrorsDescriptionsObject[error_id]
-
-        raise HttpException(
-            status_code=ex.http_status,
-            error_id=error_id,
-            description=error_description
-        )
-
     except Exception as ex:
         raise ex
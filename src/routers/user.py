@@ -3,19 +3,27 @@ from typing import Annotated, List, Any
 
 from bson import ObjectId
 from fastapi import APIRouter, status, Depends, Path
+from motor.motor_asyncio import AsyncIOMotorDatabase
 from pymongo.database import Database
+from pymongo.errors import DuplicateKeyError
 
 from dependencies.auth import get_current_user
-from dependencies.mongodb import MongoDBClient
+from dependencies.mongodb import MongoDBClient, AsyncMongoDBClient
 from dependencies.stripe_client import StripeClient, StripeClientInstance
+from src.database.mongodb.collection.user_preferences_collection import upsert_user_preferences
 from src.models.address import AddressModel
-from src.models.request.user import CartRequest, CartModelRequest, PaymentMethodCardRequest
-from src.models.responses.user import CartResponse, AddressResponse
-from src.models.user import BaseUserModel
+from src.database.mongodb.collection.cart_collection import add_cart_lines_async, upsert_cart_line_async, \
+    increment_cart_line_async, set_cart_line_amount_async, remove_cart_line_async
+from src.database.mongodb.schema.cart_schema import CartCollectionSchema
+from src.models.request.user import CartModelRequest, CartLineAmountRequest, PaymentMethodCardRequest
+from src.models.responses.user import CartResponse, CartLineResponse, CartProductModel, AddressResponse
+from src.models.user import BaseUserModel, UserPreferencesModel
+from src.services.cart import cart_line, merge_cart_lines, hydrate_cart_async, validate_cart, \
+    price_cart_lines_async
+from src.services.pricing import cart_lines, base_currencies, get_rates_async, convert
 from src.shared.exceptions import HttpException
 from src.shared.generics import ErrorResponse, Data, Error, MessageResponse
 from src.utils.constants import ErrorsIDs, ErrorsDescriptions, ResponseDescriptions, ErrorsDescriptionsObject
-from src.utils.utils import convert_currency
 
 user_router = APIRouter()
 
@@ -216,12 +224,12 @@ def change_default_user_address(
     status.HTTP_200_OK: {"model": Data[List[CartResponse]], 'description': 'Cart Found'},
     status.HTTP_404_NOT_FOUND: {"model": Error[ErrorResponse], 'description': 'Cart Not Found'},
 }, status_code=status.HTTP_200_OK)
-def get_user_cart(
+async def get_user_cart(
         current_user: Annotated[BaseUserModel, Depends(get_current_user)],
-        mongo_client: Database[Mapping[str, Any]] = Depends(MongoDBClient())
+        mongo_client: AsyncIOMotorDatabase = Depends(AsyncMongoDBClient())
 ):
     try:
-        user_cart_db = mongo_client.cart.find_one({'user_id': current_user.id})
+        user_cart_db = await mongo_client.cart.find_one({'user_id': current_user.id})
 
         if not user_cart_db:
             raise HttpException(
@@ -230,23 +238,35 @@ def get_user_cart(
                 description=ErrorsDescriptions.NO_RECORDS_FOUND.value.format('cart')
             )
 
-        for cart in user_cart_db['cart']:
-            cart['product']['cost'] = convert_currency(base_currency=cart['product']['currency'],
-                                                       target_currency=current_user.preferences.currency,
-                                                       amount=cart['product']['cost'], mongo_client=mongo_client)
-            cart['product']['currency'] = current_user.preferences.currency
+        carts = await hydrate_cart_async(mongo_client, user_cart_db['cart'])
+        lines = cart_lines(carts)
+        validations = validate_cart(carts)
+
+        currency = current_user.preferences.currency
+        rates = await get_rates_async(base_currencies(lines, currency) | {
+            validation.previous_currency for validation in validations
+            if validation.previous_currency and validation.previous_currency != currency
+        }, currency, mongo_client)
+
+        for cart in carts:
+            base_currency = cart['product']['currency']
+
+            cart['product']['cost'] = convert(cart['product']['cost'], base_currency, currency, rates)
+            cart['product']['currency'] = currency
 
-            if cart['cart_info']['variants']:
-                for variant in cart['cart_info']['variants']:
-                    if variant['price']:
-                        variant['price'] = convert_currency(base_currency=cart['product']['currency'],
-                                                            target_currency=current_user.preferences.currency,
-                                                            amount=variant['price'], mongo_client=mongo_client)
+            for variant in cart['cart_info']['variants'] or []:
+                if variant.get('price'):
+                    variant['price'] = convert(variant['price'], base_currency, currency, rates)
 
         user_cart = [CartResponse(
-            product=cart['product'],
-            cartInfo=cart['cart_info']
-        ).to_json() for cart in user_cart_db['cart']]
+            key=cart['key'],
+            product=CartProductModel.to_model(cart['product']),
+            cartInfo=cart['cart_info'],
+            outOfStock=validation.out_of_stock,
+            priceChanged=validation.price_changed,
+            previousUnitPrice=convert(validation.previous_unit_price, validation.previous_currency, currency, rates)
+            if validation.previous_unit_price is not None else None
+        ).to_json() for cart, validation in zip(carts, validations)]
 
         return Data[List[CartResponse]](
             data=user_cart
@@ -259,29 +279,36 @@ def get_user_cart(
         raise ex
 
 
+def _user_already_have_cart() -> HttpException:
+    return HttpException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        error_id=ErrorsIDs.USER_ALREADY_HAVE_CART,
+        description=ErrorsDescriptionsObject[ErrorsIDs.USER_ALREADY_HAVE_CART]
+    )
+
+
 @user_router.post('/cart/create', responses={
     status.HTTP_201_CREATED: {"model": Data[MessageResponse], 'description': 'Cart created'},
     status.HTTP_400_BAD_REQUEST: {"model": Data[MessageResponse], 'description': 'Cart created'}
 }, status_code=status.HTTP_201_CREATED)
-def create_user_cart(
+async def create_user_cart(
         cart: List[CartModelRequest],
         current_user: Annotated[BaseUserModel, Depends(get_current_user)],
-        mongo_client: Database[Mapping[str, Any]] = Depends(MongoDBClient())
+        mongo_client: AsyncIOMotorDatabase = Depends(AsyncMongoDBClient())
 ):
     try:
-        user_cart = mongo_client.cart.find_one({'user_id': current_user.id})
+        user_cart = await mongo_client.cart.find_one({'user_id': current_user.id})
 
         if user_cart:
-            raise HttpException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                error_id=ErrorsIDs.USER_ALREADY_HAVE_CART,
-                description=ErrorsDescriptions[ErrorsIDs.USER_ALREADY_HAVE_CART]
-            )
+            raise _user_already_have_cart()
 
-        mongo_client.cart.insert_one(CartRequest(
-            userId=current_user.id,
-            cart=cart
-        ).to_schema())
+        try:
+            await mongo_client.cart.insert_one(CartCollectionSchema(
+                user_id=current_user.id,
+                cart=await price_cart_lines_async(mongo_client, merge_cart_lines(cart_line(item) for item in cart))
+            ))
+        except DuplicateKeyError:
+            raise _user_already_have_cart()
 
         return Data[MessageResponse](
             data=MessageResponse(
@@ -299,41 +326,142 @@ def create_user_cart(
 @user_router.put('/cart/update', responses={
     status.HTTP_200_OK: {"model": Data[MessageResponse], 'description': 'Cart updated'}
 }, status_code=status.HTTP_200_OK)
-def update_user_cart(
+async def update_user_cart(
         new_items: List[CartModelRequest],
         current_user: Annotated[BaseUserModel, Depends(get_current_user)],
-        mongo_client: Database[Mapping[str, Any]] = Depends(MongoDBClient())
+        mongo_client: AsyncIOMotorDatabase = Depends(AsyncMongoDBClient())
 ):
-    def item_exists_in_cart(new_item, cart_items):
-        for item in cart_items:
-            if item["product"]["id"] == new_item["product"]["id"]:
-                if item["cart_info"]["variants"] == new_item["cart_info"]["variants"]:
-                    return True
-        return False
-
     try:
-        user_cart = mongo_client.cart.find_one({'user_id': current_user.id})
+        cart_updated = await add_cart_lines_async(current_user.id, await price_cart_lines_async(
+            mongo_client, merge_cart_lines(cart_line(item) for item in new_items)))
 
-        if not user_cart:
+        if not cart_updated:
             raise HttpException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 error_id=ErrorsIDs.NO_RECORDS_FOUND,
                 description=ErrorsDescriptions.NO_RECORDS_FOUND.value.format('cart')
             )
 
-        unique_new_cart_items = [
-            item.to_schema() for item in new_items if not item_exists_in_cart(item.to_schema(), user_cart['cart'])
-        ]
+        return Data[MessageResponse](
+            data=MessageResponse(
+                message=ResponseDescriptions.RECORD_UPDATED_SUCCESS.format('Cart')
+            ).to_json()
+        )
+
+    except HttpException as ex:
+        raise ex
+
+    except Exception as ex:
+        raise ex
+
+
+def _cart_line_not_found() -> HttpException:
+    return HttpException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        error_id=ErrorsIDs.NO_RECORDS_FOUND,
+        description=ErrorsDescriptions.NO_RECORDS_FOUND.value.format('cart line')
+    )
 
-        mongo_client.cart.update_one(
-            {'user_id': current_user.id},
-            {"$addToSet": {"cart": {"$each": unique_new_cart_items}}}
+
+@user_router.post('/cart/lines', responses={
+    status.HTTP_200_OK: {"model": Data[CartLineResponse], 'description': 'Cart line added'}
+}, status_code=status.HTTP_200_OK)
+async def add_user_cart_line(
+        item: CartModelRequest,
+        current_user: Annotated[BaseUserModel, Depends(get_current_user)],
+        mongo_client: AsyncIOMotorDatabase = Depends(AsyncMongoDBClient())
+):
+    try:
+        line = (await price_cart_lines_async(mongo_client, [cart_line(item)]))[0]
+
+        await upsert_cart_line_async(current_user.id, line)
+
+        return Data[CartLineResponse](
+            data=CartLineResponse(
+                key=line['key'],
+                productId=item.productId,
+                variantKeys=line['variant_keys'],
+                amount=line['amount'],
+                unitPrice=line['unit_price'],
+                currency=line['currency']
+            )
         )
 
+    except HttpException as ex:
+        raise ex
+
+    except Exception as ex:
+        raise ex
+
+
+@user_router.post('/cart/lines/{key}/increment', responses={
+    status.HTTP_200_OK: {"model": Data[MessageResponse], 'description': 'Cart line updated'},
+    status.HTTP_404_NOT_FOUND: {"model": Error[ErrorResponse], 'description': 'Cart line not found'},
+}, status_code=status.HTTP_200_OK)
+async def increment_user_cart_line(
+        cart_line_amount: CartLineAmountRequest,
+        current_user: Annotated[BaseUserModel, Depends(get_current_user)],
+        key: str = Path(min_length=1)
+):
+    try:
+        if not await increment_cart_line_async(current_user.id, key, cart_line_amount.amount):
+            raise _cart_line_not_found()
+
         return Data[MessageResponse](
             data=MessageResponse(
-                message=ResponseDescriptions.RECORD_UPDATED_SUCCESS.format('Cart')
-            ).to_json()
+                message=ResponseDescriptions.RECORD_UPDATED_SUCCESS.format('Cart line')
+            )
+        )
+
+    except HttpException as ex:
+        raise ex
+
+    except Exception as ex:
+        raise ex
+
+
+@user_router.put('/cart/lines/{key}', responses={
+    status.HTTP_200_OK: {"model": Data[MessageResponse], 'description': 'Cart line updated'},
+    status.HTTP_404_NOT_FOUND: {"model": Error[ErrorResponse], 'description': 'Cart line not found'},
+}, status_code=status.HTTP_200_OK)
+async def set_user_cart_line_amount(
+        cart_line_amount: CartLineAmountRequest,
+        current_user: Annotated[BaseUserModel, Depends(get_current_user)],
+        key: str = Path(min_length=1)
+):
+    try:
+        if not await set_cart_line_amount_async(current_user.id, key, cart_line_amount.amount):
+            raise _cart_line_not_found()
+
+        return Data[MessageResponse](
+            data=MessageResponse(
+                message=ResponseDescriptions.RECORD_UPDATED_SUCCESS.format('Cart line')
+            )
+        )
+
+    except HttpException as ex:
+        raise ex
+
+    except Exception as ex:
+        raise ex
+
+
+@user_router.delete('/cart/lines/{key}', responses={
+    status.HTTP_200_OK: {"model": Data[MessageResponse], 'description': 'Cart line removed'},
+    status.HTTP_404_NOT_FOUND: {"model": Error[ErrorResponse], 'description': 'Cart line not found'},
+}, status_code=status.HTTP_200_OK)
+async def remove_user_cart_line(
+        current_user: Annotated[BaseUserModel, Depends(get_current_user)],
+        key: str = Path(min_length=1)
+):
+    try:
+        if not await remove_cart_line_async(current_user.id, key):
+            raise _cart_line_not_found()
+
+        return Data[MessageResponse](
+            data=MessageResponse(
+                message=ResponseDescriptions.RECORD_DELETED_SUCCESS.format('Cart line')
+            )
         )
 
     except HttpException as ex:
@@ -346,12 +474,12 @@ def update_user_cart(
 @user_router.delete('/cart/remove', responses={
     status.HTTP_200_OK: {"model": Data[MessageResponse], 'description': 'Cart updated'}
 }, status_code=status.HTTP_200_OK)
-def remove_user_cart(
+async def remove_user_cart(
         current_user: Annotated[BaseUserModel, Depends(get_current_user)],
-        mongo_client: Database[Mapping[str, Any]] = Depends(MongoDBClient())
+        mongo_client: AsyncIOMotorDatabase = Depends(AsyncMongoDBClient())
 ):
     try:
-        user_cart = mongo_client.cart.find_one({'user_id': current_user.id})
+        user_cart = await mongo_client.cart.find_one({'user_id': current_user.id})
 
         if not user_cart:
             raise HttpException(
@@ -360,7 +488,7 @@ def remove_user_cart(
                 description=ErrorsDescriptions.NO_RECORDS_FOUND.value.format('cart')
             )
 
-        mongo_client.cart.delete_one({'user_id': current_user.id})
+        await mongo_client.cart.delete_one({'user_id': current_user.id})
 
         return Data[MessageResponse](
             data=MessageResponse(
@@ -373,3 +501,26 @@ def remove_user_cart(
 
     except Exception as ex:
         raise ex
+
+
+@user_router.put('/preferences', responses={
+    status.HTTP_200_OK: {"model": Data[MessageResponse], 'description': 'Preferences updated'}
+}, status_code=status.HTTP_200_OK)
+def update_user_preferences(
+        preferences: UserPreferencesModel,
+        current_user: Annotated[BaseUserModel, Depends(get_current_user)]
+):
+    try:
+        upsert_user_preferences(user_id=current_user.id, preferences=preferences)
+
+        return Data[MessageResponse](
+            data=MessageResponse(
+                message=ResponseDescriptions.RECORD_UPDATED_SUCCESS.format('Preferences')
+            ).to_json()
+        )
+
+    except HttpException as ex:
+        raise ex
+
+    except Exception as ex:
+        raise ex
@@ -0,0 +1,149 @@
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.database import Database
+
+from src.database.mongodb.schema.cart_schema import CartLineSchema
+from src.models.request.user import CartModelRequest
+from src.services.pricing import cart_lines
+from src.utils.utils import cart_line_key
+
+PRICE_TOLERANCE = 0.005
+
+CART_PRODUCT_PROJECTION = {field: 1 for field in (
+    'store_id', 'name', 'cost', 'currency', 'stock', 'category', 'subcategory', 'rating', 'imgs', 'dates', 'details',
+    'variants'
+)}
+
+CART_PRICE_PROJECTION = {'cost': 1, 'currency': 1, 'variants': 1}
+
+
+class CartLineValidation(NamedTuple):
+    out_of_stock: bool
+    price_changed: bool
+    previous_unit_price: Optional[float]
+    previous_currency: Optional[str]
+
+
+def cart_line(cart_model_request: CartModelRequest) -> CartLineSchema:
+    variant_keys = sorted(set(cart_model_request.variantKeys or []))
+
+    return CartLineSchema(
+        key=cart_line_key(cart_model_request.productId, variant_keys),
+        product_id=ObjectId(cart_model_request.productId),
+        variant_keys=variant_keys,
+        amount=cart_model_request.amount
+    )
+
+
+def merge_cart_lines(lines: Iterable[CartLineSchema]) -> List[CartLineSchema]:
+    merged: Dict[str, CartLineSchema] = {}
+
+    for line in lines:
+        if line['key'] in merged:
+            merged[line['key']]['amount'] += line['amount']
+        else:
+            merged[line['key']] = line
+
+    return list(merged.values())
+
+
+def _product_query(lines: Iterable[CartLineSchema]) -> dict:
+    return {'_id': {'$in': list({line['product_id'] for line in lines})}}
+
+
+def _variants_by_key(product: Mapping[str, Any]) -> Dict[str, Mapping[str, Any]]:
+    variants: Dict[str, Mapping[str, Any]] = {}
+
+    for group in (product.get('variants') or {}).values():
+        if isinstance(group, list):
+            for variant in group:
+                variants.setdefault(variant['key'], variant)
+
+    return variants
+
+
+def _hydrate(lines: Iterable[CartLineSchema], products: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+    products_by_id = {product['_id']: (product, _variants_by_key(product)) for product in products}
+    carts = []
+
+    for line in lines:
+        product, variants = products_by_id.get(line['product_id'], (None, None))
+
+        if product is None:
+            continue
+
+        carts.append({
+            'key': line['key'],
+            'unit_price': line.get('unit_price'),
+            'currency': line.get('currency'),
+            'product': dict(product),
+            'cart_info': {
+                'amount': line['amount'],
+                'variants': [dict(variants[key]) for key in line['variant_keys'] if key in variants]
+            }
+        })
+
+    return carts
+
+
+def hydrate_cart(mongo_client: Database[Mapping[str, Any]], lines: List[CartLineSchema]) -> List[Dict[str, Any]]:
+    if not lines:
+        return []
+
+    return _hydrate(lines, mongo_client.product.find(_product_query(lines), projection=CART_PRODUCT_PROJECTION))
+
+
+async def hydrate_cart_async(mongo_client: AsyncIOMotorDatabase, lines: List[CartLineSchema]) \
+        -> List[Dict[str, Any]]:
+    if not lines:
+        return []
+
+    return _hydrate(lines, await mongo_client.product.find(
+        _product_query(lines), projection=CART_PRODUCT_PROJECTION).to_list(length=None))
+
+
+def _price(lines: List[CartLineSchema], products: Iterable[Mapping[str, Any]]) -> List[CartLineSchema]:
+    products_by_id = {product['_id']: (product, _variants_by_key(product)) for product in products}
+
+    for line in lines:
+        product, variants = products_by_id.get(line['product_id'], (None, None))
+
+        if product is None:
+            line['unit_price'] = None
+            line['currency'] = None
+            continue
+
+        line['unit_price'] = product['cost'] + sum(variants[key].get('price') or 0
+                                                   for key in line['variant_keys'] if key in variants)
+        line['currency'] = product['currency']
+
+    return lines
+
+
+async def price_cart_lines_async(mongo_client: AsyncIOMotorDatabase, lines: List[CartLineSchema]) \
+        -> List[CartLineSchema]:
+    if not lines:
+        return lines
+
+    return _price(lines, await mongo_client.product.find(
+        _product_query(lines), projection=CART_PRICE_PROJECTION).to_list(length=None))
+
+
+def validate_cart(carts: List[Mapping[str, Any]]) -> List[CartLineValidation]:
+    validations = []
+
+    for cart, line in zip(carts, cart_lines(carts)):
+        previous_currency = cart.get('currency')
+        previous_unit_price = cart.get('unit_price') if previous_currency else None
+
+        validations.append(CartLineValidation(
+            out_of_stock=cart['product'].get('stock', 0) < line.quantity,
+            price_changed=previous_unit_price is not None and (
+                    previous_currency != line.currency or abs(previous_unit_price - line.unit_price) > PRICE_TOLERANCE),
+            previous_unit_price=previous_unit_price,
+            previous_currency=previous_currency
+        ))
+
+    return validations
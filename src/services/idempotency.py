@@ -0,0 +1,131 @@
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette import status
+
+from src.database.mongodb.collection.idempotency_key_collection import claim_idempotency_key, get_idempotency_key, \
+    take_over_idempotency_key, complete_idempotency_key, remove_idempotency_key
+from src.database.mongodb.schema.idempotency_key_schema import IdempotencyKeyCollectionSchema
+from src.env_variables.env import env_variables
+from src.shared.exceptions import HttpException
+from src.utils.constants import ErrorsIDs, ErrorsDescriptionsObject
+
+IN_FLIGHT = 'in_flight'
+COMPLETED = 'completed'
+
+POLL_SECONDS = 0.1
+
+
+def _in_flight(key: str, fingerprint: str) -> IdempotencyKeyCollectionSchema:
+    now = datetime.now(timezone.utc)
+
+    return IdempotencyKeyCollectionSchema(
+        _id=key,
+        state=IN_FLIGHT,
+        fingerprint=fingerprint,
+        created_at=now,
+        expires_at=now + timedelta(seconds=env_variables.idempotency_lock_seconds)
+    )
+
+
+def _completed(key: str, fingerprint: str, status_code: int, response: Any = None, error_id: Optional[int] = None,
+               description: Optional[str] = None) -> IdempotencyKeyCollectionSchema:
+    now = datetime.now(timezone.utc)
+
+    return IdempotencyKeyCollectionSchema(
+        _id=key,
+        state=COMPLETED,
+        fingerprint=fingerprint,
+        status_code=status_code,
+        response=response,
+        error_id=error_id,
+        description=description,
+        created_at=now,
+        expires_at=now + timedelta(seconds=env_variables.idempotency_key_ttl_seconds)
+    )
+
+
+def _replay(idempotency_key: IdempotencyKeyCollectionSchema):
+    if idempotency_key.get('error_id') is not None:
+        raise HttpException(
+            status_code=idempotency_key['status_code'],
+            error_id=idempotency_key['error_id'],
+            description=idempotency_key['description']
+        )
+
+    return JSONResponse(status_code=idempotency_key['status_code'], content=idempotency_key['response'])
+
+
+def _is_replayable(ex: HttpException) -> bool:
+    return ex.status_code < status.HTTP_500_INTERNAL_SERVER_ERROR and ex.status_code != status.HTTP_409_CONFLICT
+
+
+def _acquire(key: str, fingerprint: str) -> Optional[IdempotencyKeyCollectionSchema]:
+    deadline = time.monotonic() + env_variables.idempotency_wait_seconds
+
+    while True:
+        if claim_idempotency_key(_in_flight(key, fingerprint)):
+            return None
+
+        idempotency_key = get_idempotency_key(key)
+
+        if idempotency_key is not None:
+            if idempotency_key['fingerprint'] != fingerprint:
+                raise HttpException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    error_id=ErrorsIDs.IDEMPOTENCY_KEY_REUSED,
+                    description=ErrorsDescriptionsObject[ErrorsIDs.IDEMPOTENCY_KEY_REUSED]
+                )
+
+            if idempotency_key['state'] == COMPLETED:
+                return idempotency_key
+
+            if take_over_idempotency_key(key, IN_FLIGHT, datetime.now(timezone.utc), _in_flight(key, fingerprint)):
+                return None
+
+        if time.monotonic() >= deadline:
+            raise HttpException(
+                status_code=status.HTTP_409_CONFLICT,
+                error_id=ErrorsIDs.IDEMPOTENCY_REQUEST_IN_PROGRESS,
+                description=ErrorsDescriptionsObject[ErrorsIDs.IDEMPOTENCY_REQUEST_IN_PROGRESS]
+            )
+
+        time.sleep(POLL_SECONDS)
+
+
+def run_idempotent(idempotency_key: Optional[str], scope: str, request_fingerprint: str, status_code: int,
+                   handler: Callable[[], Any]):
+    if not idempotency_key:
+        return handler()
+
+    key = f'{scope}:{idempotency_key}'
+    fingerprint = hashlib.sha256(request_fingerprint.encode()).hexdigest()
+
+    completed = _acquire(key, fingerprint)
+
+    if completed:
+        return _replay(completed)
+
+    try:
+        result = handler()
+
+    except HttpException as ex:
+        if _is_replayable(ex):
+            complete_idempotency_key(key, _completed(key, fingerprint, ex.status_code, error_id=ex.error_id,
+                                                     description=ex.description))
+        else:
+            remove_idempotency_key(key)
+
+        raise ex
+
+    except Exception as ex:
+        remove_idempotency_key(key)
+        raise ex
+
+    complete_idempotency_key(key, _completed(key, fingerprint, status_code, response=jsonable_encoder(result)))
+
+    return result
@@ -0,0 +1,200 @@
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.database import Database
+
+from src.database.mongodb.collection.reservation_collection import insert_reservations, get_user_reservations, \
+    get_reservations, get_expired_reservations, remove_reservations
+from src.database.mongodb.schema.reservation_schema import ReservationCollectionSchema
+from src.env_variables.env import env_variables
+from src.utils.constants import Params
+
+
+class StockUpdateReport(NamedTuple):
+    tag: str
+    quantities: Dict[str, int]
+    reserved: List[str]
+    failed: List[str]
+    holds: Dict[str, ReservationCollectionSchema]
+
+
+class ReservationReport(NamedTuple):
+    reserved: List[str]
+    failed: List[str]
+
+
+def _aggregate_quantities(items: Iterable[Tuple[str, int]]) -> Dict[str, int]:
+    quantities: Counter = Counter()
+
+    for product_id, quantity in items:
+        quantities[product_id] += quantity
+
+    return dict(quantities)
+
+
+def _available_at_least(quantity: int) -> dict:
+    return {'$expr': {'$gte': [{'$subtract': ['$stock', {'$ifNull': ['$reserved', 0]}]}, quantity]}}
+
+
+def _stock_update(product_id: str, quantity: int, tag: str,
+                  reservation: Optional[ReservationCollectionSchema]) -> UpdateOne:
+    push_tag = {'stock_updates': {'$each': [tag], '$slice': -Params.STOCK_UPDATE_TAGS_LIMIT}}
+
+    if reservation is None:
+        return UpdateOne(
+            {'_id': ObjectId(product_id), 'stock': {'$gte': quantity}, **_available_at_least(quantity)},
+            {'$inc': {'stock': -quantity}, '$push': push_tag}
+        )
+
+    return UpdateOne(
+        {'_id': ObjectId(product_id), 'stock': {'$gte': quantity}, 'reservations': reservation['_id'],
+         **_available_at_least(quantity - reservation['quantity'])},
+        {
+            '$inc': {'stock': -quantity, 'reserved': -reservation['quantity']},
+            '$pull': {'reservations': reservation['_id']},
+            '$push': push_tag
+        }
+    )
+
+
+def decrement_stock(mongo_client: Database[Mapping[str, Any]], items: Iterable[Tuple[str, int]],
+                    user_id: Optional[str] = None) -> StockUpdateReport:
+    quantities = _aggregate_quantities(items)
+    tag = uuid.uuid4().hex
+
+    if not quantities:
+        return StockUpdateReport(tag=tag, quantities=quantities, reserved=[], failed=[], holds={})
+
+    reservations = {str(reservation['product_id']): reservation
+                    for reservation in (get_user_reservations(user_id) if user_id else [])}
+
+    result = mongo_client.product.bulk_write([
+        _stock_update(product_id, quantity, tag, reservations.get(product_id))
+        for product_id, quantity in quantities.items()
+    ], ordered=False)
+
+    if result.matched_count == len(quantities):
+        return StockUpdateReport(tag=tag, quantities=quantities, reserved=list(quantities), failed=[],
+                                 holds={product_id: reservations[product_id] for product_id in quantities
+                                        if product_id in reservations})
+
+    reserved = {str(product['_id']) for product in mongo_client.product.find(
+        {'_id': {'$in': [ObjectId(product_id) for product_id in quantities]}, 'stock_updates': tag},
+        projection={'_id': 1}
+    )}
+
+    return StockUpdateReport(
+        tag=tag,
+        quantities=quantities,
+        reserved=[product_id for product_id in quantities if product_id in reserved],
+        failed=[product_id for product_id in quantities if product_id not in reserved],
+        holds={product_id: reservations[product_id] for product_id in reserved if product_id in reservations}
+    )
+
+
+def _restore_update(product_id: str, quantity: int, tag: str,
+                    reservation: Optional[ReservationCollectionSchema]) -> UpdateOne:
+    if reservation is None:
+        return UpdateOne(
+            {'_id': ObjectId(product_id), 'stock_updates': tag},
+            {'$inc': {'stock': quantity}, '$pull': {'stock_updates': tag}}
+        )
+
+    return UpdateOne(
+        {'_id': ObjectId(product_id), 'stock_updates': tag},
+        {
+            '$inc': {'stock': quantity, 'reserved': reservation['quantity']},
+            '$pull': {'stock_updates': tag},
+            '$push': {'reservations': reservation['_id']}
+        }
+    )
+
+
+def restore_stock(mongo_client: Database[Mapping[str, Any]], report: StockUpdateReport) -> int:
+    if not report.reserved:
+        return 0
+
+    restored = mongo_client.product.bulk_write([
+        _restore_update(product_id, report.quantities[product_id], report.tag, report.holds.get(product_id))
+        for product_id in report.reserved
+    ], ordered=False).modified_count
+
+    if report.holds:
+        live = {reservation['_id'] for reservation in
+                get_reservations([reservation['_id'] for reservation in report.holds.values()])}
+        released = [reservation for reservation in report.holds.values() if reservation['_id'] not in live]
+
+        if released:
+            mongo_client.product.bulk_write([UpdateOne(
+                {'_id': reservation['product_id'], 'reservations': reservation['_id']},
+                {'$inc': {'reserved': -reservation['quantity']}, '$pull': {'reservations': reservation['_id']}}
+            ) for reservation in released], ordered=False)
+
+    return restored
+
+
+def cart_items(carts: Iterable[Mapping[str, Any]]) -> List[Tuple[str, int]]:
+    return [(str(cart['product']['_id']), cart['cart_info']['amount']) for cart in carts]
+
+
+def _release(mongo_client: Database[Mapping[str, Any]], reservations: List[ReservationCollectionSchema]) -> int:
+    if not reservations:
+        return 0
+
+    mongo_client.product.bulk_write([UpdateOne(
+        {'_id': reservation['product_id'], 'reservations': reservation['_id']},
+        {'$inc': {'reserved': -reservation['quantity']}, '$pull': {'reservations': reservation['_id']}}
+    ) for reservation in reservations], ordered=False)
+
+    return remove_reservations([reservation['_id'] for reservation in reservations])
+
+
+def reserve_stock(mongo_client: Database[Mapping[str, Any]], user_id: str,
+                  items: Iterable[Tuple[str, int]]) -> ReservationReport:
+    release_reservations(mongo_client, user_id)
+
+    quantities = _aggregate_quantities(items)
+
+    if not quantities:
+        return ReservationReport(reserved=[], failed=[])
+
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=env_variables.reservation_ttl_seconds)
+    reservations = [ReservationCollectionSchema(
+        product_id=ObjectId(product_id),
+        user_id=user_id,
+        quantity=quantity,
+        expires_at=expires_at
+    ) for product_id, quantity in quantities.items()]
+
+    reservation_ids = insert_reservations(reservations)
+
+    result = mongo_client.product.bulk_write([UpdateOne(
+        {'_id': reservation['product_id'], **_available_at_least(reservation['quantity'])},
+        {'$inc': {'reserved': reservation['quantity']}, '$push': {'reservations': reservation['_id']}}
+    ) for reservation in reservations], ordered=False)
+
+    if result.matched_count == len(reservations):
+        return ReservationReport(reserved=list(quantities), failed=[])
+
+    held = {product['_id'] for product in mongo_client.product.find(
+        {'_id': {'$in': [reservation['product_id'] for reservation in reservations]},
+         'reservations': {'$in': reservation_ids}},
+        projection={'_id': 1}
+    )}
+
+    _release(mongo_client, reservations)
+
+    return ReservationReport(reserved=[], failed=[str(reservation['product_id']) for reservation in reservations
+                                               if reservation['product_id'] not in held])
+
+
+def release_reservations(mongo_client: Database[Mapping[str, Any]], user_id: str) -> int:
+    return _release(mongo_client, get_user_reservations(user_id))
+
+
+def release_expired_reservations(mongo_client: Database[Mapping[str, Any]]) -> int:
+    return _release(mongo_client, get_expired_reservations(Params.RESERVATION_RELEASE_BATCH_SIZE))
@@ -0,0 +1,299 @@
+import logging
+import os
+import socket
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from threading import Event, Thread
+from typing import Any, List, Mapping, Optional
+
+from bson import ObjectId
+from pymongo.database import Database
+from starlette import status
+from stripe import StripeClient
+
+from dependencies.order_events import order_event_broker
+from src.database.mongodb.collection.order_job_collection import insert_order_job, count_pending_order_jobs, \
+    lease_order_job, renew_order_job_lease, fail_abandoned_order_job, checkpoint_order_job, complete_order_job, \
+    retry_order_job, fail_order_job
+from src.database.mongodb.schema.order_job_schema import OrderJobCollectionSchema, OrderJobErrorSchema, \
+    OrderJobCheckoutSchema
+from src.env_variables.env import env_variables
+from src.models.responses.stripe_integration import PlaceOrderRequest
+from src.models.user import BaseUserModel
+from src.services.inventory import StockUpdateReport, restore_stock
+from src.services.orders import load_order_context, prepare_order, reserve_order_stock, charge_order, \
+    finalize_order
+from src.shared.exceptions import HttpException
+from src.utils.constants import ErrorsIDs, ErrorsDescriptionsObject, ErrorsDescriptions, OrderJobStatus, \
+    OrderEventType, OrderJobStage, PaymentIntentStatus
+
+
+def enqueue_order(mongo_client: Database[Mapping[str, Any]], current_user: BaseUserModel,
+                  place_order_request: PlaceOrderRequest) -> OrderJobCollectionSchema:
+    if count_pending_order_jobs() >= env_variables.order_queue_max_pending:
+        raise HttpException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            error_id=ErrorsIDs.SERVICE_BUSY,
+            description=ErrorsDescriptionsObject[ErrorsIDs.SERVICE_BUSY],
+            headers={'Retry-After': str(int(env_variables.order_job_retry_backoff_seconds))}
+        )
+
+    context = load_order_context(mongo_client, current_user.id, place_order_request)
+
+    now = datetime.now(timezone.utc)
+
+    order_job = OrderJobCollectionSchema(
+        user_id=current_user.id,
+        user=current_user.model_dump(),
+        request=place_order_request.model_dump(),
+        payment_intent_id=context.payment_intent['payment_intent_id'],
+        status=OrderJobStatus.QUEUED.value,
+        attempts=0,
+        available_at=now,
+        lease_owner=None,
+        lease_expires_at=None,
+        order_ids=[],
+        checkout=None,
+        error=None,
+        created_at=now,
+        updated_at=now
+    )
+    order_job['_id'] = insert_order_job(order_job)
+
+    _publish(order_job, OrderEventType.QUEUED, OrderJobStatus.QUEUED)
+
+    return order_job
+
+
+def _publish(order_job: OrderJobCollectionSchema, event_type: OrderEventType, job_status: OrderJobStatus,
+             data: Optional[dict] = None):
+    order_event_broker.publish(
+        order_id=str(order_job['_id']),
+        user_id=order_job['user_id'],
+        type=event_type.value,
+        status=job_status.value,
+        data=data
+    )
+
+
+def _job_error(ex: Exception) -> OrderJobErrorSchema:
+    if isinstance(ex, HttpException):
+        return OrderJobErrorSchema(status_code=ex.status_code, error_id=ex.error_id, description=ex.description)
+
+    return OrderJobErrorSchema(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        error_id=ErrorsIDs.INTERNAL_SERVER_ERROR,
+        description=ErrorsDescriptions.INTERNAL_SERVER_ERROR.value
+    )
+
+
+def _is_retryable(ex: Exception) -> bool:
+    return not isinstance(ex, HttpException) or ex.status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR
+
+
+def _checkpoint(order_job: OrderJobCollectionSchema, lease_owner: str,
+                checkout: Optional[OrderJobCheckoutSchema]):
+    if not checkpoint_order_job(order_job['_id'], lease_owner, checkout, datetime.now(timezone.utc)):
+        raise RuntimeError(f'Order job {order_job["_id"]} lease lost')
+
+    order_job['checkout'] = checkout
+
+
+def _reconcile_charge(mongo_client: Database[Mapping[str, Any]], stripe_client: StripeClient,
+                      order_job: OrderJobCollectionSchema, lease_owner: str):
+    checkout = order_job['checkout']
+    payment_intent = stripe_client.payment_intents.retrieve(checkout['payment_intent_id'])
+
+    if payment_intent.status.upper() == PaymentIntentStatus.SUCCESSFUL.value:
+        _checkpoint(order_job, lease_owner,
+                    OrderJobCheckoutSchema(**{**checkout, 'stage': OrderJobStage.CHARGED.value}))
+        return
+
+    if payment_intent.status.upper() == PaymentIntentStatus.PROCESSING.value:
+        raise RuntimeError(f'Payment intent {checkout["payment_intent_id"]} is still processing')
+
+    restore_stock(mongo_client, StockUpdateReport(**checkout['stock_update']))
+    _checkpoint(order_job, lease_owner, None)
+
+
+def _charge(mongo_client: Database[Mapping[str, Any]], stripe_client: StripeClient,
+            order_job: OrderJobCollectionSchema, lease_owner: str):
+    current_user = BaseUserModel(**order_job['user'])
+    place_order_request = PlaceOrderRequest(**order_job['request'])
+
+    prepared_order = prepare_order(mongo_client, stripe_client, current_user, place_order_request)
+    stock_update = reserve_order_stock(mongo_client, current_user, prepared_order)
+
+    try:
+        _checkpoint(order_job, lease_owner, OrderJobCheckoutSchema(
+            stage=OrderJobStage.CHARGING.value,
+            payment_intent_id=prepared_order.payment_intent_id,
+            orders=[dict(order.to_schema(), _id=ObjectId()) for order in prepared_order.orders],
+            stock_update=stock_update._asdict()
+        ))
+
+    except Exception as ex:
+        restore_stock(mongo_client, stock_update)
+        raise ex
+
+    try:
+        charge_order(mongo_client, stripe_client, current_user, place_order_request, prepared_order)
+
+    except HttpException as ex:
+        restore_stock(mongo_client, stock_update)
+        _checkpoint(order_job, lease_owner, None)
+        raise ex
+
+    _checkpoint(order_job, lease_owner,
+                OrderJobCheckoutSchema(**{**order_job['checkout'], 'stage': OrderJobStage.CHARGED.value}))
+
+
+def process_order_job(mongo_client: Database[Mapping[str, Any]], stripe_client: StripeClient,
+                      order_job: OrderJobCollectionSchema, lease_owner: str):
+    try:
+        if order_job.get('checkout') and order_job['checkout']['stage'] == OrderJobStage.CHARGING.value:
+            _reconcile_charge(mongo_client, stripe_client, order_job, lease_owner)
+
+        if not order_job.get('checkout'):
+            _charge(mongo_client, stripe_client, order_job, lease_owner)
+
+        order_ids = finalize_order(mongo_client, order_job['user_id'], order_job['checkout']['payment_intent_id'],
+                                   order_job['checkout']['orders'])
+
+    except Exception as ex:
+        now = datetime.now(timezone.utc)
+
+        if order_job.get('checkout'):
+            logging.warning(f'Order job {order_job["_id"]} stopped at {order_job["checkout"]["stage"]} for '
+                            f'payment intent {order_job["checkout"]["payment_intent_id"]}')
+
+        if _is_retryable(ex) and order_job['attempts'] < env_variables.order_job_max_attempts:
+            logging.warning(f'Order job {order_job["_id"]} attempt {order_job["attempts"]} failed -> {ex}')
+
+            backoff = env_variables.order_job_retry_backoff_seconds * 2 ** (order_job['attempts'] - 1)
+
+            if retry_order_job(order_job['_id'], lease_owner, _job_error(ex), now, now + timedelta(seconds=backoff)):
+                _publish(order_job, OrderEventType.RETRYING, OrderJobStatus.QUEUED,
+                         dict(attempts=order_job['attempts'], retryInSeconds=backoff))
+        else:
+            logging.error(f'Order job {order_job["_id"]} failed -> {ex}')
+
+            error = _job_error(ex)
+
+            if fail_order_job(order_job['_id'], lease_owner, error, now,
+                              now + timedelta(seconds=env_variables.order_job_retention_seconds)):
+                _publish(order_job, OrderEventType.FAILED, OrderJobStatus.FAILED,
+                         dict(errorId=error['error_id'], description=error['description']))
+
+        return
+
+    now = datetime.now(timezone.utc)
+
+    if complete_order_job(order_job['_id'], lease_owner, order_ids, now,
+                          now + timedelta(seconds=env_variables.order_job_retention_seconds)):
+        _publish(order_job, OrderEventType.SUCCEEDED, OrderJobStatus.SUCCEEDED, dict(orderIds=order_ids))
+
+
+@contextmanager
+def _lease_heartbeat(order_job: OrderJobCollectionSchema, lease_owner: str):
+    stopped = Event()
+
+    def beat():
+        while not stopped.wait(env_variables.order_job_lease_seconds / 3):
+            now = datetime.now(timezone.utc)
+
+            try:
+                if not renew_order_job_lease(order_job['_id'], lease_owner, now,
+                                             now + timedelta(seconds=env_variables.order_job_lease_seconds)):
+                    logging.warning(f'Order job {order_job["_id"]} lease lost by {lease_owner}')
+                    return
+
+            except Exception as ex:
+                logging.error(f'Order job {order_job["_id"]} lease renewal throw exception -> {ex}')
+
+    heartbeat = Thread(target=beat, name=f'order-job-heartbeat-{order_job["_id"]}', daemon=True)
+    heartbeat.start()
+
+    try:
+        yield
+    finally:
+        stopped.set()
+        heartbeat.join()
+
+
+def _fail_abandoned_order_job() -> bool:
+    now = datetime.now(timezone.utc)
+    error = OrderJobErrorSchema(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        error_id=ErrorsIDs.INTERNAL_SERVER_ERROR,
+        description=ErrorsDescriptions.INTERNAL_SERVER_ERROR.value
+    )
+
+    order_job = fail_abandoned_order_job(env_variables.order_job_max_attempts, error, now,
+                                         now + timedelta(seconds=env_variables.order_job_retention_seconds))
+
+    if not order_job:
+        return False
+
+    logging.error(f'Order job {order_job["_id"]} abandoned after {order_job["attempts"]} attempts')
+
+    _publish(order_job, OrderEventType.FAILED, OrderJobStatus.FAILED,
+             dict(errorId=error['error_id'], description=error['description']))
+
+    return True
+
+
+def process_next_order_job(mongo_client: Database[Mapping[str, Any]], stripe_client: StripeClient,
+                           lease_owner: str) -> bool:
+    now = datetime.now(timezone.utc)
+    order_job = lease_order_job(lease_owner, env_variables.order_job_max_attempts, now,
+                                now + timedelta(seconds=env_variables.order_job_lease_seconds))
+
+    if not order_job:
+        return _fail_abandoned_order_job()
+
+    _publish(order_job, OrderEventType.PROCESSING, OrderJobStatus.PROCESSING, dict(attempts=order_job['attempts']))
+
+    with _lease_heartbeat(order_job, lease_owner):
+        process_order_job(mongo_client, stripe_client, order_job, lease_owner)
+
+    return True
+
+
+class OrderWorker:
+    def __init__(self, mongo_client: Database[Mapping[str, Any]], stripe_client: StripeClient,
+                 concurrency: int, poll_seconds: float):
+        self._mongo_client = mongo_client
+        self._stripe_client = stripe_client
+        self._concurrency = concurrency
+        self._poll_seconds = poll_seconds
+        self._stopped = Event()
+        self._threads: List[Thread] = []
+        self.lease_owner = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+
+    def _run(self, index: int):
+        lease_owner = f'{self.lease_owner}:{index}'
+
+        while not self._stopped.is_set():
+            try:
+                if process_next_order_job(self._mongo_client, self._stripe_client, lease_owner):
+                    continue
+
+            except Exception as ex:
+                logging.error(f'Order worker {lease_owner} throw exception -> {ex}')
+
+            self._stopped.wait(self._poll_seconds)
+
+    def start(self):
+        self._threads = [Thread(target=self._run, args=(index,), name=f'order-worker-{index}', daemon=True)
+                         for index in range(self._concurrency)]
+
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stopped.set()
+
+        for thread in self._threads:
+            thread.join(timeout)
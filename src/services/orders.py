@@ -0,0 +1,277 @@
+import datetime
+import uuid
+from typing import Any, List, Mapping, NamedTuple
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.database import Database
+from starlette import status
+from stripe import StripeClient, PaymentIntentService, CardError
+from stripe.tax import CalculationService
+
+from src.models.request.order import OrderModel, OrderDatesModel, CustomerInfoOrderModel, ShippingInfoOrderModel, \
+    BillingInfoOrderModel, ProductItemOrderModel, OrderSummaryModel
+from src.models.responses.stripe_integration import PlaceOrderRequest
+from src.models.responses.user import CartResponse, CartProductModel
+from src.models.user import BaseUserModel
+from src.services.cart import hydrate_cart
+from src.services.inventory import decrement_stock, restore_stock, release_reservations, StockUpdateReport
+from src.services.pricing import price_cart_documents
+from src.services.taxes import calculate_taxes_concurrently
+from src.shared.exceptions import HttpException
+from src.utils.constants import ErrorsIDs, ErrorsDescriptionsObject, PaymentIntentStatus, StripeErrorsIDs, \
+    StripeErrorsDescriptionsObject
+
+
+class OrderContext(NamedTuple):
+    cart: List[Mapping[str, Any]]
+    address: Mapping[str, Any]
+    payment_intent: Mapping[str, Any]
+
+
+class PreparedOrder(NamedTuple):
+    payment_intent_id: str
+    amount_in_cents: int
+    orders: List[OrderModel]
+
+
+def _not_found(record: str) -> HttpException:
+    return HttpException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        error_id=ErrorsIDs.NO_RECORDS_FOUND,
+        description=ErrorsDescriptionsObject[ErrorsIDs.NO_RECORDS_FOUND].format(record)
+    )
+
+
+def load_order_context(mongo_client: Database[Mapping[str, Any]], user_id: str,
+                       place_order_request: PlaceOrderRequest) -> OrderContext:
+    user_cart_db = mongo_client.cart.find_one({'user_id': user_id})
+
+    if not user_cart_db or not user_cart_db['cart']:
+        raise _not_found('Cart')
+
+    user_address_db = mongo_client.addresses.find_one(
+        {'_id': ObjectId(place_order_request.shippingAddress), 'user_id': ObjectId(user_id)})
+
+    if not user_address_db:
+        raise _not_found('Address')
+
+    payment_intent_db = mongo_client.payment_intent.find_one(
+        {'user_id': user_id, 'status': PaymentIntentStatus.INITIATED.value})
+
+    if not payment_intent_db:
+        raise _not_found('Payment intent')
+
+    return OrderContext(cart=hydrate_cart(mongo_client, user_cart_db['cart']), address=user_address_db,
+                        payment_intent=payment_intent_db)
+
+
+def _renew_payment_intent(mongo_client: Database[Mapping[str, Any]], stripe_client: StripeClient,
+                          current_user: BaseUserModel):
+    payment_intent = stripe_client.payment_intents.create(
+        params=PaymentIntentService.CreateParams(
+            payment_method_types=['card'],
+            customer=current_user.stripeId,
+            amount=1,
+            currency=current_user.preferences.currency
+        )
+    )
+
+    mongo_client.payment_intent.update_one(
+        {'user_id': current_user.id, 'status': PaymentIntentStatus.INITIATED.value},
+        {"$set": dict(
+            payment_intent_id=payment_intent.id
+        )}
+    )
+
+
+def prepare_order(mongo_client: Database[Mapping[str, Any]], stripe_client: StripeClient,
+                  current_user: BaseUserModel, place_order_request: PlaceOrderRequest) -> PreparedOrder:
+    context = load_order_context(mongo_client, current_user.id, place_order_request)
+
+    user_cart: List[CartResponse] = [CartResponse(
+        product=CartProductModel.to_model(cart['product']),
+        cartInfo=cart['cart_info']
+    ) for cart in context.cart]
+
+    priced_cart = price_cart_documents(context.cart, current_user.preferences.currency, mongo_client)
+
+    orders: List[OrderModel] = [OrderModel(
+        storeId=store.store_id,
+        dates=OrderDatesModel(
+            order=datetime.datetime.now()
+        ),
+        userInfo=CustomerInfoOrderModel(
+            id=current_user.id,
+            email=place_order_request.contactInfo.email,
+            phone=place_order_request.contactInfo.phone
+        ),
+        shippingInfo=ShippingInfoOrderModel(
+            address=place_order_request.shippingAddress,
+            method='express',
+            trackingNumber=str(uuid.uuid4())
+        ),
+        billingInfo=BillingInfoOrderModel(
+            paymentIntentId=context.payment_intent['payment_intent_id'],
+            paymentMethod=place_order_request.paymentMethod
+        ),
+        items=[
+            ProductItemOrderModel(
+                id=user_cart[index].product.id,
+                image=user_cart[index].product.imgs[0] if len(user_cart[index].product.imgs) > 0 else None,
+                storeId=user_cart[index].product.storeId,
+                name=user_cart[index].product.name,
+                category=user_cart[index].product.category,
+                quantity=user_cart[index].cartInfo.amount,
+                price=user_cart[index].product.cost,
+                currency=user_cart[index].product.currency,
+                variants=user_cart[index].cartInfo.variants,
+                totalPrice=priced_cart.base_totals[index]
+            ) for index in store.line_indexes
+        ],
+        summary=OrderSummaryModel(
+            currency=current_user.preferences.currency,
+            subtotal=store.subtotal,
+            shipping=0,
+            taxes=0,
+            totalAmount=store.subtotal
+        )
+    ) for store in priced_cart.stores.values()]
+
+    tax_calculations = calculate_taxes_concurrently(
+        stripe_client=stripe_client,
+        currency=current_user.preferences.currency,
+        postal_code=context.address['postal_code'],
+        country=context.address['country'],
+        line_items_groups=[[
+            CalculationService.CreateParamsLineItem(
+                amount=int(order.summary.subtotal),
+                reference=f'{order.storeId}',
+                tax_behavior='exclusive'
+            )] for order in orders]
+    )
+
+    for order, tax_calculation in zip(orders, tax_calculations):
+        order.summary.taxes = tax_calculation.tax_amount_exclusive or tax_calculation.tax_amount_inclusive
+        order.summary.totalAmount = (order.summary.subtotal + order.summary.taxes + order.summary.shipping)
+
+    return PreparedOrder(
+        payment_intent_id=context.payment_intent['payment_intent_id'],
+        amount_in_cents=int(sum([order.summary.totalAmount for order in orders]) * 100),
+        orders=orders
+    )
+
+
+def reserve_order_stock(mongo_client: Database[Mapping[str, Any]], current_user: BaseUserModel,
+                        prepared_order: PreparedOrder) -> StockUpdateReport:
+    stock_update = decrement_stock(mongo_client, [(item.id, item.quantity)
+                                                  for order in prepared_order.orders for item in order.items],
+                                   user_id=current_user.id)
+
+    if stock_update.failed:
+        restore_stock(mongo_client, stock_update)
+
+        raise HttpException(
+            status_code=status.HTTP_409_CONFLICT,
+            error_id=ErrorsIDs.PRODUCTS_OUT_OF_STOCK,
+            description=ErrorsDescriptionsObject[ErrorsIDs.PRODUCTS_OUT_OF_STOCK].format(
+                ', '.join(stock_update.failed))
+        )
+
+    return stock_update
+
+
+def charge_order(mongo_client: Database[Mapping[str, Any]], stripe_client: StripeClient,
+                 current_user: BaseUserModel, place_order_request: PlaceOrderRequest,
+                 prepared_order: PreparedOrder):
+    try:
+        stripe_client.payment_intents.update(
+            prepared_order.payment_intent_id,
+            params=PaymentIntentService.UpdateParams(
+                payment_method_types=['card'],
+                customer=current_user.stripeId,
+                amount=prepared_order.amount_in_cents,
+                currency=current_user.preferences.currency,
+                payment_method=place_order_request.paymentMethod
+            )
+        )
+
+        payment_intent = stripe_client.payment_intents.confirm(
+            prepared_order.payment_intent_id,
+            params=PaymentIntentService.ConfirmParams(
+                payment_method=place_order_request.paymentMethod
+            )
+        )
+
+        if payment_intent.status.upper() != PaymentIntentStatus.SUCCESSFUL.value:
+            _renew_payment_intent(mongo_client, stripe_client, current_user)
+
+            raise HttpException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                error_id=0,
+                description="test"
+            )
+
+    except HttpException as ex:
+        raise ex
+
+    except CardError as ex:
+        _renew_payment_intent(mongo_client, stripe_client, current_user)
+
+        error_id = StripeErrorsIDs.__dict__.get(
+            ex.error.decline_code.upper() if ex.error.decline_code else ex.error.code.upper())
+        error_description = StripeErrorsDescriptionsObject[error_id]
+
+        raise HttpException(
+            status_code=ex.http_status,
+            error_id=error_id,
+            description=error_description
+        )
+
+    except Exception as ex:
+        raise ex
+
+
+def finalize_order(mongo_client: Database[Mapping[str, Any]], user_id: str, payment_intent_id: str,
+                   orders: List[Mapping[str, Any]]) -> List[str]:
+    mongo_client.payment_intent.update_one(
+        {"payment_intent_id": payment_intent_id},
+        {"$set": dict(
+            status=PaymentIntentStatus.SUCCESSFUL.value,
+            end_date=datetime.datetime.now()
+        )}
+    )
+
+    mongo_client.orders.bulk_write([UpdateOne(
+        {'_id': order['_id']},
+        {'$setOnInsert': {key: value for key, value in order.items() if key != '_id'}},
+        upsert=True
+    ) for order in orders], ordered=False)
+
+    mongo_client.cart.delete_one({'user_id': user_id})
+    release_reservations(mongo_client, user_id)
+
+    return [str(order['_id']) for order in orders]
+
+
+def place_order(mongo_client: Database[Mapping[str, Any]], stripe_client: StripeClient,
+                current_user: BaseUserModel, place_order_request: PlaceOrderRequest) -> List[str]:
+    try:
+        prepared_order = prepare_order(mongo_client, stripe_client, current_user, place_order_request)
+        stock_update = reserve_order_stock(mongo_client, current_user, prepared_order)
+
+        try:
+            charge_order(mongo_client, stripe_client, current_user, place_order_request, prepared_order)
+
+        except Exception as ex:
+            restore_stock(mongo_client, stock_update)
+            raise ex
+
+        return finalize_order(mongo_client, current_user.id, prepared_order.payment_intent_id,
+                              [dict(order.to_schema(), _id=ObjectId()) for order in prepared_order.orders])
+
+    except HttpException as ex:
+        raise ex
+
+    except Exception as ex:
+        raise ex
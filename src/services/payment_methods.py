@@ -0,0 +1,70 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from stripe import StripeClient, CustomerPaymentMethodService
+
+from dependencies import invalidation
+from dependencies.stripe_client import StripeClientInstance
+from src.env_variables.env import env_variables
+from src.models.responses.stripe_integration import PaymentMethodResponse
+from src.utils.cache import TTLCache
+
+PAYMENT_METHODS_INVALIDATION = 'payment_methods'
+
+payment_methods_cache = TTLCache(max_size=env_variables.payment_methods_cache_size,
+                                 ttl_seconds=env_variables.payment_methods_cache_ttl_seconds)
+
+_refresher = ThreadPoolExecutor(max_workers=1, thread_name_prefix='payment-methods-refresh')
+
+
+def fetch_payment_methods(stripe_client: StripeClient, customer: str) -> List[PaymentMethodResponse]:
+    payment_methods = stripe_client.customers.payment_methods.list(
+        customer=customer,
+        params=CustomerPaymentMethodService.ListParams(
+            type='card'
+        )
+    ).data
+
+    payment_methods = [PaymentMethodResponse(
+        id=pm.id,
+        default=False,
+        type=pm.type,
+        brand=pm.card.brand,
+        ending=pm.card.last4,
+        expirationDate=f'{pm.card.exp_month:02}/{pm.card.exp_year}' if len(
+            str(pm.card.exp_month)) <= 1 else f'{pm.card.exp_month}/{pm.card.exp_year}'
+    ) for pm in payment_methods]
+
+    payment_methods_cache.set(customer, payment_methods)
+
+    return payment_methods
+
+
+def get_customer_payment_methods(stripe_client: StripeClient, customer: str) -> List[PaymentMethodResponse]:
+    payment_methods: Optional[List[PaymentMethodResponse]] = payment_methods_cache.get(customer)
+
+    if payment_methods is not None:
+        return payment_methods
+
+    return fetch_payment_methods(stripe_client, customer)
+
+
+def _refresh_payment_methods(customer: str):
+    try:
+        fetch_payment_methods(StripeClientInstance()(), customer)
+
+    except Exception as ex:
+        logging.error(f'Refreshing payment methods for {customer} throw exception -> {ex}')
+
+
+def _invalidate_payment_methods(customer: str):
+    if payment_methods_cache.delete(customer):
+        _refresher.submit(_refresh_payment_methods, customer)
+
+
+def evict_payment_methods(customer: str):
+    invalidation.publish(PAYMENT_METHODS_INVALIDATION, customer)
+
+
+invalidation.subscribe(PAYMENT_METHODS_INVALIDATION, _invalidate_payment_methods)
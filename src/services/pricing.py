@@ -0,0 +1,134 @@
+from array import array
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Set
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.database import Database
+
+from src.utils.utils import fetch_convertion_rates, fetch_convertion_rates_async, convert_currency_2
+
+
+class CartLine(NamedTuple):
+    store_id: str
+    currency: str
+    unit_price: float
+    quantity: int
+
+
+class StoreSubtotal(NamedTuple):
+    store_id: str
+    line_indexes: List[int]
+    subtotal: int
+
+
+class PricedCart(NamedTuple):
+    currency: str
+    base_totals: array
+    totals: array
+    stores: Dict[str, StoreSubtotal]
+    total: int
+
+
+def cart_line(cart: Mapping[str, Any]) -> CartLine:
+    product = cart['product']
+    cart_info = cart['cart_info']
+
+    return CartLine(
+        store_id=str(product['store_id']),
+        currency=product['currency'],
+        unit_price=product['cost'] + sum(variant['price'] for variant in cart_info.get('variants') or []
+                                         if variant.get('price')),
+        quantity=cart_info['amount']
+    )
+
+
+def cart_lines(carts: Iterable[Mapping[str, Any]]) -> List[CartLine]:
+    return [cart_line(cart) for cart in carts]
+
+
+def base_currencies(lines: Iterable[CartLine], currency: str) -> Set[str]:
+    return {line.currency for line in lines if line.currency != currency}
+
+
+def _to_rates(currency: str, convertion_rates: Iterable[Mapping[str, Any]]) -> Dict[str, float]:
+    return {convertion_rate['base_currency']: convertion_rate['convertion_rates'][currency]
+            for convertion_rate in convertion_rates}
+
+
+def get_rates(currencies: Set[str], currency: str, mongo_client: Database[Mapping[str, Any]]) -> Dict[str, float]:
+    if not currencies:
+        return {}
+
+    rates = _to_rates(currency, mongo_client.convertion_rates.find({'base_currency': {'$in': list(currencies)}}))
+
+    for base_currency in currencies - rates.keys():
+        convertion = fetch_convertion_rates(base_currency)
+
+        if convertion:
+            mongo_client.convertion_rates.insert_one(convertion)
+            rates.update(_to_rates(currency, [convertion]))
+
+    return rates
+
+
+async def get_rates_async(currencies: Set[str], currency: str, mongo_client: AsyncIOMotorDatabase) \
+        -> Dict[str, float]:
+    if not currencies:
+        return {}
+
+    rates = _to_rates(currency, await mongo_client.convertion_rates.find(
+        {'base_currency': {'$in': list(currencies)}}).to_list(length=None))
+
+    for base_currency in currencies - rates.keys():
+        convertion = await fetch_convertion_rates_async(base_currency)
+
+        if convertion:
+            await mongo_client.convertion_rates.insert_one(convertion)
+            rates.update(_to_rates(currency, [convertion]))
+
+    return rates
+
+
+def convert(amount: float, base_currency: str, currency: str, rates: Mapping[str, float]) -> float:
+    if base_currency == currency or base_currency not in rates:
+        return amount
+
+    return convert_currency_2(target_convertion_rate=rates[base_currency], amount=amount)
+
+
+def price_cart(lines: List[CartLine], currency: str, rates: Mapping[str, float]) -> PricedCart:
+    base_totals = array('q', bytes(8 * len(lines)))
+    totals = array('q', bytes(8 * len(lines)))
+    stores: Dict[str, List[int]] = {}
+    subtotals: Dict[str, int] = {}
+
+    for index, line in enumerate(lines):
+        base_total = int(line.unit_price * line.quantity)
+        total = int(convert(base_total, line.currency, currency, rates))
+
+        base_totals[index] = base_total
+        totals[index] = total
+
+        store_lines = stores.get(line.store_id)
+
+        if store_lines is None:
+            stores[line.store_id] = [index]
+            subtotals[line.store_id] = total
+        else:
+            store_lines.append(index)
+            subtotals[line.store_id] += total
+
+    return PricedCart(
+        currency=currency,
+        base_totals=base_totals,
+        totals=totals,
+        stores={store_id: StoreSubtotal(store_id=store_id, line_indexes=line_indexes, subtotal=subtotals[store_id])
+                for store_id, line_indexes in stores.items()},
+        total=sum(totals)
+    )
+
+
+def price_cart_documents(carts: Iterable[Mapping[str, Any]], currency: str,
+                         mongo_client: Database[Mapping[str, Any]]) -> PricedCart:
+    lines = cart_lines(carts)
+
+    return price_cart(lines, currency, get_rates(base_currencies(lines, currency), currency, mongo_client))
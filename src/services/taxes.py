@@ -0,0 +1,196 @@
+import hashlib
+import json
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from datetime import datetime, timedelta, timezone
+from threading import BoundedSemaphore, Event
+from typing import List, NamedTuple, Optional
+
+from starlette import status
+from stripe import StripeClient
+from stripe.tax import CalculationService
+
+from src.database.mongodb.collection.tax_calculation_collection import get_tax_calculation, upsert_tax_calculation
+from src.database.mongodb.schema.tax_calculation_schema import TaxCalculationCollectionSchema
+from src.env_variables.env import env_variables
+from src.shared.exceptions import HttpException
+from src.utils.cache import TTLCache
+from src.utils.constants import ErrorsIDs, ErrorsDescriptionsObject
+
+
+class TaxCalculationResult(NamedTuple):
+    id: Optional[str]
+    amount_total: int
+    tax_amount_inclusive: int
+    tax_amount_exclusive: int
+    expires_at: datetime
+
+
+tax_calculation_cache = TTLCache(max_size=env_variables.tax_cache_size, ttl_seconds=env_variables.tax_cache_ttl_seconds)
+
+_tax_executor = ThreadPoolExecutor(max_workers=env_variables.stripe_tax_pool_size,
+                                   thread_name_prefix='stripe-tax')
+
+
+def tax_fingerprint(currency: str, postal_code: str, country: str,
+                    line_items: List[CalculationService.CreateParamsLineItem]) -> str:
+    fingerprint = json.dumps([currency.upper(), str(postal_code).strip().upper(), country.upper(), line_items],
+                             sort_keys=True, separators=(',', ':'))
+
+    return hashlib.blake2b(fingerprint.encode(), digest_size=16).hexdigest()
+
+
+def _get_cached_tax(fingerprint: str) -> Optional[TaxCalculationResult]:
+    tax_calculation = tax_calculation_cache.get(fingerprint)
+
+    if tax_calculation:
+        return tax_calculation
+
+    try:
+        tax_calculation_db = get_tax_calculation(fingerprint)
+    except Exception as ex:
+        logging.error(f'Reading cached tax calculation throw exception -> {ex}')
+        return None
+
+    if not tax_calculation_db:
+        return None
+
+    tax_calculation = TaxCalculationResult(
+        id=tax_calculation_db['calculation_id'],
+        amount_total=tax_calculation_db['amount_total'],
+        tax_amount_inclusive=tax_calculation_db['tax_amount_inclusive'],
+        tax_amount_exclusive=tax_calculation_db['tax_amount_exclusive'],
+        expires_at=tax_calculation_db['expires_at'].replace(tzinfo=timezone.utc)
+    )
+    _cache_tax_locally(fingerprint, tax_calculation)
+
+    return tax_calculation
+
+
+def _cache_tax_locally(fingerprint: str, tax_calculation: TaxCalculationResult):
+    tax_calculation_cache.set(fingerprint, tax_calculation,
+                              ttl_seconds=(tax_calculation.expires_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _cache_tax(fingerprint: str, tax_calculation: TaxCalculationResult):
+    _cache_tax_locally(fingerprint, tax_calculation)
+
+    try:
+        upsert_tax_calculation(TaxCalculationCollectionSchema(
+            _id=fingerprint,
+            calculation_id=tax_calculation.id,
+            amount_total=tax_calculation.amount_total,
+            tax_amount_inclusive=tax_calculation.tax_amount_inclusive,
+            tax_amount_exclusive=tax_calculation.tax_amount_exclusive,
+            expires_at=tax_calculation.expires_at
+        ))
+    except Exception as ex:
+        logging.error(f'Caching tax calculation throw exception -> {ex}')
+
+
+def calculate_tax(stripe_client: StripeClient, currency: str, postal_code: str, country: str,
+                  line_items: List[CalculationService.CreateParamsLineItem]) -> TaxCalculationResult:
+    fingerprint = tax_fingerprint(currency, postal_code, country, line_items)
+    tax_calculation = _get_cached_tax(fingerprint)
+
+    if tax_calculation:
+        return tax_calculation
+
+    calculation = stripe_client.tax.calculations.create(
+        params=CalculationService.CreateParams(
+            currency=currency,
+            customer_details=CalculationService.CreateParamsCustomerDetails(
+                address=CalculationService.CreateParamsCustomerDetailsAddress(
+                    postal_code=postal_code,
+                    country=country
+                ),
+                address_source='shipping'
+            ),
+            line_items=line_items
+        )
+    )
+
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=env_variables.tax_cache_ttl_seconds)
+
+    if calculation.expires_at:
+        expires_at = min(expires_at, datetime.fromtimestamp(calculation.expires_at, timezone.utc))
+
+    tax_calculation = TaxCalculationResult(
+        id=calculation.id,
+        amount_total=calculation.amount_total,
+        tax_amount_inclusive=calculation.tax_amount_inclusive,
+        tax_amount_exclusive=calculation.tax_amount_exclusive,
+        expires_at=expires_at
+    )
+    _cache_tax(fingerprint, tax_calculation)
+
+    return tax_calculation
+
+
+class _TaxCall(NamedTuple):
+    future: Future
+    started: Event
+    started_at: List[float]
+
+
+def _run_tax_call(slots: BoundedSemaphore, started: Event, started_at: List[float], stripe_client: StripeClient,
+                  currency: str, postal_code: str, country: str,
+                  line_items: List[CalculationService.CreateParamsLineItem]) -> TaxCalculationResult:
+    started_at.append(time.monotonic())
+    started.set()
+
+    try:
+        return calculate_tax(stripe_client, currency, postal_code, country, line_items)
+    finally:
+        slots.release()
+
+
+def _tax_timeout() -> HttpException:
+    return HttpException(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        error_id=ErrorsIDs.TAX_CALCULATION_TIMEOUT,
+        description=ErrorsDescriptionsObject[ErrorsIDs.TAX_CALCULATION_TIMEOUT]
+    )
+
+
+def _wait_tax_call(tax_call: _TaxCall, deadline_seconds: float) -> TaxCalculationResult:
+    if not tax_call.started.wait(timeout=deadline_seconds):
+        raise _tax_timeout()
+
+    try:
+        return tax_call.future.result(
+            timeout=max(0.0, tax_call.started_at[0] + deadline_seconds - time.monotonic()))
+    except TimeoutError:
+        raise _tax_timeout()
+
+
+def calculate_taxes_concurrently(stripe_client: StripeClient, currency: str, postal_code: str, country: str,
+                                 line_items_groups: List[List[CalculationService.CreateParamsLineItem]]) \
+        -> List[TaxCalculationResult]:
+    deadline_seconds = env_variables.stripe_tax_deadline_seconds
+    slots = BoundedSemaphore(env_variables.stripe_tax_max_concurrency)
+    tax_calls: List[_TaxCall] = []
+
+    try:
+        for line_items in line_items_groups:
+            if not slots.acquire(timeout=deadline_seconds):
+                raise _tax_timeout()
+
+            started, started_at = Event(), []
+            tax_calls.append(_TaxCall(
+                future=_tax_executor.submit(_run_tax_call, slots, started, started_at, stripe_client, currency,
+                                            postal_code, country, line_items),
+                started=started,
+                started_at=started_at
+            ))
+
+        return [_wait_tax_call(tax_call, deadline_seconds) for tax_call in tax_calls]
+
+    finally:
+        for tax_call in tax_calls:
+            tax_call.future.cancel()
+
+
+def shutdown_tax_executor():
+    _tax_executor.shutdown(wait=False, cancel_futures=True)
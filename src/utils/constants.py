@@ -21,6 +21,14 @@ class ErrorsIDs:
     AUTH_CREDENTIALS_COULD_NOT_BE_VALIDATED = 1015
     REFRESH_TOKEN_EXPIRED = 1016
     REFRESH_TOKEN_COULD_NOT_BE_VALIDATED = 1017
+    SERVICE_BUSY = 1018
+    CATEGORY_NOT_VALID = 1019
+    TAX_CALCULATION_TIMEOUT = 1020
+    WEBHOOK_SIGNATURE_NOT_VALID = 1021
+    PRODUCTS_OUT_OF_STOCK = 1022
+    IDEMPOTENCY_KEY_REUSED = 1023
+    IDEMPOTENCY_REQUEST_IN_PROGRESS = 1024
+    API_KEY_SCOPE_NOT_ALLOWED = 1025
 
 
 ErrorsDescriptionsObject = {
@@ -30,6 +38,14 @@ ErrorsDescriptionsObject = {
     ErrorsIDs.AUTH_CREDENTIALS_COULD_NOT_BE_VALIDATED: "Could not validate credentials",
     ErrorsIDs.REFRESH_TOKEN_EXPIRED: "Refresh token expired",
     ErrorsIDs.REFRESH_TOKEN_COULD_NOT_BE_VALIDATED: "Refresh token could not be validated",
+    ErrorsIDs.SERVICE_BUSY: "Service is busy, try again later",
+    ErrorsIDs.CATEGORY_NOT_VALID: "Category {0} with subcategory {1} is not valid",
+    ErrorsIDs.TAX_CALCULATION_TIMEOUT: "Tax calculation timed out, try again later",
+    ErrorsIDs.WEBHOOK_SIGNATURE_NOT_VALID: "Webhook signature is not valid",
+    ErrorsIDs.PRODUCTS_OUT_OF_STOCK: "Products out of stock: {0}",
+    ErrorsIDs.IDEMPOTENCY_KEY_REUSED: "Idempotency key was already used with a different request",
+    ErrorsIDs.IDEMPOTENCY_REQUEST_IN_PROGRESS: "A request with this idempotency key is still being processed",
+    ErrorsIDs.API_KEY_SCOPE_NOT_ALLOWED: "Api key is missing the {0} scope",
 }
 
 
@@ -48,7 +64,7 @@ class ErrorsDescriptions(Enum):
     AUTH_TOKEN_NOT_VALID = 'Authorization token is not valid'
     AUTH_TOKEN_COULD_NOT_BE_VALIDATED = 'Authorization token could not be validated'
     REFRESH_TOKEN_NOT_VALID = 'Refresh token is not valid'
-    ErrorsIDs.USER_ALREADY_HAVE_CART = 'User already have a cart'
+    USER_ALREADY_HAVE_CART = 'User already have a cart'
 
 
 class StripeErrorsIDs:
@@ -84,6 +100,7 @@ class ResponseDescriptions:
     DEFAULT_ADDRESS_CHANGED = "Default address changed"
     ORDER_PLACED_SUCCESS = "Orders placed successfully"
     PROCESSING_PAYMENT = "Your payment is being processed"
+    WEBHOOK_RECEIVED = "Webhook received"
 
 
 class Params:
@@ -91,6 +108,12 @@ class Params:
     REFRESH_TOKEN_EXPIRE_MINUTES = 14400
     RECORDS_LIMIT = 12
     REVIEWS_LIMIT = 5
+    CACHE_INVALIDATION_RETENTION_SECONDS = 3600
+    CACHE_INVALIDATION_POLL_OVERLAP_SECONDS = 10
+    CITY_SEARCH_LIMIT = 20
+    STOCK_UPDATE_TAGS_LIMIT = 20
+    RESERVATION_RELEASE_BATCH_SIZE = 500
+    CASE_CONVERSION_CACHE_SIZE = 4096
 
 
 class DateFormats:
@@ -98,6 +121,10 @@ class DateFormats:
     DATE_YYYY_MM_DD = '%Y-%m-%d'
 
 
+class ApiKeyScope(Enum):
+    OPERATIONS = 'operations'
+
+
 class PaymentMethodType(Enum):
     CARD = "CARD"
     SERVICE = "SERVICE"
@@ -133,3 +160,24 @@ class OrderStatus(Enum):
     DELIVERED = "DELIVERED"
     CANCELLED = "CANCELLED"
     RETURNED = "RETURNED"
+
+
+class OrderJobStatus(Enum):
+    QUEUED = "QUEUED"
+    PROCESSING = "PROCESSING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
+class OrderJobStage(Enum):
+    CHARGING = "CHARGING"
+    CHARGED = "CHARGED"
+
+
+class OrderEventType(Enum):
+    QUEUED = "order.queued"
+    PROCESSING = "order.processing"
+    RETRYING = "order.retrying"
+    SUCCEEDED = "order.succeeded"
+    FAILED = "order.failed"
+    PAYMENT_UPDATED = "payment.updated"
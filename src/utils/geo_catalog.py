@@ -0,0 +1,151 @@
+import bisect
+import mmap
+import os
+import struct
+import unicodedata
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+MAGIC = b'GEOC'
+VERSION = 1
+
+_header = struct.Struct('<4sIIIIII')
+_group = struct.Struct('<IHxxII')
+_record = struct.Struct('<IHIHI')
+
+
+class GeoCity(NamedTuple):
+    id: int
+    name: str
+
+
+def normalize_city_name(name: str) -> str:
+    decomposed = unicodedata.normalize('NFKD', name)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def group_key(country_code: str, state_code: str) -> str:
+    return f'{country_code.upper()}:{state_code.upper()}'
+
+
+def write_geo_catalog(path: str, cities: Iterable[Tuple[str, str, int, str]]):
+    groups: Dict[str, List[Tuple[str, str, int]]] = {}
+
+    for country_code, state_code, city_id, name in cities:
+        groups.setdefault(group_key(country_code, state_code), []).append(
+            (normalize_city_name(name), name, city_id))
+
+    strings = bytearray()
+    string_offsets: Dict[str, Tuple[int, int]] = {}
+
+    def add_string(value: str) -> Tuple[int, int]:
+        if value not in string_offsets:
+            encoded = value.encode()
+            string_offsets[value] = (len(strings), len(encoded))
+            strings.extend(encoded)
+        return string_offsets[value]
+
+    group_table = bytearray()
+    record_table = bytearray()
+    record_count = 0
+
+    for key in sorted(groups):
+        start = record_count
+
+        for sort_key, name, city_id in sorted(groups[key]):
+            sort_key_offset, sort_key_length = add_string(sort_key)
+            name_offset, name_length = add_string(name)
+            record_table.extend(_record.pack(sort_key_offset, sort_key_length, name_offset, name_length, city_id))
+            record_count += 1
+
+        key_offset, key_length = add_string(key)
+        group_table.extend(_group.pack(key_offset, key_length, start, record_count))
+
+    groups_offset = _header.size
+    records_offset = groups_offset + len(group_table)
+    strings_offset = records_offset + len(record_table)
+
+    temporary_path = f'{path}.tmp'
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    with open(temporary_path, 'wb') as file:
+        file.write(_header.pack(MAGIC, VERSION, len(groups), record_count,
+                                groups_offset, records_offset, strings_offset))
+        file.write(group_table)
+        file.write(record_table)
+        file.write(strings)
+
+    os.replace(temporary_path, path)
+
+
+class _SortKeys:
+    def __init__(self, catalog: 'GeoCatalog', start: int, end: int):
+        self._catalog = catalog
+        self._start = start
+        self._end = end
+
+    def __len__(self):
+        return self._end - self._start
+
+    def __getitem__(self, index: int) -> str:
+        return self._catalog._sort_key(self._start + index)
+
+
+class GeoCatalog:
+    def __init__(self, path: str):
+        with open(path, 'rb') as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, group_count, _, groups_offset, records_offset, strings_offset = \
+            _header.unpack_from(self._buffer, 0)
+
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} is not a version {VERSION} geo catalog')
+
+        self._records_offset = records_offset
+        self._strings_offset = strings_offset
+        self._groups: Dict[str, Tuple[int, int]] = {}
+
+        for index in range(group_count):
+            key_offset, key_length, start, end = _group.unpack_from(self._buffer, groups_offset + index * _group.size)
+            self._groups[self._string(key_offset, key_length)] = (start, end)
+
+    def _string(self, offset: int, length: int) -> str:
+        position = self._strings_offset + offset
+        return self._buffer[position:position + length].decode()
+
+    def _sort_key(self, index: int) -> str:
+        sort_key_offset, sort_key_length, _, _, _ = _record.unpack_from(
+            self._buffer, self._records_offset + index * _record.size)
+        return self._string(sort_key_offset, sort_key_length)
+
+    def _city(self, index: int) -> GeoCity:
+        _, _, name_offset, name_length, city_id = _record.unpack_from(
+            self._buffer, self._records_offset + index * _record.size)
+        return GeoCity(id=city_id, name=self._string(name_offset, name_length))
+
+    def has_state(self, country_code: str, state_code: str) -> bool:
+        return group_key(country_code, state_code) in self._groups
+
+    def cities(self, country_code: str, state_code: str) -> Iterator[GeoCity]:
+        start, end = self._groups.get(group_key(country_code, state_code), (0, 0))
+        return (self._city(index) for index in range(start, end))
+
+    def search_cities(self, country_code: str, state_code: str, prefix: str, limit: int) -> List[GeoCity]:
+        start, end = self._groups.get(group_key(country_code, state_code), (0, 0))
+        prefix = normalize_city_name(prefix)
+
+        index = start + bisect.bisect_left(_SortKeys(self, start, end), prefix)
+        cities = []
+
+        while index < end and len(cities) < limit and self._sort_key(index).startswith(prefix):
+            cities.append(self._city(index))
+            index += 1
+
+        return cities
+
+
+def open_geo_catalog(path: str) -> Optional[GeoCatalog]:
+    if not path or not os.path.exists(path):
+        return None
+
+    return GeoCatalog(path)
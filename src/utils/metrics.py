@@ -0,0 +1,38 @@
+from collections import deque
+from threading import Lock
+from typing import Dict
+
+
+class LatencyStats:
+    def __init__(self, window_size: int = 1024):
+        self._samples: deque[float] = deque(maxlen=window_size)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+        self._lock = Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+            self._count += 1
+            self._total += seconds
+            self._max = max(self._max, seconds)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            samples = sorted(self._samples)
+            count, total, maximum = self._count, self._total, self._max
+
+        def percentile(value: float) -> float:
+            if not samples:
+                return 0.0
+            return round(samples[min(len(samples) - 1, int(len(samples) * value))] * 1000, 3)
+
+        return {
+            'count': count,
+            'avgMs': round(total / count * 1000, 3) if count else 0.0,
+            'p50Ms': percentile(0.50),
+            'p95Ms': percentile(0.95),
+            'p99Ms': percentile(0.99),
+            'maxMs': round(maximum * 1000, 3)
+        }
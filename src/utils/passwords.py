@@ -0,0 +1,88 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, Future
+from threading import BoundedSemaphore, Lock
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+from starlette import status
+
+from src.env_variables.env import env_variables
+from src.shared.exceptions import HttpException
+from src.utils.constants import ErrorsIDs, ErrorsDescriptionsObject
+
+pwd_context = CryptContext(
+    schemes=["sha256_crypt"],
+    deprecated="auto",
+    sha256_crypt__default_rounds=env_variables.password_hash_rounds,
+    sha256_crypt__min_rounds=env_variables.password_hash_rounds,
+    sha256_crypt__max_rounds=env_variables.password_hash_rounds
+)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = Lock()
+_pending = BoundedSemaphore(env_variables.password_hash_max_pending)
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(password, hashed_password)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=env_variables.password_hash_workers,
+                                            mp_context=multiprocessing.get_context('spawn'))
+
+        return _executor
+
+
+def _submit(fn, *args) -> Future:
+    if not _pending.acquire(blocking=False):
+        raise HttpException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            error_id=ErrorsIDs.SERVICE_BUSY,
+            description=ErrorsDescriptionsObject[ErrorsIDs.SERVICE_BUSY],
+            headers={'Retry-After': '1'}
+        )
+
+    try:
+        future = _get_executor().submit(fn, *args)
+    except Exception as e:
+        _pending.release()
+        raise e
+
+    future.add_done_callback(lambda _: _pending.release())
+
+    return future
+
+
+def hash_password(password: str) -> str:
+    return _submit(_hash, password).result()
+
+
+def verify_password(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return _submit(_verify_and_update, password, hashed_password).result()
+
+
+async def hash_password_async(password: str) -> str:
+    return await asyncio.wrap_future(_submit(_hash, password))
+
+
+async def verify_password_async(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await asyncio.wrap_future(_submit(_verify_and_update, password, hashed_password))
+
+
+def shutdown_password_executor():
+    global _executor
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
@@ -1,51 +1,87 @@
+import hashlib
 from datetime import datetime
-from typing import Mapping, Any
+from functools import lru_cache
+from typing import Mapping, Any, Iterable, Callable
 
-import requests
 from bson import ObjectId as BaseObjectId
 from bson.errors import InvalidId
+from motor.motor_asyncio import AsyncIOMotorDatabase
 from pymongo.database import Database
 from starlette import status
 
-from src.env_variables.env import env_variables
-from src.utils.constants import DateFormats
+from dependencies.http_client import http_client, CURRENCY_UPSTREAM
+from src.utils.constants import DateFormats, Params
 
-currency_convertion_api_url = env_variables.currency_convertion_api_url
 
+@lru_cache(maxsize=Params.CASE_CONVERSION_CACHE_SIZE)
+def camel_to_snake_key(key: str) -> str:
+    return ''.join(['_' + c.lower() if c.isupper() else c for c in key]).lstrip('_')
 
-def camel_to_snake_case(input_dict):
-    def convert_keys(d):
-        if isinstance(d, dict):
-            snake_dict = {}
-            for key, value in d.items():
-                snake_case_key = ''.join(['_' + c.lower() if c.isupper() else c for c in key])
-                snake_dict[snake_case_key.lstrip('_')] = convert_keys(value)
-            return snake_dict
-        elif isinstance(d, list):
-            return [convert_keys(item) for item in d]
+
+@lru_cache(maxsize=Params.CASE_CONVERSION_CACHE_SIZE)
+def snake_to_camel_key(key: str) -> str:
+    components = key.split('_')
+
+    if components[0] == '':
+        return components[1]
+
+    return components[0] + ''.join(x.capitalize() for x in components[1:])
+
+
+def convert_keys(document, transform: Callable[[str], str]):
+    if not isinstance(document, (dict, list)):
+        return document
+
+    root = {} if isinstance(document, dict) else []
+    pending = [(document, root)]
+
+    while pending:
+        source, target = pending.pop()
+
+        if isinstance(source, dict):
+            for key, value in source.items():
+                if isinstance(value, dict):
+                    target[transform(key)] = converted = {}
+                    pending.append((value, converted))
+                elif isinstance(value, list):
+                    target[transform(key)] = converted = []
+                    pending.append((value, converted))
+                else:
+                    target[transform(key)] = value
         else:
-            return d
+            for value in source:
+                if isinstance(value, dict):
+                    converted = {}
+                    pending.append((value, converted))
+                elif isinstance(value, list):
+                    converted = []
+                    pending.append((value, converted))
+                else:
+                    converted = value
+                target.append(converted)
+
+    return root
+
 
-    return convert_keys(input_dict)
+def camel_to_snake_case(input_dict):
+    return convert_keys(input_dict, camel_to_snake_key)
 
 
 def snake_to_camel_case(input_dict):
-    def convert_keys(d):
-        if isinstance(d, dict):
-            camel_dict = {}
-            for key, value in d.items():
-                components = key.split('_')
-                camel_case_key = components[0] + ''.join(x.capitalize() for x in components[1:]) if components[
-                                                                                                        0] != '' else \
-                    components[1]
-                camel_dict[camel_case_key] = convert_keys(value)
-            return camel_dict
-        elif isinstance(d, list):
-            return [convert_keys(item) for item in d]
-        else:
-            return d
+    return convert_keys(input_dict, snake_to_camel_key)
+
+
+def token_digest(token: str) -> str:
+    return hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+
+
+def api_key_digest(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()
 
-    return convert_keys(input_dict)
+
+def cart_line_key(product_id: str, variant_keys: Iterable[str]) -> str:
+    canonical = '\x1f'.join([str(product_id), *sorted(variant_keys)])
+    return hashlib.blake2b(canonical.encode(), digest_size=12).hexdigest()
 
 
 def validate_date(date: str, format: DateFormats = DateFormats.DATE_YYYY_MM_DD):
@@ -56,6 +92,33 @@ def validate_date(date: str, format: DateFormats = DateFormats.DATE_YYYY_MM_DD):
         return False
 
 
+def _to_convertion_rates(base_currency: str, convertion: dict):
+    return dict(
+        base_currency=base_currency,
+        last_update=datetime.fromtimestamp(convertion['time_last_update_unix']),
+        next_update=datetime.fromtimestamp(convertion['time_next_update_unix']),
+        convertion_rates=convertion['conversion_rates']
+    )
+
+
+def fetch_convertion_rates(base_currency: str):
+    convertion = http_client.get(CURRENCY_UPSTREAM, f'/latest/{base_currency}')
+
+    if convertion.status_code != status.HTTP_200_OK:
+        return None
+
+    return _to_convertion_rates(base_currency, convertion.json())
+
+
+async def fetch_convertion_rates_async(base_currency: str):
+    convertion = await http_client.get_async(CURRENCY_UPSTREAM, f'/latest/{base_currency}')
+
+    if convertion.status_code != status.HTTP_200_OK:
+        return None
+
+    return _to_convertion_rates(base_currency, convertion.json())
+
+
 def convert_currency(base_currency: str, target_currency: str, amount: float,
                      mongo_client: Database[Mapping[str, Any]]):
     if base_currency != target_currency:
@@ -66,20 +129,31 @@ def convert_currency(base_currency: str, target_currency: str, amount: float,
                 target_convertion_rate=currency_convertion_rate_db['convertion_rates'][target_currency],
                 amount=amount)
         else:
-            convertion = requests.get(
-                url=f'{currency_convertion_api_url}/latest/{base_currency}')
+            convertion = fetch_convertion_rates(base_currency)
 
-            if convertion.status_code == status.HTTP_200_OK:
-                convertion = convertion.json()
+            if convertion:
+                mongo_client.convertion_rates.insert_one(convertion)
+                amount = convert_currency_2(
+                    target_convertion_rate=convertion['convertion_rates'][target_currency],
+                    amount=amount)
 
-                convertion = dict(
-                    base_currency=base_currency,
-                    last_update=datetime.fromtimestamp(convertion['time_last_update_unix']),
-                    next_update=datetime.fromtimestamp(convertion['time_next_update_unix']),
-                    convertion_rates=convertion['conversion_rates']
-                )
+    return amount
 
-                mongo_client.convertion_rates.insert_one(convertion)
+
+async def convert_currency_async(base_currency: str, target_currency: str, amount: float,
+                                 mongo_client: AsyncIOMotorDatabase):
+    if base_currency != target_currency:
+        currency_convertion_rate_db = await mongo_client.convertion_rates.find_one({'base_currency': base_currency})
+
+        if currency_convertion_rate_db:
+            amount = convert_currency_2(
+                target_convertion_rate=currency_convertion_rate_db['convertion_rates'][target_currency],
+                amount=amount)
+        else:
+            convertion = await fetch_convertion_rates_async(base_currency)
+
+            if convertion:
+                await mongo_client.convertion_rates.insert_one(convertion)
                 amount = convert_currency_2(
                     target_convertion_rate=convertion['convertion_rates'][target_currency],
                     amount=amount)